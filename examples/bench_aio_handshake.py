@@ -0,0 +1,99 @@
+"""Load test the asyncio TRI-CROWN endpoint over loopback.
+
+Opens ``--connections`` concurrent clients against an in-process server,
+each of which completes a handshake and one echo round trip, then reports
+handshakes/s and latency percentiles.
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+REPO_ROOT = os.path.dirname(os.path.dirname(__file__))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from tricrown.aio import BoundedExecutor, open_connection, start_server
+from tricrown.pool import KeyMaterialPool
+
+
+def _raise_fd_limit(needed: int) -> None:
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - non-POSIX platforms
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < needed:
+        target = needed if hard == resource.RLIM_INFINITY else min(needed, hard)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (target, hard))
+
+
+async def _echo(stream) -> None:
+    async for message in stream:
+        await stream.send(message)
+
+
+async def run(connections: int, workers: int, max_pending: int, wire: str, key_pool: KeyMaterialPool | None) -> None:
+    pool = ThreadPoolExecutor(max_workers=workers)
+    server_executor = BoundedExecutor(pool, max_pending=max_pending)
+    client_executor = BoundedExecutor(pool, max_pending=max_pending)
+    party_factory = (lambda: key_pool.party("server")) if key_pool is not None else None
+    server = await start_server(
+        _echo, executor=server_executor, party_factory=party_factory, wire=wire, backlog=connections
+    )
+    port = server.sockets[0].getsockname()[1]
+    latencies = []
+
+    async def client() -> None:
+        start = time.perf_counter()
+        stream = await open_connection("127.0.0.1", port, executor=client_executor, wire=wire)
+        latencies.append(time.perf_counter() - start)
+        await stream.send(b"ping")
+        await stream.recv()
+        await stream.close()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(connections)))
+    elapsed = time.perf_counter() - start
+    server.close()
+    await server.wait_closed()
+    pool.shutdown()
+
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+    print(f"connections={connections} workers={workers} wire={wire}")
+    print(f"handshakes/s: {connections / elapsed:.0f}")
+    print(f"latency p50: {p50:.1f} ms  p99: {p99:.1f} ms  max: {latencies[-1] * 1000:.1f} ms")
+    if key_pool is not None:
+        print(f"key pool: {key_pool.stats()}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--connections", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 4)
+    parser.add_argument("--max-pending", type=int, default=256)
+    parser.add_argument("--wire", default="binary", choices=["binary", "json"])
+    parser.add_argument("--pool", type=int, default=0, help="pre-generate this many server key sets")
+    args = parser.parse_args()
+
+    _raise_fd_limit(2 * args.connections + 64)
+    key_pool = None
+    if args.pool:
+        key_pool = KeyMaterialPool(low_watermark=args.pool // 4, high_watermark=args.pool)
+        key_pool.fill()
+        key_pool.start()
+    try:
+        asyncio.run(run(args.connections, args.workers, args.max_pending, args.wire, key_pool))
+    finally:
+        if key_pool is not None:
+            key_pool.stop()
+
+
+if __name__ == "__main__":
+    main()
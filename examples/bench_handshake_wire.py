@@ -0,0 +1,54 @@
+"""Compare handshake message size and latency for the JSON and binary codecs.
+
+The stub KEMs accept public keys of any length, so the benchmark pads the
+McEliece stub up to a realistic Classic McEliece 6960119 key size.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(__file__))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from tricrown.pq import StubKEM
+from tricrown.session import TriCrownParty, perform_handshake
+from tricrown.wire import get_codec
+
+
+def _party(role: str, mce_pk_size: int) -> TriCrownParty:
+    kem_mce = StubKEM(public_key=os.urandom(mce_pk_size), secret_key=os.urandom(64), name="McEliece-stub")
+    return TriCrownParty(role=role, kem_mce=kem_mce)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--mce-pk-size", type=int, default=1_047_319, help="McEliece public key size in bytes")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    client = _party("client", args.mce_pk_size)
+    server = _party("server", args.mce_pk_size)
+
+    for wire in ("json", "binary"):
+        codec = get_codec(wire)
+        hello = codec.encode_hello(client.hello_fields())
+        encode_start = time.perf_counter()
+        for _ in range(args.rounds):
+            codec.decode_hello(codec.encode_hello(client.hello_fields()))
+        codec_ms = (time.perf_counter() - encode_start) * 1000 / args.rounds
+
+        start = time.perf_counter()
+        for _ in range(args.rounds):
+            perform_handshake(client, server, wire=wire)
+        handshake_ms = (time.perf_counter() - start) * 1000 / args.rounds
+        print(
+            f"{wire:>6}: hello {len(hello):>9} bytes | "
+            f"hello encode+decode {codec_ms:8.2f} ms | handshake {handshake_ms:8.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Loopback record throughput for the ``tricrown_hybrid`` asyncio transport.
+
+One client completes the handshake against an in-process server and sends
+``--messages`` records of ``--size`` bytes; the server opens each record
+and discards it.  Reports MB/s for several write batch sizes, where a batch
+size of 0 flushes after every record.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(__file__))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from tricrown_hybrid.aio import open_connection, start_server
+
+
+async def run(messages: int, size: int, batch_size: int) -> float:
+    done = asyncio.get_running_loop().create_future()
+
+    async def sink(stream) -> None:
+        received = 0
+        async for _ in stream:
+            received += 1
+            if received == messages:
+                break
+        await stream.send(b"done")
+        done.set_result(None)
+
+    server = await start_server(sink)
+    port = server.sockets[0].getsockname()[1]
+    stream = await open_connection("127.0.0.1", port, batch_size=batch_size)
+    payload = os.urandom(size)
+    start = time.perf_counter()
+    for _ in range(messages):
+        await stream.send(payload)
+    await stream.flush()
+    await done
+    await stream.recv()
+    elapsed = time.perf_counter() - start
+    await stream.close()
+    server.close()
+    await server.wait_closed()
+    return messages * size / elapsed / 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--size", type=int, default=256)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[0, 16 * 1024, 64 * 1024])
+    args = parser.parse_args()
+
+    print(f"messages={args.messages} size={args.size}")
+    for batch_size in args.batch_sizes:
+        throughput = asyncio.run(run(args.messages, args.size, batch_size))
+        print(f"batch_size={batch_size:>6}: {throughput:8.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
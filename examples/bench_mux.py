@@ -0,0 +1,41 @@
+"""Records/s and MB/s for ``MultiplexedSession`` across worker counts."""
+
+import argparse
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(__file__))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from tricrown.mux import MultiplexedSession
+from tricrown.session import TriCrownParty, perform_handshake
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=1024 * 1024, help="plaintext size in bytes")
+    parser.add_argument("--records", type=int, default=256, help="records sealed per measurement")
+    parser.add_argument("--streams", type=int, default=8, help="streams the records are spread over")
+    parser.add_argument("--workers", type=int, nargs="*", default=[1, 2, 4, 8])
+    parser.add_argument("--aead", default="AES-256-GCM")
+    args = parser.parse_args()
+
+    payload = os.urandom(args.size)
+    messages = [(1 + index % args.streams, payload) for index in range(args.records)]
+    print(f"{os.cpu_count()} CPUs, {args.records} x {args.size} B records over {args.streams} streams")
+    baseline = None
+    for workers in args.workers:
+        client, _ = perform_handshake(TriCrownParty(role="client"), TriCrownParty(role="server"), aead=args.aead)
+        with MultiplexedSession(client.session, max_workers=workers) as mux:
+            start = time.perf_counter()
+            mux.seal_concurrent(messages)
+            elapsed = time.perf_counter() - start
+        rate = args.records * args.size / elapsed / 1e6
+        baseline = baseline or rate
+        print(f"{workers:>3} workers: {args.records / elapsed:10.0f} records/s {rate:8.1f} MB/s ({rate / baseline:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Compare records/s for ``TriCrownSession.seal`` against ``seal_many``."""
+
+import argparse
+import os
+import sys
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(__file__))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from tricrown.session import TriCrownParty, perform_handshake
+
+
+def _fresh_session():
+    client_result, _ = perform_handshake(TriCrownParty(role="client"), TriCrownParty(role="server"))
+    return client_result.session
+
+
+def _rate(fn, total: int) -> float:
+    start = time.perf_counter()
+    fn()
+    return total / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=4096, help="records sealed per measurement")
+    parser.add_argument("--size", type=int, default=64, help="plaintext size in bytes")
+    parser.add_argument("--batches", type=int, nargs="*", default=[1, 4, 16, 64, 256, 1024])
+    args = parser.parse_args()
+
+    payload = os.urandom(args.size)
+
+    session = _fresh_session()
+    loop_rate = _rate(lambda: [session.seal(payload) for _ in range(args.records)], args.records)
+    print(f"{'seal loop':>12}: {loop_rate:10.0f} records/s")
+
+    for batch_size in args.batches:
+        session = _fresh_session()
+        rounds = max(1, args.records // batch_size)
+        plaintexts = [payload] * batch_size
+
+        def run() -> None:
+            for _ in range(rounds):
+                session.seal_many(plaintexts)
+
+        rate = _rate(run, rounds * batch_size)
+        print(f"{'batch ' + str(batch_size):>12}: {rate:10.0f} records/s ({rate / loop_rate:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Memory per session and lookup cost for ``SessionTable``.
+
+Sessions are cloned from one real handshake with fresh random session ids
+and chain keys, so building a large table does not pay for a million
+handshakes.  ``tracemalloc`` measures the table against a plain dict of
+``TriCrownSession`` objects.
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(__file__))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from tricrown.session import Chains, TriCrownParty, TriCrownSession, perform_handshake
+from tricrown.table import SessionTable
+
+
+def _sessions(template: TriCrownSession, count: int):
+    for _ in range(count):
+        material = os.urandom(128)
+        yield TriCrownSession(
+            role=template.role,
+            session_id=os.urandom(16),
+            transcript=os.urandom(64),
+            chains=Chains(rk=material[:32], ck_s=material[32:64], ck_r=material[64:96], k_commit=material[96:]),
+            aead_backend=template.aead_backend,
+        )
+
+
+def _measure(build) -> tuple:
+    tracemalloc.start()
+    start = time.perf_counter()
+    container = build()
+    elapsed = time.perf_counter() - start
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return container, used, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=1_000_000)
+    parser.add_argument("--shards", type=int, default=64)
+    parser.add_argument("--lookups", type=int, default=100_000)
+    args = parser.parse_args()
+
+    _, server = perform_handshake(TriCrownParty(role="client"), TriCrownParty(role="server"))
+    template = server.session
+
+    def build_table() -> SessionTable:
+        table = SessionTable(shards=args.shards)
+        for session in _sessions(template, args.sessions):
+            table.put(session)
+        return table
+
+    table, used, elapsed = _measure(build_table)
+    print(f"SessionTable: {used / args.sessions:7.1f} B/session, {used / 2**20:8.1f} MiB total, "
+          f"{args.sessions / elapsed:9.0f} puts/s")
+
+    ids = [session_id for shard in table._shards for session_id in list(shard.entries)[:1000]]
+    ids = (ids * (args.lookups // max(len(ids), 1) + 1))[: args.lookups]
+    start = time.perf_counter()
+    for session_id in ids:
+        with table.checkout(session_id):
+            pass
+    print(f"checkout: {(time.perf_counter() - start) / len(ids) * 1e6:.2f} us/lookup")
+    del table
+
+    def build_dict() -> dict:
+        return {session.session_id: session for session in _sessions(template, args.sessions)}
+
+    _, used, _ = _measure(build_dict)
+    print(f"dict of TriCrownSession: {used / args.sessions:7.1f} B/session, {used / 2**20:8.1f} MiB total")
+
+
+if __name__ == "__main__":
+    main()
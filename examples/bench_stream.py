@@ -0,0 +1,81 @@
+"""Measure throughput and peak RSS of ``seal_stream``/``open_stream``.
+
+The payload is generated on the fly and the output is discarded, so the
+reported peak RSS reflects only the record layer's working set.  Run it with
+increasing ``--megabytes`` to check that the peak stays flat.
+"""
+
+import argparse
+import io
+import os
+import resource
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(__file__))
+if REPO_ROOT not in sys.path:
+    sys.path.insert(0, REPO_ROOT)
+
+from tricrown.session import TriCrownParty, perform_handshake
+
+
+class _ZeroReader(io.RawIOBase):
+    """Readable stream of ``size`` zero bytes that never materialises them."""
+
+    def __init__(self, size: int) -> None:
+        self.remaining = size
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        count = min(len(buffer), self.remaining)
+        buffer[:count] = bytes(count)
+        self.remaining -= count
+        return count
+
+
+class _Sink(io.RawIOBase):
+    """Writable stream that discards its input."""
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        return len(data)
+
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--megabytes", type=int, default=256, help="payload size in MiB")
+    parser.add_argument("--chunk-size", type=int, default=64 * 1024, help="plaintext bytes per record")
+    args = parser.parse_args()
+
+    size = args.megabytes * 1024 * 1024
+    client_result, server_result = perform_handshake(TriCrownParty(role="client"), TriCrownParty(role="server"))
+    baseline = _peak_rss_mb()
+
+    start = time.perf_counter()
+    records = client_result.session.seal_stream(_ZeroReader(size), _Sink(), chunk_size=args.chunk_size)
+    elapsed = time.perf_counter() - start
+    print(f"seal_stream: {records} records, {args.megabytes / elapsed:8.1f} MiB/s, "
+          f"peak RSS {_peak_rss_mb():.1f} MiB (baseline {baseline:.1f} MiB)")
+
+    client_result, server_result = perform_handshake(TriCrownParty(role="client"), TriCrownParty(role="server"))
+    with tempfile.TemporaryFile() as sealed:
+        client_result.session.seal_stream(_ZeroReader(size), sealed, chunk_size=args.chunk_size)
+        sealed.seek(0)
+        start = time.perf_counter()
+        opened = server_result.session.open_stream(sealed, _Sink())
+        elapsed = time.perf_counter() - start
+    print(f"open_stream: {opened} bytes, {args.megabytes / elapsed:8.1f} MiB/s, "
+          f"peak RSS {_peak_rss_mb():.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
 import numpy as np
 
+from tri_crown.cache import DiscretisationCache
+from tri_crown.process import process_matrix, van_loan_discretization
 from tri_crown.math_process import (
+    SlidingFourierEnergy,
     apply_caesar_shift,
     bigram_probabilities,
     causal_convolution,
@@ -8,12 +11,15 @@ from tri_crown.math_process import (
     fixed_point_key_binding,
     fourier_energy_ratios,
     green_convolution,
+    green_convolution_batch,
     huber_irls,
+    huber_irls_chunked,
     interrogative_score,
     math_salt,
     matrix_exponential,
     modal_coordinates,
     riccati_gain,
+    riccati_gain_batch,
 )
 
 
@@ -36,6 +42,61 @@ def test_green_convolution_shapes_and_progression():
     assert disc.state_trajectory.shape == (4, 2)
 
 
+def test_green_convolution_batch_matches_single_trajectories():
+    rng = np.random.default_rng(7)
+    A = np.array([[0.0, 1.0], [-2.0, -0.3]])
+    B = np.array([[0.0], [1.0]])
+    controls = rng.standard_normal((5, 12, 1))
+    initial = rng.standard_normal((5, 2))
+    expected = np.stack([
+        green_convolution(A, B, controls[i], dt=0.1, initial_state=initial[i]).state_trajectory
+        for i in range(5)
+    ])
+
+    batched = green_convolution_batch(A, B, controls, dt=0.1, initial_states=initial)
+    assert batched.state_trajectory.shape == (5, 13, 2)
+    assert np.allclose(batched.state_trajectory, expected)
+
+    out = np.empty((5, 13, 2), dtype=np.float32)
+    single = green_convolution_batch(A, B, controls, dt=0.1, initial_states=initial, out=out)
+    assert single.state_trajectory is out
+    assert np.allclose(out, expected, atol=1e-5)
+
+
+def test_discretisation_cache_hits_on_equal_content(monkeypatch):
+    import tri_crown.math_process as math_process
+    import tri_crown.process as process
+
+    cache = DiscretisationCache(max_entries=4)
+    monkeypatch.setattr(math_process, "DISCRETISATION_CACHE", cache)
+    monkeypatch.setattr(process, "DISCRETISATION_CACHE", cache)
+    A = np.array([[0.0, 1.0], [-2.0, -3.0]])
+    B = np.array([[0.0], [1.0]])
+    controls = np.ones((3, 1))
+
+    first = green_convolution(A, B, controls, dt=0.1)
+    first.phi[0, 0] = 99.0
+    second = green_convolution(A.copy(), B.copy(), controls, dt=0.1)
+    assert second.phi[0, 0] != 99.0
+    assert np.allclose(second.gamma, first.gamma)
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.size) == (2, 2, 2)
+
+    green_convolution(A, B, controls, dt=0.2)
+    assert cache.stats().misses == 4
+
+    assert np.allclose(process_matrix(A, 0.1), matrix_exponential(A, 0.1))
+    phi, qd = van_loan_discretization(A, B, np.eye(1), 0.1)
+    phi_again, qd_again = van_loan_discretization(A, B, np.eye(1), 0.1)
+    assert np.array_equal(qd, qd_again)
+    assert cache.stats().size == 4
+    assert cache.stats().hit_rate > 0
+
+    cache.resize(0)
+    matrix_exponential(A, 0.1)
+    assert len(cache) == 0
+
+
 def test_modal_coordinates_returns_eigendecomposition():
     A = np.array([[2.0, 0.0], [0.0, 3.0]])
     V, Lambda = modal_coordinates(A)
@@ -55,6 +116,38 @@ def test_riccati_gain_produces_stabilising_feedback():
     assert np.all(np.linalg.eigvals(P) > 0)
 
 
+def test_riccati_doubling_fallback_matches_direct_solution(monkeypatch):
+    import tri_crown.math_process as math_process
+
+    A = np.array([[1.0, 0.05], [0.0, 1.0]])
+    B = np.array([[0.00125], [0.05]])
+    Q = np.diag([1.0, 0.1])
+    R = np.array([[0.5]])
+    K_direct, P_direct = riccati_gain(A, B, Q, R)
+    monkeypatch.setattr(math_process, "solve_discrete_are", None)
+    K, P = riccati_gain(A, B, Q, R)
+    # P must satisfy the DARE residual whichever path produced the reference.
+    residual = A.T @ P @ A - P - A.T @ P @ B @ np.linalg.solve(R + B.T @ P @ B, B.T @ P @ A) + Q
+    assert np.abs(residual).max() < 1e-8
+    assert np.allclose(P, P_direct, rtol=1e-6)
+    assert np.allclose(K, K_direct, rtol=1e-6)
+
+
+def test_riccati_gain_batch_matches_individual_solves():
+    steps = np.linspace(0.05, 0.5, 6)
+    A = np.stack([np.array([[1.0, dt], [0.0, 1.0]]) for dt in steps]).reshape(2, 3, 2, 2)
+    B = np.stack([np.array([[dt * dt / 2], [dt]]) for dt in steps]).reshape(2, 3, 2, 1)
+    Q = np.eye(2)
+    R = np.array([[1.0]])
+    K, P = riccati_gain_batch(A, B, Q, R)
+    assert K.shape == (2, 3, 1, 2)
+    assert P.shape == (2, 3, 2, 2)
+    for index in np.ndindex(2, 3):
+        K_single, P_single = riccati_gain(A[index], B[index], Q, R)
+        assert np.allclose(K[index], K_single, rtol=1e-6)
+        assert np.allclose(P[index], P_single, rtol=1e-6)
+
+
 def test_compose_process_and_wave_block_structure():
     phi = np.eye(2)
     wave = np.eye(3)
@@ -74,6 +167,29 @@ def test_causal_convolution_matches_manual_accumulation():
     assert np.allclose(result[1], [1.0, 1.0])
 
 
+def _reference_causal_convolution(phi, gamma, controls):
+    result = np.zeros((controls.shape[0], phi.shape[0]))
+    for k in range(controls.shape[0]):
+        for j in range(k + 1):
+            result[k] += np.linalg.matrix_power(phi, k - j) @ (gamma @ controls[j])
+    return result
+
+
+def test_causal_convolution_scan_and_fft_match_reference_for_batches():
+    rng = np.random.default_rng(3)
+    phi = np.array([[0.9, 0.1], [-0.2, 0.95]])
+    gamma = rng.standard_normal((2, 3))
+    controls = rng.standard_normal((4, 40, 3))
+    expected = np.stack([_reference_causal_convolution(phi, gamma, batch) for batch in controls])
+
+    assert np.allclose(causal_convolution(phi, gamma, controls, method="scan"), expected)
+    for block_steps in (1, 7, 64):
+        fft = causal_convolution(phi, gamma, controls, method="fft", block_steps=block_steps)
+        assert fft.shape == (4, 40, 2)
+        assert np.allclose(fft, expected)
+    assert np.allclose(causal_convolution(phi, gamma, controls[0], method="fft"), expected[0])
+
+
 def test_fourier_energy_ratios_invariant_to_scale():
     signal = np.array([0.0, 1.0, 0.0, -1.0])
     ratios = fourier_energy_ratios(signal)
@@ -81,6 +197,38 @@ def test_fourier_energy_ratios_invariant_to_scale():
     assert np.allclose(ratios, ratios_scaled)
 
 
+def test_fourier_energy_ratios_batches_along_axis():
+    rng = np.random.default_rng(11)
+    signals = rng.standard_normal((6, 100))
+    signals[2] = 0.0
+    expected = np.stack([fourier_energy_ratios(row, num_bands=5) for row in signals])
+
+    assert np.allclose(fourier_energy_ratios(signals, num_bands=5), expected)
+    assert np.allclose(fourier_energy_ratios(signals.T, num_bands=5, axis=0), expected.T)
+    assert np.all(expected[2] == 0.0)
+
+
+def test_sliding_fourier_energy_matches_windowed_batches():
+    rng = np.random.default_rng(13)
+    stream = rng.standard_normal(500)
+    sliding = SlidingFourierEnergy(64, 16, num_bands=3)
+    frames = np.concatenate([sliding.update(piece) for piece in np.array_split(stream, 9)])
+
+    starts = range(0, 500 - 64 + 1, 16)
+    windows = np.stack([stream[start : start + 64] for start in starts])
+    assert frames.shape == (len(windows), 3)
+    assert sliding.frames == len(windows)
+    assert np.allclose(frames, fourier_energy_ratios(windows, num_bands=3))
+
+    taper = np.hanning(64)
+    tapered = SlidingFourierEnergy(64, 64, taper=taper).update(stream[:128])
+    assert np.allclose(tapered, fourier_energy_ratios(stream[:128].reshape(2, 64) * taper))
+
+    single = SlidingFourierEnergy(1)
+    assert single.hop == 1
+    assert np.allclose(single.update(stream[:5]), fourier_energy_ratios(stream[:5, None]))
+
+
 def test_text_features_basic_properties():
     text = "Hello world how are you?"
     shifted = apply_caesar_shift(text, 5)
@@ -99,6 +247,28 @@ def test_huber_irls_recovers_mean_for_gaussian_data():
     assert result.scale >= 0
 
 
+def test_huber_irls_chunked_matches_in_memory_fit(tmp_path):
+    rng = np.random.default_rng(5)
+    X = np.column_stack([np.ones(2001), rng.standard_normal((2001, 2))])
+    y = X @ np.array([1.0, -2.0, 0.5]) + 0.2 * rng.standard_normal(2001)
+    y[:40] += 25.0
+    expected = huber_irls(X, y)
+
+    X_map = np.lib.format.open_memmap(tmp_path / "X.npy", mode="w+", dtype=float, shape=X.shape)
+    X_map[:] = X
+    chunked = huber_irls_chunked(X_map, y, chunk_size=256)
+    assert np.allclose(chunked.coefficients, expected.coefficients)
+    assert abs(chunked.scale - expected.scale) < 1e-6 * expected.scale
+
+    def blocks():
+        for start in range(0, 2001, 500):
+            yield X[start : start + 500], y[start : start + 500]
+
+    streamed = huber_irls_chunked(blocks)
+    assert np.allclose(streamed.coefficients, expected.coefficients)
+    assert abs(streamed.scale - expected.scale) < 1e-6 * expected.scale
+
+
 def test_fixed_point_and_math_salt_are_deterministic():
     seed = b"seed"
     key1, commit1 = fixed_point_key_binding(seed, features=[b"a", b"b"])
@@ -0,0 +1,81 @@
+import os
+
+import pytest
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCMSIV
+
+from tricrown import aead
+from tricrown.aead import (
+    AEAD_SUITES,
+    AEADBackend,
+    XChaCha20Poly1305,
+    benchmark_aead_suites,
+    select_aead_suite,
+)
+from tricrown.session import TriCrownParty, perform_handshake
+
+
+@pytest.mark.parametrize("name", sorted(AEAD_SUITES))
+def test_every_registered_suite_round_trips_records(name):
+    client, server = perform_handshake(TriCrownParty(role="client"), TriCrownParty(role="server"), aead=name)
+    record = client.session.seal(b"payload", aad=b"hdr")
+    assert len(record.nonce) == AEAD_SUITES[name].nonce_length
+    assert server.session.open(record) == b"payload"
+
+
+def test_gcm_siv_suite_is_real_gcm_siv():
+    key, nonce = os.urandom(32), os.urandom(12)
+    sealed = AEADBackend("AES-256-GCM-SIV").encrypt(key, nonce, b"data", b"aad")
+    assert AESGCMSIV(key).decrypt(nonce, sealed, b"aad") == b"data"
+
+
+def test_unknown_suite_is_rejected():
+    with pytest.raises(ValueError, match="Unsupported AEAD suite"):
+        AEADBackend("ROT13")
+
+
+def test_hchacha20_matches_draft_test_vector():
+    key = bytes(range(32))
+    nonce = bytes.fromhex("000000090000004a0000000031415927")
+    expected = bytes.fromhex(
+        "82413b4227b27bfed30e42508a877d73a0f9e4d58a74a853c12ec41326d3ecdc"
+    )
+    assert aead._hchacha20(key, nonce) == expected
+
+
+def test_xchacha_fallback_matches_libsodium(monkeypatch):
+    pytest.importorskip("nacl")
+    key, nonce = os.urandom(32), os.urandom(24)
+    sealed = XChaCha20Poly1305(key).encrypt(nonce, b"data", b"aad")
+    monkeypatch.setattr(aead, "nacl_bindings", None)
+    cipher = XChaCha20Poly1305(key)
+    assert cipher.encrypt(nonce, b"data", b"aad") == sealed
+    assert cipher.decrypt(nonce, sealed, b"aad") == b"data"
+    with pytest.raises(InvalidTag):
+        cipher.decrypt(nonce, sealed, b"other")
+
+
+def test_select_aead_suite_benchmarks_once_and_caches():
+    allowed = ("AES-256-GCM", "ChaCha20-Poly1305")
+    selection = select_aead_suite(allowed, duration=0.002)
+    assert selection.name in allowed
+    assert {result.name for result in selection.results} == set(allowed)
+    assert selection.throughput == max(result.throughput for result in selection.results) > 0
+    assert select_aead_suite(allowed, duration=0.002) is selection
+    assert select_aead_suite(allowed, refresh=True, duration=0.002) is not selection
+
+
+def test_select_aead_suite_caches_per_benchmark_parameters():
+    allowed = ("AES-256-GCM", "ChaCha20-Poly1305")
+    small = select_aead_suite(allowed, payload_size=64, duration=0.002)
+    large = select_aead_suite(allowed, payload_size=4096, duration=0.002)
+    assert {result.payload_size for result in small.results} == {64}
+    assert {result.payload_size for result in large.results} == {4096}
+    assert select_aead_suite(allowed, payload_size=64, duration=0.002) is small
+    assert select_aead_suite(allowed, payload_size=64, duration=0.001) is not small
+
+
+def test_benchmark_orders_results_fastest_first():
+    results = benchmark_aead_suites(duration=0.002, payload_size=1024)
+    throughputs = [result.throughput for result in results]
+    assert throughputs == sorted(throughputs, reverse=True)
@@ -0,0 +1,104 @@
+import asyncio
+
+import pytest
+
+from tricrown.aio import (
+    BoundedExecutor,
+    open_connection,
+    start_server,
+    write_frame,
+)
+from tricrown.session import TriCrownParty
+
+
+async def _echo(stream):
+    async for message in stream:
+        await stream.send(message[::-1])
+
+
+def _run(coro):
+    return asyncio.run(asyncio.wait_for(coro, timeout=30))
+
+
+@pytest.mark.parametrize("wire", ["binary", "json"])
+def test_loopback_handshake_and_records(wire):
+    async def main():
+        server = await start_server(_echo, wire=wire)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            stream = await open_connection("127.0.0.1", port, wire=wire)
+            await stream.send(b"hello")
+            await stream.send(b"world", aad=b"meta")
+            replies = [await stream.recv(), await stream.recv()]
+            await stream.close()
+        finally:
+            server.close()
+            await server.wait_closed()
+        return replies
+
+    assert _run(main()) == [b"olleh", b"dlrow"]
+
+
+def test_many_concurrent_handshakes_share_a_bounded_executor():
+    async def main():
+        executor = BoundedExecutor(max_pending=4)
+        server = await start_server(_echo, executor=executor)
+        port = server.sockets[0].getsockname()[1]
+
+        async def client(index):
+            stream = await open_connection("127.0.0.1", port)
+            await stream.send(bytes([index]))
+            reply = await stream.recv()
+            await stream.close()
+            return reply
+
+        try:
+            return await asyncio.gather(*(client(i) for i in range(32)))
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    assert _run(main()) == [bytes([i]) for i in range(32)]
+
+
+def test_server_without_reciprocal_encapsulation():
+    async def main():
+        server = await start_server(
+            _echo, party_factory=lambda: TriCrownParty(role="server", encapsulate_back=False)
+        )
+        port = server.sockets[0].getsockname()[1]
+        try:
+            stream = await open_connection("127.0.0.1", port)
+            await stream.send(b"ping")
+            reply = await stream.recv()
+            await stream.close()
+        finally:
+            server.close()
+            await server.wait_closed()
+        return reply, len(stream.result.shared_secrets)
+
+    assert _run(main()) == (b"gnip", 4)
+
+
+@pytest.mark.parametrize(
+    "hello", [b'{"client_hello": {"role": "client"}}', b'{"client_hello": "client"}', b"[]", b"\x00" * 8]
+)
+def test_malformed_client_hello_closes_the_connection(hello):
+    async def main():
+        unhandled = []
+        asyncio.get_running_loop().set_exception_handler(lambda loop, context: unhandled.append(context))
+        server = await start_server(_echo, wire="json")
+        port = server.sockets[0].getsockname()[1]
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            write_frame(writer, hello)
+            await writer.drain()
+            remainder = await reader.read()
+            writer.close()
+            await writer.wait_closed()
+        finally:
+            server.close()
+            await server.wait_closed()
+        return remainder, unhandled
+
+    assert _run(main()) == (b"", [])
@@ -0,0 +1,109 @@
+import threading
+from concurrent.futures import Executor, Future
+from dataclasses import replace
+
+import pytest
+
+from tricrown.epoch import EpochManager, RekeyOffer, offer_tag
+from tricrown.session import TriCrownParty, perform_handshake
+from tricrown.wire import FieldTag, decode_frame
+
+
+class _InlineExecutor(Executor):
+    def submit(self, fn, *args, **kwargs):
+        future = Future()
+        future.set_result(fn(*args, **kwargs))
+        return future
+
+
+def _managers(interval=8, lead=3, executor=None):
+    client_party, server_party = TriCrownParty(role="client"), TriCrownParty(role="server")
+    client, server = perform_handshake(client_party, server_party)
+    for result in (client, server):
+        result.session.refresh_interval_messages = interval
+    return (
+        EpochManager(client.session, client_party, server_party.hello_fields(), lead=lead, executor=executor),
+        EpochManager(server.session, server_party, client_party.hello_fields(), lead=lead, executor=executor),
+    )
+
+
+def _exchange(client, server, count):
+    for index in range(count):
+        offer = client.poll_offer()
+        if offer is not None:
+            server.accept_offer(offer.to_bytes())
+        payload = f"record-{index}".encode()
+        assert server.open(client.seal(payload)) == payload
+
+
+def test_epochs_advance_in_lockstep_at_the_boundary():
+    client, server = _managers(executor=_InlineExecutor())
+    _exchange(client, server, 7)
+    assert client.epoch == server.epoch == 0
+    _exchange(client, server, 1)
+    assert client.epoch == server.epoch == 1
+    assert client.session.sent_messages == server.session.received_messages == 0
+    _exchange(client, server, 18)
+    assert client.epoch == server.epoch == 3
+    assert client.session.chains.ck_s == server.session.chains.ck_r
+    assert client.stats().stalls == 0
+    reply = server.seal(b"reply")
+    assert client.open(reply) == b"reply"
+
+
+def test_slow_encapsulation_defers_the_boundary_instead_of_stalling():
+    client, server = _managers(interval=4, lead=2)
+    gate = threading.Event()
+    encapsulate = client.party.kem_ml.encapsulate
+
+    def slow_encapsulate(peer_public_key):
+        gate.wait(5)
+        return encapsulate(peer_public_key)
+
+    client.party.kem_ml.encapsulate = slow_encapsulate
+    with client, server:
+        _exchange(client, server, 6)
+        assert client.epoch == server.epoch == 0
+        gate.set()
+        client.executor.submit(lambda: None).result()
+        offer = client.poll_offer()
+        assert offer.boundary == client.session.sent_messages + 1
+        server.accept_offer(offer)
+        _exchange(client, server, 1)
+        assert client.epoch == server.epoch == 1
+
+
+def test_offer_frames_round_trip_and_stale_offers_are_rejected():
+    offer = RekeyOffer(epoch=2, boundary=64, ct_ml=b"a" * 32, ct_mce=b"b" * 32, tag=b"t" * 32)
+    assert RekeyOffer.from_bytes(offer.to_bytes()) == offer
+    fields = decode_frame(offer.to_bytes()).fields
+    assert bytes(fields[FieldTag.BOUNDARY]) == (64).to_bytes(8, "big")
+    assert bytes(fields[FieldTag.REKEY_MAC]) == b"t" * 32
+    client, server = _managers()
+    with client, server:
+        with pytest.raises(ValueError, match="authentication"):
+            server.accept_offer(offer)
+        stale = replace(offer, tag=offer_tag(server.session, offer))
+        with pytest.raises(ValueError, match="epoch 2"):
+            server.accept_offer(stale)
+        with pytest.raises(RuntimeError):
+            client.accept_offer(offer)
+
+
+def test_tampered_offers_are_rejected_and_do_not_block_the_real_one():
+    client, server = _managers(executor=_InlineExecutor())
+    _exchange(client, server, 6)
+    offer = client.poll_offer()
+    assert offer is not None
+    forged = [
+        replace(offer, boundary=offer.boundary + 10_000),
+        replace(offer, ct_ml=bytes(len(offer.ct_ml))),
+        RekeyOffer(epoch=1, boundary=offer.boundary + 10_000, ct_ml=b"x", ct_mce=b"y"),
+    ]
+    for candidate in forged:
+        with pytest.raises(ValueError, match="authentication"):
+            server.accept_offer(candidate.to_bytes())
+    server.accept_offer(offer.to_bytes())
+    _exchange(client, server, 2)
+    assert client.epoch == server.epoch == 1
+    assert client.session.chains.ck_s == server.session.chains.ck_r
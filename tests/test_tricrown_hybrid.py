@@ -1,11 +1,16 @@
 from tricrown_hybrid import (
+    CookieAuthority,
     ctx_init,
     client_hello,
+    client_retry,
     server_hello,
+    server_respond,
     client_finish,
     server_finish,
     seal,
     open_,
+    seal_batch,
+    open_batch,
     rekey,
     _HAS_OQS,
 )
@@ -58,3 +63,132 @@ def test_ctx_init_role_validation():
 def test_pq_flag_matches_environment():
     ctx = ctx_init("client", enable_pq=True)
     assert ctx.enable_pq is _HAS_OQS
+
+
+def test_fallback_cipher_round_trip_and_tamper(monkeypatch):
+    import tricrown_hybrid
+
+    monkeypatch.setattr(tricrown_hybrid, "_RealChaCha20Poly1305", None)
+    cipher = tricrown_hybrid._ChaCha20Poly1305(b"k" * 32)
+    nonce = bytes(12)
+    for size in (0, 1, 4096, tricrown_hybrid._FALLBACK_CHUNK + 17):
+        data = bytes(range(256)) * (size // 256) + bytes(size % 256)
+        sealed = cipher.encrypt(nonce, data, b"aad")
+        assert len(sealed) == size + tricrown_hybrid._TAG_LEN
+        assert cipher.decrypt(nonce, sealed, b"aad") == data
+
+    sealed = cipher.encrypt(nonce, b"payload" * 1000, b"aad")
+    assert sealed[:7] != b"payload"
+    tampered = bytes([sealed[0] ^ 1]) + sealed[1:]
+    for bad, aad in ((tampered, b"aad"), (sealed, b"other")):
+        try:
+            cipher.decrypt(nonce, bad, aad)
+            assert False, "tampering undetected"
+        except ValueError:
+            pass
+
+
+def _established_pair():
+    client = ctx_init("client", enable_pq=True)
+    server = ctx_init("server", enable_pq=True)
+    server_finish(server, client_finish(client, server_hello(server, client_hello(client))))
+    return client, server
+
+
+def test_cipher_cached_until_rekey():
+    client, server = _established_pair()
+    seal(client, b"", b"one")
+    cipher = client.chains.send.cipher
+    seal(client, b"", b"two")
+    assert client.chains.send.cipher is cipher
+
+    rekey(client)
+    rekey(server)
+    assert client.chains.send.cipher is not cipher
+    assert client.chains.send.nonce == 0
+    assert open_(server, seal(client, b"", b"three")) == b"three"
+
+
+def test_seal_batch_matches_single_records():
+    client, server = _established_pair()
+    mirror, _ = _established_pair()
+    mirror.chains.send.reset(client.chains.send.key)
+
+    plaintexts = [b"", b"a", b"bc" * 100]
+    batch = seal_batch(client, b"batch", plaintexts)
+    singles = [seal(mirror, b"batch", plaintext) for plaintext in plaintexts]
+
+    assert len(batch) == 3
+    assert list(batch) == singles
+    assert batch[-1] == singles[-1]
+    assert client.chains.send.nonce == 3
+    assert open_batch(server, batch) == plaintexts
+    assert open_(server, seal(client, b"", b"next")) == b"next"
+
+    tampered = bytearray(batch.ciphertexts)
+    tampered[batch.offsets[1]] ^= 1
+    batch.ciphertexts = bytes(tampered)
+    try:
+        open_batch(server, batch)
+        assert False, "tampering undetected"
+    except Exception:
+        pass
+
+
+def test_cookie_retry_handshake():
+    now = [1000.0]
+    cookies = CookieAuthority(b"s" * 32, bucket_seconds=10, clock=lambda: now[0])
+    client = ctx_init("client", enable_pq=True)
+    hello = client_hello(client)
+
+    server, retry = server_respond(hello, cookies, peer=b"10.0.0.1")
+    assert server is None
+    assert retry["type"] == "hello-retry"
+
+    echoed = client_retry(client, retry)
+    assert server_respond(echoed, cookies, peer=b"10.0.0.2")[0] is None
+
+    now[0] += 15
+    server, response = server_respond(echoed, cookies, peer=b"10.0.0.1")
+    assert server is not None
+    server_finish(server, client_finish(client, response))
+    assert open_(server, seal(client, b"", b"hi")) == b"hi"
+
+    now[0] += 20
+    assert not cookies.verify(echoed, peer=b"10.0.0.1")
+
+
+def test_server_respond_rejects_bad_cookie():
+    cookies = CookieAuthority()
+    client = ctx_init("client")
+    hello = client_hello(client)
+    forged = dict(hello, cookie="AAAA")
+    for message in (hello, forged, dict(forged, cookie="not base64!")):
+        server, retry = server_respond(message, cookies, peer=b"10.0.0.1")
+        assert server is None and retry["type"] == "hello-retry"
+    echoed = client_retry(client, cookies.issue(hello, peer=b"10.0.0.1"))
+    server, response = server_respond(echoed, cookies, peer=b"10.0.0.1")
+    assert server is not None and response["type"] == "server-hello"
+
+
+def test_cookie_encoding_is_unambiguous():
+    cookies = CookieAuthority(b"s" * 32, clock=lambda: 1000.0)
+    split = {"type": "client-hello", "a": "1", "b": "2"}
+    joined = {"type": "client-hello", "a": "1\nb=2"}
+    assert cookies.issue(split, peer=b"10.0.0.1") != cookies.issue(joined, peer=b"10.0.0.1")
+    assert not cookies.verify(dict(joined, **cookies.issue(split, peer=b"10.0.0.1")), peer=b"10.0.0.1")
+
+
+def test_cookies_require_a_peer_address():
+    cookies = CookieAuthority()
+    hello = client_hello(ctx_init("client"))
+    for call in (
+        lambda: cookies.issue(hello, peer=b""),
+        lambda: cookies.verify(hello, peer=b""),
+        lambda: server_respond(hello, cookies, peer=b""),
+    ):
+        try:
+            call()
+            assert False, "empty peer accepted"
+        except ValueError as exc:
+            assert "peer address" in str(exc)
@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+
+from tricrown_hybrid import CookieAuthority, client_hello, ctx_init
+from tricrown_hybrid.aio import (
+    decode_message,
+    decode_record,
+    encode_message,
+    encode_record,
+    open_connection,
+    start_server,
+)
+
+
+async def _echo(stream):
+    async for message in stream:
+        await stream.send(message[::-1])
+        await stream.flush()
+
+
+def _run(coro):
+    return asyncio.run(asyncio.wait_for(coro, timeout=30))
+
+
+def test_message_and_record_frames_round_trip():
+    hello = client_hello(ctx_init("client"))
+    assert decode_message(encode_message(hello)) == hello
+
+    record = {"aad": b"meta", "nonce": bytes(range(12)), "ct": b"ciphertext"}
+    assert decode_record(encode_record(record)) == record
+
+    with pytest.raises(ValueError):
+        decode_record(encode_record(record)[:8])
+    with pytest.raises(ValueError):
+        encode_message({"type": "bogus"})
+
+
+@pytest.mark.parametrize("cookies", [None, CookieAuthority()])
+def test_loopback_handshake_and_records(cookies):
+    async def main():
+        server = await start_server(_echo, cookies=cookies)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            stream = await open_connection("127.0.0.1", port)
+            await stream.send(b"hello")
+            await stream.send(b"world", aad=b"meta")
+            replies = [await stream.recv(), await stream.recv()]
+            await stream.close()
+        finally:
+            server.close()
+            await server.wait_closed()
+        return replies
+
+    assert _run(main()) == [b"olleh", b"dlrow"]
+
+
+def test_small_writes_are_batched():
+    async def sink(stream):
+        received = []
+        async for message in stream:
+            received.append(message)
+        results.append(received)
+
+    results = []
+
+    async def main():
+        server = await start_server(sink)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            stream = await open_connection("127.0.0.1", port, batch_size=1024)
+            writes = []
+            original = stream.writer.write
+            stream.writer.write = lambda data: (writes.append(len(data)), original(data))
+            for index in range(100):
+                await stream.send(bytes([index]) * 20)
+            await stream.send_many([b"tail"] * 10)
+            await stream.close()
+            for _ in range(100):
+                if results:
+                    break
+                await asyncio.sleep(0.01)
+        finally:
+            server.close()
+            await server.wait_closed()
+        return writes
+
+    writes = _run(main())
+    assert len(writes) < 10
+    assert results[0][:100] == [bytes([index]) * 20 for index in range(100)]
+    assert results[0][100:] == [b"tail"] * 10
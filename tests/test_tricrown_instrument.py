@@ -0,0 +1,60 @@
+import json
+
+import pytest
+
+from tricrown.instrument import METRICS, Instrumentation
+from tricrown.session import TriCrownParty, perform_handshake
+
+
+@pytest.fixture
+def metrics():
+    METRICS.reset()
+    METRICS.enable()
+    yield METRICS
+    METRICS.disable()
+    METRICS.reset()
+
+
+def test_handshake_and_record_phases_are_reported(metrics):
+    client, server = perform_handshake(TriCrownParty(role="client"), TriCrownParty(role="server"))
+    server.session.open(client.session.seal(b"x" * 100))
+    server.session.open_many(client.session.seal_many([b"a", b"bc"]))
+    client.session.rekey(new_secrets=[b"s" * 32])
+
+    snapshot = metrics.snapshot()
+    timers, counters = snapshot["timers"], snapshot["counters"]
+    for phase in (
+        "handshake.kem_encapsulate",
+        "handshake.kem_decapsulate",
+        "handshake.x25519",
+        "handshake.sign",
+        "handshake.verify",
+        "handshake.derive",
+        "audit_salt",
+        "transcript",
+        "hkdf",
+        "record.seal",
+        "record.open",
+        "rekey",
+    ):
+        assert timers[phase]["calls"] > 0, phase
+        assert timers[phase]["min"] <= timers[phase]["mean"] <= timers[phase]["max"]
+    assert timers["handshake.sign"]["calls"] == 2
+    assert counters["handshakes"] == 2
+    assert counters["records.sealed"] == counters["records.opened"] == 3
+    assert counters["bytes.sealed"] == counters["bytes.opened"] == 103
+    assert counters["rekeys"] == 1
+    assert json.loads(metrics.to_json()) == snapshot
+
+
+def test_disabled_registry_records_nothing():
+    registry = Instrumentation()
+    with registry.phase("anything"):
+        pass
+    assert registry.snapshot() == {"enabled": False, "timers": {}, "counters": {}}
+
+    METRICS.reset()
+    client, server = perform_handshake(TriCrownParty(role="client"), TriCrownParty(role="server"))
+    server.session.open(client.session.seal(b"x"))
+    assert METRICS.snapshot()["timers"] == {}
+    assert METRICS.snapshot()["counters"] == {}
@@ -0,0 +1,62 @@
+import pytest
+
+from tricrown.mux import MultiplexedSession, derive_stream_chains
+from tricrown.session import Record, TriCrownParty, perform_handshake
+
+
+def _mux_pair(max_workers=4):
+    client, server = perform_handshake(TriCrownParty(role="client"), TriCrownParty(role="server"))
+    return (
+        MultiplexedSession(client.session, max_workers=max_workers),
+        MultiplexedSession(server.session, max_workers=max_workers),
+    )
+
+
+def test_stream_chains_are_independent_and_mirror_the_peer():
+    client, server = perform_handshake(TriCrownParty(role="client"), TriCrownParty(role="server"))
+    one = derive_stream_chains(client.session.chains, 1, "client")
+    two = derive_stream_chains(client.session.chains, 2, "client")
+    peer = derive_stream_chains(server.session.chains, 1, "server")
+    assert one.ck_s != two.ck_s and one.ck_s != client.session.chains.ck_s
+    assert one.ck_s == peer.ck_r and one.ck_r == peer.ck_s
+    with pytest.raises(ValueError):
+        derive_stream_chains(client.session.chains, 0, "client")
+
+
+def test_concurrent_seal_and_open_preserve_order_per_stream():
+    sender, receiver = _mux_pair()
+    with sender, receiver:
+        messages = [(1 + index % 3, f"msg-{index}".encode()) for index in range(30)]
+        records = sender.seal_concurrent(messages)
+        assert [record.stream_id for record in records] == [stream_id for stream_id, _ in messages]
+        assert [record.sequence for record in records if record.stream_id == 2] == list(range(10))
+        assert receiver.open_concurrent(records) == [plaintext for _, plaintext in messages]
+
+
+def test_stream_zero_is_the_parent_session():
+    sender, receiver = _mux_pair()
+    with sender, receiver:
+        assert sender.stream_session(0) is sender.session
+        record = sender.seal(0, b"parent")
+        assert record.stream_id == 0
+        assert receiver.open(record) == b"parent"
+        assert receiver.open(sender.session.seal(b"direct")) == b"direct"
+        assert receiver.session.received_messages == 2
+
+
+def test_record_routed_to_wrong_stream_is_rejected():
+    sender, receiver = _mux_pair()
+    with sender, receiver:
+        record = sender.seal(1, b"data")
+        record.stream_id = 2
+        with pytest.raises(ValueError, match="commitment mismatch"):
+            receiver.open(record)
+
+
+def test_record_frames_carry_the_stream_id():
+    sender, _ = _mux_pair()
+    with sender:
+        record = sender.seal(7, b"data")
+    assert Record.from_buffer(record.to_bytes()) == record
+    plain = sender.session.seal(b"data")
+    assert Record.from_buffer(plain.to_bytes()).stream_id == 0
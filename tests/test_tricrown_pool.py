@@ -0,0 +1,55 @@
+import time
+
+import pytest
+
+from tricrown.pool import KeyMaterialPool, generate_key_material
+from tricrown.session import perform_handshake
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return False
+
+
+def test_background_thread_fills_to_high_watermark():
+    with KeyMaterialPool(low_watermark=2, high_watermark=6) as pool:
+        assert _wait_for(lambda: pool.stats().size == 6)
+        for _ in range(5):
+            pool.acquire()
+        assert _wait_for(lambda: pool.stats().size == 6)
+        stats = pool.stats()
+    assert stats.hits == 5
+    assert stats.misses == 0
+    assert stats.generated == 11
+    assert stats.refills >= 2
+
+
+def test_empty_pool_generates_inline_and_counts_misses():
+    pool = KeyMaterialPool(low_watermark=0, high_watermark=1)
+    material = pool.acquire()
+    assert material.x25519_private is not None
+    assert pool.stats().misses == 1
+    with pytest.raises(TimeoutError):
+        pool.acquire(block=True, timeout=0.01)
+
+
+def test_pooled_parties_complete_a_handshake_with_unique_keys():
+    pool = KeyMaterialPool(low_watermark=1, high_watermark=4)
+    pool.fill()
+    client = pool.party("client")
+    server = pool.party("server", encapsulate_back=False)
+    assert client.x25519_public != server.x25519_public
+    assert client.kem_ml is not server.kem_ml
+    client_result, server_result = perform_handshake(client, server)
+    assert server_result.session.open(client_result.session.seal(b"pooled")) == b"pooled"
+    assert pool.stats().hits == 2
+
+
+def test_watermarks_are_validated():
+    with pytest.raises(ValueError):
+        KeyMaterialPool(low_watermark=4, high_watermark=4)
+    assert generate_key_material().signature.public_key
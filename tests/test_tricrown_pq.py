@@ -0,0 +1,67 @@
+import copy
+
+from tricrown.pq import (
+    BatchEncapsulation,
+    DecapCache,
+    Encapsulation,
+    KeypairPrefetcher,
+    decapsulate_batch,
+    encapsulate_batch,
+    random_stub_kem,
+    random_stub_kem_batch,
+)
+
+
+def test_decap_cache_is_lru_bounded_with_counters():
+    cache = DecapCache(max_entries=2)
+    cache.put(b"a", b"1")
+    cache.put(b"b", b"2")
+    assert cache.get(b"a") == b"1"
+    cache.put(b"c", b"3")
+    assert cache.get(b"b") is None
+    assert cache.get(b"c") == b"3"
+    stats = cache.stats()
+    assert (stats.size, stats.hits, stats.misses, stats.evictions) == (2, 2, 1, 1)
+    assert copy.deepcopy(cache).stats() == stats
+
+
+def test_stub_kem_cache_no_longer_grows_without_bound():
+    kem = random_stub_kem("ML-KEM-stub")
+    kem.decap_cache = DecapCache(max_entries=8)
+    peers = [random_stub_kem("ML-KEM-stub").public_key for _ in range(20)]
+    results = kem.encapsulate_batch(peers)
+    assert len(kem.decap_cache) == 8
+    ciphertexts = [ct for ct, _ in results]
+    assert kem.decapsulate_batch(ciphertexts) == [ss for _, ss in results]
+    assert kem.decap_cache.stats().hits == 8
+
+
+def test_batch_helpers_fall_back_to_single_calls():
+    class SingleOnly:
+        def public_key_bytes(self):
+            return b"pk"
+
+        def secret_key_bytes(self):
+            return b"sk"
+
+        def encapsulate(self, peer_public_key):
+            return peer_public_key[::-1], peer_public_key
+
+        def decapsulate(self, ciphertext):
+            return ciphertext[::-1]
+
+    kem = SingleOnly()
+    assert isinstance(kem, Encapsulation)
+    assert not isinstance(kem, BatchEncapsulation)
+    assert isinstance(random_stub_kem("ML-KEM-stub"), BatchEncapsulation)
+    pairs = encapsulate_batch(kem, [b"ab", b"cd"])
+    assert pairs == [(b"ba", b"ab"), (b"dc", b"cd")]
+    assert decapsulate_batch(kem, [ct for ct, _ in pairs]) == [b"ab", b"cd"]
+
+
+def test_keypair_prefetcher_generates_in_batches():
+    prefetcher = KeypairPrefetcher(lambda count: random_stub_kem_batch("ML-KEM-stub", count), batch_size=4)
+    keys = [prefetcher.take() for _ in range(6)]
+    assert prefetcher.batches == 2
+    assert len(prefetcher) == 2
+    assert len({kem.public_key for kem in keys}) == 6
@@ -0,0 +1,63 @@
+import pytest
+
+from tricrown.resumption import (
+    ClientTicket,
+    TicketIssuer,
+    TicketStore,
+    perform_resumption,
+    resumption_secret,
+)
+from tricrown.session import TriCrownParty, perform_handshake
+
+
+def _ticket(issuer):
+    client_result, server_result = perform_handshake(
+        TriCrownParty(role="client"), TriCrownParty(role="server")
+    )
+    assert resumption_secret(client_result.session) == resumption_secret(server_result.session)
+    return ClientTicket.from_session(client_result.session, issuer.issue(server_result.session))
+
+
+def test_resumed_sessions_exchange_records():
+    issuer = TicketIssuer()
+    client_result, server_result = perform_resumption(_ticket(issuer), issuer)
+    assert client_result.session.session_id == server_result.session.session_id
+    record = client_result.session.seal(b"welcome back", aad=b"r")
+    assert server_result.session.open(record) == b"welcome back"
+    assert client_result.session.open(server_result.session.seal(b"hi")) == b"hi"
+
+
+def test_tickets_are_single_use_and_tamper_evident():
+    issuer = TicketIssuer()
+    ticket = _ticket(issuer)
+    perform_resumption(ticket, issuer)
+    with pytest.raises(ValueError, match="already used"):
+        perform_resumption(ticket, issuer)
+    forged = ClientTicket(ticket=ticket.ticket[:-1] + bytes([ticket.ticket[-1] ^ 1]), secret=ticket.secret)
+    with pytest.raises(ValueError, match="invalid"):
+        perform_resumption(forged, issuer)
+    stats = issuer.store.stats()
+    assert (stats.issued, stats.redeemed, stats.rejected) == (1, 1, 1)
+
+
+def test_ticket_store_enforces_ttl_and_size():
+    now = [0.0]
+    store = TicketStore(max_entries=2, ttl=10.0, clock=lambda: now[0])
+    store.add(b"a")
+    store.add(b"b")
+    store.add(b"c")
+    assert store.stats().evicted == 1
+    assert not store.redeem(b"a")
+    now[0] = 11.0
+    assert not store.redeem(b"b")
+    stats = store.stats()
+    assert stats.expired == 2
+    assert stats.size == 0
+
+
+def test_wrong_secret_yields_unusable_session():
+    issuer = TicketIssuer()
+    ticket = _ticket(issuer)
+    client_result, server_result = perform_resumption(ClientTicket(ticket.ticket, bytes(32)), issuer)
+    with pytest.raises(ValueError):
+        server_result.session.open(client_result.session.seal(b"x"))
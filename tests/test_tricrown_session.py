@@ -0,0 +1,284 @@
+import copy
+import io
+import os
+
+import pytest
+
+from tricrown.crypto import Transcript, byte_histogram, transcript_hash
+from tricrown.session import (
+    STREAM_FINAL,
+    Record,
+    RecordBatch,
+    TriCrownParty,
+    audit_salt_from_stats,
+    compute_audit_salt,
+    iter_records,
+    perform_handshake,
+)
+
+
+def _session_pair():
+    client_result, server_result = perform_handshake(
+        TriCrownParty(role="client"), TriCrownParty(role="server")
+    )
+    return client_result.session, server_result.session
+
+
+def test_handshake_sessions_round_trip():
+    client, server = _session_pair()
+    assert client.chains.ck_s == server.chains.ck_r
+    assert client.chains.k_commit == server.chains.k_commit
+    record = client.seal(b"ping", aad=b"hdr")
+    assert server.open(record) == b"ping"
+    reply = server.seal(b"pong")
+    assert client.open(reply) == b"pong"
+
+
+def test_seal_many_matches_sequential_seal():
+    client, _ = _session_pair()
+    twin = copy.deepcopy(client)
+    plaintexts = [b"", b"a", b"bc" * 50, b"def" * 1000]
+    aads = [b"x", b"", b"yy", b"zzz"]
+
+    batch = client.seal_many(plaintexts, aads)
+    expected = [twin.seal(pt, aad=aad) for pt, aad in zip(plaintexts, aads)]
+
+    assert isinstance(batch, RecordBatch)
+    assert len(batch) == len(plaintexts)
+    assert list(batch) == expected
+    assert client.chains.ck_s == twin.chains.ck_s
+    assert client.sent_messages == twin.sent_messages
+
+
+def test_open_many_accepts_batches_and_records():
+    client, server = _session_pair()
+    first = client.seal_many([b"one", b"two"])
+    second = [client.seal(b"three"), client.seal(b"four")]
+    assert server.open_many(first) == [b"one", b"two"]
+    assert server.open_many(second) == [b"three", b"four"]
+    assert server.received_messages == 4
+
+
+def test_open_many_is_all_or_nothing():
+    client, server = _session_pair()
+    records = list(client.seal_many([b"alpha", b"beta"]))
+    records[1].commitment = bytes(32)
+    ck_r = server.chains.ck_r
+    with pytest.raises(ValueError, match="commitment mismatch"):
+        server.open_many(records)
+    assert server.chains.ck_r == ck_r
+    assert server.received_messages == 0
+
+
+def test_seal_many_rejects_mismatched_aads():
+    client, _ = _session_pair()
+    with pytest.raises(ValueError):
+        client.seal_many([b"a", b"b"], [b""])
+
+
+def test_record_wire_codec_round_trips_without_copying():
+    client, server = _session_pair()
+    record = client.seal(b"payload", aad=b"header")
+    record.stream_id = 5
+    encoded = record.to_bytes()
+    assert len(encoded) == record.wire_size() == 24 + 12 + 32 + 6 + len(record.ciphertext)
+
+    decoded = Record.from_buffer(memoryview(encoded))
+    assert decoded == record
+    assert isinstance(decoded.ciphertext, memoryview)
+    assert decoded.ciphertext.obj is encoded
+    assert server.open(decoded) == b"payload"
+    assert not hasattr(decoded, "__dict__")
+
+
+def test_iter_records_and_malformed_buffers():
+    client, _ = _session_pair()
+    records = [client.seal(bytes(size)) for size in (0, 10, 100)]
+    stream = b"".join(record.to_bytes() for record in records)
+    assert list(iter_records(stream)) == records
+
+    encoded = records[1].to_bytes()
+    with pytest.raises(ValueError, match="does not match"):
+        Record.from_buffer(encoded + b"x")
+    with pytest.raises(ValueError, match="overruns"):
+        Record.from_buffer(encoded[:-1])
+    with pytest.raises(ValueError, match="truncated"):
+        Record.from_buffer(encoded[:10])
+    with pytest.raises(ValueError, match="suite"):
+        Record.from_buffer(b"\x00\x01" + encoded[2:])
+    with pytest.raises(ValueError, match="reserved header bits"):
+        Record.from_buffer(encoded[:3] + b"\x01" + encoded[4:])
+
+
+@pytest.mark.parametrize("size", [0, 1, 63, 64, 65, 64 * 5 + 7])
+def test_seal_stream_round_trip(size):
+    client, server = _session_pair()
+    payload = os.urandom(size)
+    sealed = io.BytesIO()
+    records = client.seal_stream(io.BytesIO(payload), sealed, chunk_size=64, aad=b"file")
+    assert records == max(1, -(-size // 64))
+    assert client.sent_messages == records
+
+    sealed.seek(0)
+    out = io.BytesIO()
+    assert server.open_stream(sealed, out, aad=b"file") == size
+    assert out.getvalue() == payload
+    assert server.received_messages == records
+
+
+def test_open_stream_detects_truncation_and_tampering():
+    client, server = _session_pair()
+    sealed = io.BytesIO()
+    client.seal_stream(io.BytesIO(bytes(256)), sealed, chunk_size=64)
+    data = sealed.getvalue()
+    records = list(iter_records(data))
+    assert [record.sequence for record in records] == [0, 1, 2, 3]
+    assert [record.aad[-1] for record in records] == [0, 0, 0, STREAM_FINAL]
+    record_size = len(data) // 4
+    flags_at = record_size - len(records[0].ciphertext) - 1
+
+    twin = copy.deepcopy(server)
+    with pytest.raises(ValueError, match="truncated"):
+        server.open_stream(io.BytesIO(data[:-record_size]), io.BytesIO())
+    with pytest.raises(ValueError, match="truncated"):
+        twin.open_stream(io.BytesIO(data[:-1]), io.BytesIO())
+
+    _, server = _session_pair()
+    forged = bytearray(data[:-record_size])
+    forged[-record_size + flags_at] = STREAM_FINAL
+    with pytest.raises(ValueError, match="commitment mismatch"):
+        server.open_stream(io.BytesIO(bytes(forged)), io.BytesIO())
+
+    _, server = _session_pair()
+    with pytest.raises(ValueError, match="does not match"):
+        server.open_stream(io.BytesIO(data), io.BytesIO(), aad=b"other")
+
+
+def test_open_stream_enforces_max_chunk_size():
+    client, server = _session_pair()
+    sealed = io.BytesIO()
+    client.seal_stream(io.BytesIO(bytes(1000)), sealed, chunk_size=1000)
+    sealed.seek(0)
+    with pytest.raises(ValueError, match="max_chunk_size"):
+        server.open_stream(sealed, io.BytesIO(), max_chunk_size=512)
+
+
+def _windowed_pair(window=8, max_skipped_keys=1024):
+    client, server = _session_pair()
+    server.receive_window = window
+    server.max_skipped_keys = max_skipped_keys
+    return client, server
+
+
+def test_strict_mode_rejects_out_of_order_records():
+    client, server = _session_pair()
+    client.seal(b"lost")
+    with pytest.raises(ValueError, match="out-of-order"):
+        server.open(client.seal(b"late"))
+
+
+def test_receive_window_opens_records_as_they_arrive():
+    client, server = _windowed_pair()
+    records = [client.seal(f"m{i}".encode()) for i in range(6)]
+    for index in (3, 0, 5, 1, 2, 4):
+        assert server.open(records[index]) == f"m{index}".encode()
+    assert server.received_messages == 6
+    assert not server._skipped_keys
+
+
+def test_receive_window_rejects_replays_and_far_jumps():
+    client, server = _windowed_pair(window=4)
+    records = [client.seal(bytes([i])) for i in range(10)]
+    server.open(records[2])
+    with pytest.raises(ValueError, match="replayed"):
+        server.open(records[2])
+    with pytest.raises(ValueError, match="too far ahead"):
+        server.open(records[9])
+    server.open(records[5])
+    with pytest.raises(ValueError, match="outside the replay window"):
+        server.open(records[0])
+
+
+def test_open_many_with_receive_window_rejects_replays():
+    client, server = _windowed_pair(window=8)
+    records = [client.seal(bytes([i])) for i in range(6)]
+    assert server.open_many([records[3], records[0]]) == [b"\x03", b"\x00"]
+    with pytest.raises(ValueError, match="replayed"):
+        server.open_many([records[3]])
+    with pytest.raises(ValueError, match="replayed"):
+        server.open_many([records[4], records[4]])
+    assert server.received_messages == 4
+    assert sorted(server._skipped_keys) == [1, 2]
+    assert server.open_many([records[2], records[5], records[1], records[4]]) == [
+        b"\x02", b"\x05", b"\x01", b"\x04"
+    ]
+    assert not server._skipped_keys
+
+
+def test_open_many_with_receive_window_is_all_or_nothing():
+    client, server = _windowed_pair(window=8)
+    records = [client.seal(bytes([i])) for i in range(4)]
+    server.open(records[2])
+    tampered = copy.copy(records[3])
+    tampered.commitment = bytes(32)
+    state = (server.chains.ck_r, server.received_messages, dict(server._skipped_keys), server._replay_bits)
+    with pytest.raises(ValueError, match="commitment mismatch"):
+        server.open_many([records[0], tampered])
+    assert (server.chains.ck_r, server.received_messages, dict(server._skipped_keys), server._replay_bits) == state
+    assert server.open_many([records[0], records[3], records[1]]) == [b"\x00", b"\x03", b"\x01"]
+
+
+def test_skipped_key_cache_is_bounded():
+    client, server = _windowed_pair(window=16, max_skipped_keys=2)
+    records = [client.seal(bytes([i])) for i in range(6)]
+    server.open(records[5])
+    assert len(server._skipped_keys) == 2
+    assert server.skipped_key_evictions == 3
+    with pytest.raises(ValueError, match="expired"):
+        server.open(records[0])
+    assert server.open(records[4]) == bytes([4])
+
+
+def _legacy_audit_salt(messages):
+    import math
+    from hashlib import sha3_256
+
+    accumulator = bytearray()
+    for idx, message in enumerate(messages):
+        length = len(message)
+        entropy_est = sum(message.count(byte) for byte in range(256)) / (length or 1)
+        for value in (float(length), entropy_est + idx, math.sin(length / (idx + 1 or 1))):
+            accumulator.extend((int(value * (1 << 20)) & 0xFFFFFFFFFFFFFFFF).to_bytes(8, "big"))
+    return sha3_256(bytes(accumulator)).digest()
+
+
+def test_transcript_matches_transcript_hash_and_legacy_salt():
+    messages = [b"", b"hello", bytes(range(256)) * 4, b"\x00" * 1000]
+    transcript = Transcript(track_histograms=True)
+    for index, message in enumerate(messages):
+        transcript.absorb(message)
+        assert transcript.digest() == transcript_hash(messages[: index + 1])
+
+    assert compute_audit_salt(messages) == _legacy_audit_salt(messages)
+    assert audit_salt_from_stats(transcript.stats, version=1) == _legacy_audit_salt(messages)
+    v2 = audit_salt_from_stats(transcript.stats, version=2)
+    assert v2 == compute_audit_salt(messages, version=2)
+    assert v2 != _legacy_audit_salt(messages)
+
+
+def test_byte_histogram_counts_every_byte():
+    histogram = byte_histogram(b"aab\x00")
+    assert len(histogram) == 256
+    assert histogram[ord("a")] == 2
+    assert histogram[0] == 1
+    assert sum(histogram) == 4
+
+
+def test_audit_salt_v2_handshake_round_trip():
+    client_result, server_result = perform_handshake(
+        TriCrownParty(role="client"), TriCrownParty(role="server"), audit_salt_version=2
+    )
+    record = client_result.session.seal(b"v2")
+    assert server_result.session.open(record) == b"v2"
+    with pytest.raises(ValueError):
+        perform_handshake(TriCrownParty(role="client"), TriCrownParty(role="server"), audit_salt_version=3)
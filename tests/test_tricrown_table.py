@@ -0,0 +1,133 @@
+import threading
+
+import pytest
+
+from tricrown.session import TriCrownParty, perform_handshake
+from tricrown.table import SessionTable
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _sessions():
+    client, server = perform_handshake(TriCrownParty(role="client"), TriCrownParty(role="server"))
+    return client.session, server.session
+
+
+def test_stored_session_round_trips_and_keeps_chain_state():
+    client, server = _sessions()
+    table = SessionTable(shards=4)
+    server.open(client.seal(b"first"))
+    table.put(server)
+
+    with table.checkout(server.session_id) as restored:
+        assert restored.chains == server.chains
+        assert restored.received_messages == 1
+        assert restored.aead_backend.name == server.aead_backend.name
+        assert restored.open(client.seal(b"second")) == b"second"
+        assert len(table) == 1
+        with pytest.raises(RuntimeError, match="checked out"):
+            table.put(server)
+    with table.checkout(server.session_id) as again:
+        assert again.received_messages == 2
+    assert len(table) == 1
+    with pytest.raises(KeyError):
+        with table.checkout(b"missing"):
+            pass
+
+
+def test_concurrent_checkouts_never_seal_the_same_sequence():
+    client, server = _sessions()
+    table = SessionTable(shards=1)
+    table.put(server)
+    inside = threading.Event()
+    release = threading.Event()
+    records = []
+
+    def first():
+        with table.checkout(server.session_id) as session:
+            inside.set()
+            release.wait(5)
+            records.append(session.seal(b"first"))
+
+    thread = threading.Thread(target=first)
+    thread.start()
+    assert inside.wait(5)
+    with pytest.raises(TimeoutError):
+        with table.checkout(server.session_id, timeout=0.05):
+            pass
+
+    def second():
+        with table.checkout(server.session_id) as session:
+            records.append(session.seal(b"second"))
+
+    waiter = threading.Thread(target=second)
+    waiter.start()
+    release.set()
+    thread.join(5)
+    waiter.join(5)
+
+    assert sorted(record.sequence for record in records) == [0, 1]
+    assert records[0].nonce != records[1].nonce
+    assert [client.open(record) for record in sorted(records, key=lambda r: r.sequence)] == [b"first", b"second"]
+
+
+def test_idle_and_ttl_eviction():
+    clock = _Clock()
+    table = SessionTable(shards=2, ttl=100.0, idle_timeout=10.0, clock=clock)
+    _, busy = _sessions()
+    _, idle = _sessions()
+    table.put(busy)
+    table.put(idle)
+
+    clock.now += 6
+    with table.checkout(busy.session_id):
+        pass
+    clock.now += 6
+    assert table.evict_expired() == 1
+    assert idle.session_id not in table
+    assert busy.session_id in table
+    assert table.stats().idle_evicted == 1
+
+    with table.checkout(busy.session_id):
+        pass
+    for _ in range(9):
+        clock.now += 9
+        with table.checkout(busy.session_id):
+            pass
+    clock.now += 9
+    assert busy.session_id not in table
+    stats = table.stats()
+    assert (stats.size, stats.expired, stats.idle_evicted) == (0, 1, 1)
+
+
+def test_windowed_sessions_are_rejected():
+    client, _ = _sessions()
+    client.receive_window = 8
+    with pytest.raises(ValueError, match="strict-order"):
+        SessionTable().put(client)
+
+
+def test_checkout_drops_a_session_that_no_longer_packs():
+    first, _ = _sessions()
+    second, _ = _sessions()
+    table = SessionTable()
+    table.put(first)
+    table.put(second)
+
+    with pytest.raises(ValueError, match="strict-order"):
+        with table.checkout(first.session_id) as session:
+            session.receive_window = 8
+    assert first.session_id not in table
+    assert len(table) == 1
+
+    with pytest.raises(LookupError, match="body failed"):
+        with table.checkout(second.session_id) as session:
+            session.receive_window = 8
+            raise LookupError("body failed")
+    assert len(table) == 0
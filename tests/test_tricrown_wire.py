@@ -0,0 +1,111 @@
+import pytest
+
+from tricrown.session import TriCrownParty, perform_handshake
+from tricrown.wire import (
+    BinaryHandshakeCodec,
+    FieldTag,
+    FrameType,
+    HelloFields,
+    JSONHandshakeCodec,
+    RESERVED_FIELD_TAGS,
+    RESERVED_FRAME_TYPES,
+    decode_frame,
+    encode_frame,
+    get_codec,
+)
+
+
+def _hello(role="client"):
+    return HelloFields(
+        role=role,
+        kem_ml=b"\x01" * 40,
+        kem_mce=b"\x02" * 1000,
+        x25519=b"\x03" * 32,
+        sig_alg="ML-DSA-stub",
+        sig_pk=b"\x04" * 64,
+    )
+
+
+def test_frame_round_trip_is_zero_copy():
+    frame_bytes = encode_frame(FrameType.CLIENT_ENCAPS, [(FieldTag.CT_ML, b"abc"), (FieldTag.CT_MCE, b"")])
+    frame = decode_frame(frame_bytes)
+    assert frame.frame_type is FrameType.CLIENT_ENCAPS
+    ct_ml = frame.field(FieldTag.CT_ML)
+    assert isinstance(ct_ml, memoryview)
+    assert ct_ml.obj is frame_bytes
+    assert bytes(ct_ml) == b"abc"
+    assert bytes(frame.field(FieldTag.CT_MCE)) == b""
+
+
+@pytest.mark.parametrize("mutate", [
+    lambda b: b[:3],
+    lambda b: b[:-1],
+    lambda b: bytes([2]) + b[1:],
+])
+def test_decode_frame_rejects_malformed_input(mutate):
+    frame_bytes = encode_frame(FrameType.CLIENT_SIG, [(FieldTag.SIGNATURE, b"sig")])
+    with pytest.raises(ValueError):
+        decode_frame(mutate(frame_bytes))
+
+
+def test_published_tags_keep_their_numbers_and_reserved_ones_are_rejected():
+    assert (FieldTag.TICKET, FieldTag.EPOCH) == (15, 17)
+    assert not RESERVED_FIELD_TAGS & set(FieldTag)
+    assert not RESERVED_FRAME_TYPES & set(FrameType)
+    frame_bytes = bytearray(encode_frame(FrameType.REKEY_OFFER, [(FieldTag.EPOCH, b"\x00")]))
+    frame_bytes[6] = 16
+    with pytest.raises(ValueError, match="reserved field tag"):
+        decode_frame(bytes(frame_bytes))
+    frame_bytes[1] = 7
+    with pytest.raises(ValueError, match="reserved frame type"):
+        decode_frame(bytes(frame_bytes))
+
+
+@pytest.mark.parametrize("codec", [JSONHandshakeCodec(), BinaryHandshakeCodec()])
+def test_codecs_round_trip_handshake_messages(codec):
+    hello = _hello("server")
+    decoded = codec.decode_hello(codec.encode_hello(hello))
+    assert decoded.role == "server"
+    assert bytes(decoded.kem_mce) == hello.kem_mce
+    assert bytes(decoded.sig_pk) == hello.sig_pk
+    assert decoded.sig_alg == hello.sig_alg
+
+    ct_ml, ct_mce = codec.decode_encaps(codec.encode_encaps("client", b"ml", b"mce"))
+    assert (bytes(ct_ml), bytes(ct_mce)) == (b"ml", b"mce")
+    assert bytes(codec.decode_signature(codec.encode_signature("server", b"sig"))) == b"sig"
+
+
+@pytest.mark.parametrize("message", [
+    b"not json",
+    b"[]",
+    b'{"client_hello": "client"}',
+    b'{"client_hello": {"role": "client"}}',
+    b'{"client_encaps": {"ct_ml_c": "00"}}',
+    b'{"client_encaps": {"ct_ml_c": 1, "ct_mce_c": "00"}}',
+])
+def test_json_codec_reports_malformed_messages_as_value_errors(message):
+    codec = JSONHandshakeCodec()
+    for decode in (codec.decode_hello, codec.decode_encaps, codec.decode_signature):
+        with pytest.raises(ValueError):
+            decode(message)
+
+
+def test_binary_frames_are_smaller_than_json():
+    hello = _hello()
+    json_size = len(JSONHandshakeCodec().encode_hello(hello))
+    binary_size = len(BinaryHandshakeCodec().encode_hello(hello))
+    assert binary_size < json_size / 1.9
+
+
+def test_binary_wire_handshake_produces_working_sessions():
+    client_result, server_result = perform_handshake(
+        TriCrownParty(role="client"), TriCrownParty(role="server"), wire="binary"
+    )
+    assert client_result.transcript == server_result.transcript
+    record = client_result.session.seal(b"over the wire")
+    assert server_result.session.open(record) == b"over the wire"
+
+
+def test_unknown_wire_format_is_rejected():
+    with pytest.raises(ValueError):
+        get_codec("xml")
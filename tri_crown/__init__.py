@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from .cache import DISCRETISATION_CACHE, DiscretisationCache, DiscretisationCacheStats
 from .kalman import (
     discretize_falling_body,
     kalman_predict,
@@ -12,6 +13,7 @@ from .kalman import (
 from .math_process import (
     FeatureDigests,
     ProcessDiscretisation,
+    SlidingFourierEnergy,
     apply_caesar_shift,
     bigram_probabilities,
     causal_convolution,
@@ -20,12 +22,15 @@ from .math_process import (
     fixed_point_key_binding,
     fourier_energy_ratios,
     green_convolution,
+    green_convolution_batch,
     huber_irls as annex_huber_irls,
+    huber_irls_chunked,
     interrogative_score,
     math_salt,
     matrix_exponential,
     modal_coordinates,
     riccati_gain,
+    riccati_gain_batch,
     reverse_letters,
 )
 from .process import (
@@ -46,9 +51,14 @@ huber_irls = annex_huber_irls
 legacy_huber_irls = process_huber_irls
 
 __all__ = [
+    # cache exports
+    "DISCRETISATION_CACHE",
+    "DiscretisationCache",
+    "DiscretisationCacheStats",
     # math_process exports
     "FeatureDigests",
     "ProcessDiscretisation",
+    "SlidingFourierEnergy",
     "apply_caesar_shift",
     "bigram_probabilities",
     "causal_convolution",
@@ -57,12 +67,15 @@ __all__ = [
     "fixed_point_key_binding",
     "fourier_energy_ratios",
     "green_convolution",
+    "green_convolution_batch",
     "huber_irls",
+    "huber_irls_chunked",
     "interrogative_score",
     "math_salt",
     "matrix_exponential",
     "modal_coordinates",
     "riccati_gain",
+    "riccati_gain_batch",
     "reverse_letters",
     # process exports
     "caesar_cipher",
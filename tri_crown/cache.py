@@ -0,0 +1,135 @@
+"""Content-addressed LRU cache for process-model discretisations.
+
+Discretising the same plant repeatedly (``expm(A * dt)``, the block
+exponential behind ``Gamma`` or the Van Loan noise integral) dominates the
+cost of re-running the process layer with unchanged matrices.  The helpers
+in :mod:`tri_crown.math_process` and :mod:`tri_crown.process` therefore
+look their results up in :data:`DISCRETISATION_CACHE` first.
+
+Entries are keyed on the function name, the dtype, shape and raw bytes of
+every array argument and the exact value of every scalar, so equal inputs
+hit regardless of object identity.  Cached arrays are copied on the way in
+and out, so callers may freely modify what they receive.
+"""
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Hashable, Sequence, Tuple, TypeVar
+
+import numpy as np
+
+_T = TypeVar("_T")
+
+
+@dataclass(frozen=True)
+class DiscretisationCacheStats:
+    """Snapshot of :class:`DiscretisationCache` counters."""
+
+    hits: int
+    misses: int
+    size: int
+    max_entries: int
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+def _copy(value: Any) -> Any:
+    if isinstance(value, np.ndarray):
+        return value.copy()
+    if isinstance(value, tuple):
+        return tuple(_copy(item) for item in value)
+    return value
+
+
+def array_key(name: str, arrays: Sequence[np.ndarray], scalars: Sequence[float] = ()) -> Tuple[Hashable, ...]:
+    """Return the content key for ``name`` called on ``arrays`` and ``scalars``."""
+
+    digest = hashlib.blake2b(digest_size=16)
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(array.dtype.str.encode("ascii"))
+        digest.update(repr(array.shape).encode("ascii"))
+        digest.update(array.tobytes())
+    return (name, digest.digest(), *(float(value) for value in scalars))
+
+
+class DiscretisationCache:
+    """Thread-safe, size-bounded LRU map from content keys to results.
+
+    ``max_entries=0`` disables caching; every lookup then recomputes.
+    """
+
+    def __init__(self, max_entries: int = 256) -> None:
+        if max_entries < 0:
+            raise ValueError("max_entries must be non-negative")
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[Hashable, ...], Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(
+        self,
+        name: str,
+        arrays: Sequence[np.ndarray],
+        scalars: Sequence[float],
+        compute: Callable[[], _T],
+    ) -> _T:
+        """Return the cached result for the key, computing it on a miss."""
+
+        if self.max_entries == 0:
+            with self._lock:
+                self._misses += 1
+            return compute()
+        key = array_key(name, arrays, scalars)
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return _copy(cached)
+            self._misses += 1
+        value = compute()
+        with self._lock:
+            self._entries[key] = _copy(value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def resize(self, max_entries: int) -> None:
+        if max_entries < 0:
+            raise ValueError("max_entries must be non-negative")
+        with self._lock:
+            self.max_entries = max_entries
+            while len(self._entries) > max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every entry and reset the counters."""
+
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+
+    def stats(self) -> DiscretisationCacheStats:
+        with self._lock:
+            return DiscretisationCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                size=len(self._entries),
+                max_entries=self.max_entries,
+            )
+
+
+DISCRETISATION_CACHE = DiscretisationCache()
@@ -11,7 +11,7 @@ chosen fallbacks are employed.
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Iterable, Mapping, Tuple
+from typing import Callable, Iterable, Iterator, Mapping, Tuple, Union
 
 import hashlib
 import math
@@ -19,6 +19,8 @@ import string
 
 import numpy as np
 
+from .cache import DISCRETISATION_CACHE
+
 try:  # pragma: no cover - exercised indirectly in environments with SciPy.
     from scipy.linalg import expm, solve_discrete_are
 except Exception:  # pragma: no cover - SciPy is optional.
@@ -62,9 +64,17 @@ def _series_expm(A: np.ndarray, dt: float, order: int = 6) -> np.ndarray:
     return result
 
 
+def _matrix_exponential(A: np.ndarray, dt: float) -> np.ndarray:
+    if expm is not None:
+        return expm(A * dt)
+    return _series_expm(A, dt)
+
+
 def matrix_exponential(A: np.ndarray, dt: float) -> np.ndarray:
     """Return ``exp(A * dt)`` using SciPy when available.
 
+    Results are memoised in :data:`tri_crown.cache.DISCRETISATION_CACHE`.
+
     Parameters
     ----------
     A:
@@ -73,9 +83,8 @@ def matrix_exponential(A: np.ndarray, dt: float) -> np.ndarray:
         Time step in seconds.
     """
 
-    if expm is not None:
-        return expm(A * dt)
-    return _series_expm(A, dt)
+    A = np.asarray(A)
+    return DISCRETISATION_CACHE.lookup("matrix_exponential", (A,), (dt,), lambda: _matrix_exponential(A, dt))
 
 
 @dataclass(frozen=True)
@@ -88,8 +97,18 @@ class ProcessDiscretisation:
 
 
 def _compute_gamma(A: np.ndarray, B: np.ndarray, dt: float, phi: np.ndarray) -> np.ndarray:
-    """Compute the discretised inhomogeneous term."""
+    """Compute the discretised inhomogeneous term.
+
+    ``Gamma`` depends only on ``A``, ``B`` and ``dt``, which key the cached
+    result in :data:`tri_crown.cache.DISCRETISATION_CACHE`.
+    """
 
+    A = np.asarray(A)
+    B = np.asarray(B)
+    return DISCRETISATION_CACHE.lookup("gamma", (A, B), (dt,), lambda: _gamma_integral(A, B, dt))
+
+
+def _gamma_integral(A: np.ndarray, B: np.ndarray, dt: float) -> np.ndarray:
     if expm is not None:
         # Use the block matrix trick to get the exact integral.
         n, m = A.shape[0], B.shape[1]
@@ -108,7 +127,7 @@ def _compute_gamma(A: np.ndarray, B: np.ndarray, dt: float, phi: np.ndarray) ->
         weight = 2 + 2 * (i % 2 == 1)
         if i in (0, sub_steps):
             weight = 1
-        gamma += weight * matrix_exponential(A, dt - tau) @ B
+        gamma += weight * _matrix_exponential(A, dt - tau) @ B
     gamma *= dt / (3 * sub_steps)
     return gamma
 
@@ -145,6 +164,55 @@ def green_convolution(
     return ProcessDiscretisation(phi=phi, gamma=gamma, state_trajectory=trajectory)
 
 
+def green_convolution_batch(
+    A: np.ndarray,
+    B: np.ndarray,
+    controls: np.ndarray,
+    dt: float,
+    initial_states: np.ndarray | None = None,
+    *,
+    dtype: np.dtype | type = np.float64,
+    out: np.ndarray | None = None,
+) -> ProcessDiscretisation:
+    """Propagate many control sequences through the same discretised plant.
+
+    ``controls`` has shape ``(batch, T, m)`` and ``initial_states`` shape
+    ``(batch, n)``.  ``Phi`` and ``Gamma`` are computed once and every step
+    advances all trajectories with a single matrix product.  The returned
+    ``state_trajectory`` has shape ``(batch, T + 1, n)`` and is written into
+    ``out`` when given, whose dtype then takes precedence over ``dtype``;
+    ``np.float32`` halves memory traffic for large candidate sets.
+    """
+
+    if controls.ndim != 3:
+        raise ValueError("controls must be a 3-D array with shape (batch, T, m)")
+    batch, steps, _ = controls.shape
+    n = A.shape[0]
+    shape = (batch, steps + 1, n)
+    if out is None:
+        out = np.empty(shape, dtype=dtype)
+    elif out.shape != shape:
+        raise ValueError(f"out must have shape {shape}")
+    phi = matrix_exponential(A, dt)
+    gamma = _compute_gamma(A, B, dt, phi)
+
+    work_dtype = out.dtype
+    phi_t = phi.T.astype(work_dtype)
+    if initial_states is None:
+        out[:, 0] = 0
+    else:
+        if initial_states.shape != (batch, n):
+            raise ValueError("initial_states must have shape (batch, n)")
+        out[:, 0] = initial_states
+    np.matmul(controls.astype(work_dtype, copy=False), gamma.T.astype(work_dtype), out=out[:, 1:])
+    step = np.empty((batch, n), dtype=work_dtype)
+    for k in range(steps):
+        np.matmul(out[:, k], phi_t, out=step)
+        out[:, k + 1] += step
+
+    return ProcessDiscretisation(phi=phi, gamma=gamma, state_trajectory=out)
+
+
 def modal_coordinates(A: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
     """Return the eigenvector matrix and diagonal modal matrix of ``A``."""
 
@@ -155,6 +223,56 @@ def modal_coordinates(A: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
     return V, Lambda
 
 
+def _doubling_dare(
+    A: np.ndarray,
+    B: np.ndarray,
+    Q: np.ndarray,
+    R: np.ndarray,
+    *,
+    tolerance: float,
+    max_iterations: int,
+) -> np.ndarray:
+    """Solve stacked discrete Riccati equations by structure-preserving doubling.
+
+    Starting from ``A_0 = A``, ``G_0 = B R^-1 B^T`` and ``H_0 = Q`` the
+    iteration::
+
+        W_k     = I + G_k H_k
+        A_{k+1} = A_k W_k^-1 A_k
+        G_{k+1} = G_k + A_k W_k^-1 G_k A_k^T
+        H_{k+1} = H_k + A_k^T H_k W_k^-1 A_k
+
+    converges quadratically to ``H_k -> P``, so a few dozen iterations
+    replace thousands of fixed-point steps.  All operations broadcast over
+    leading batch dimensions.
+    """
+
+    n = A.shape[-1]
+    identity = np.eye(n)
+    A_k = A
+    G_k = B @ np.linalg.solve(R, np.swapaxes(B, -1, -2))
+    H_k = Q
+    for _ in range(max_iterations):
+        W = identity + G_k @ H_k
+        W_inv_A = np.linalg.solve(W, A_k)
+        W_inv_G = np.linalg.solve(W, G_k)
+        A_t = np.swapaxes(A_k, -1, -2)
+        H_next = H_k + A_t @ H_k @ W_inv_A
+        G_k = G_k + A_k @ W_inv_G @ A_t
+        A_k = A_k @ W_inv_A
+        change = np.abs(H_next - H_k).max(axis=(-2, -1))
+        scale = np.maximum(np.abs(H_next).max(axis=(-2, -1)), 1.0)
+        H_k = H_next
+        if np.all(change <= tolerance * scale):
+            break
+    return 0.5 * (H_k + np.swapaxes(H_k, -1, -2))
+
+
+def _lqr_gain(A: np.ndarray, B: np.ndarray, R: np.ndarray, P: np.ndarray) -> np.ndarray:
+    B_t_P = np.swapaxes(B, -1, -2) @ P
+    return np.linalg.solve(B_t_P @ B + R, B_t_P @ A)
+
+
 def riccati_gain(
     A: np.ndarray,
     B: np.ndarray,
@@ -168,26 +286,50 @@ def riccati_gain(
 
     The discrete-time algebraic Riccati equation yields the optimal cost
     matrix ``P`` and corresponding feedback gain ``K``.  SciPy's
-    :func:`solve_discrete_are` is used when present; otherwise an
-    iterative Kleinman algorithm is applied.
+    :func:`solve_discrete_are` is used when present; otherwise the
+    structure-preserving doubling algorithm is applied.
     """
 
     if solve_discrete_are is not None:
         P = solve_discrete_are(A, B, Q, R)
-        S = B.T @ P @ B + R
-        K = np.linalg.solve(S, B.T @ P @ A)
-        return K, P
+        return _lqr_gain(A, B, R, P), P
 
-    P = Q.copy()
-    for _ in range(max_iterations):
-        S = B.T @ P @ B + R
-        K = np.linalg.solve(S, B.T @ P @ A)
-        P_next = Q + A.T @ P @ (A - B @ K)
-        if np.linalg.norm(P_next - P, ord=np.inf) < tolerance:
-            P = P_next
-            break
-        P = P_next
-    return K, P
+    P = _doubling_dare(A, B, Q, R, tolerance=tolerance, max_iterations=max_iterations)
+    return _lqr_gain(A, B, R, P), P
+
+
+def riccati_gain_batch(
+    A: np.ndarray,
+    B: np.ndarray,
+    Q: np.ndarray,
+    R: np.ndarray,
+    *,
+    tolerance: float = 1e-10,
+    max_iterations: int = 100,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Solve many LQR problems at once, e.g. over a gain-scheduling grid.
+
+    ``A`` has shape ``(..., n, n)``, ``B`` ``(..., n, m)``, ``Q``
+    ``(..., n, n)`` and ``R`` ``(..., m, m)``; leading dimensions broadcast
+    against each other.  Every problem is solved by the vectorised doubling
+    iteration, which stops once all of them have converged.  Returns the
+    stacked gains ``K`` of shape ``(..., m, n)`` and costs ``P``.
+    """
+
+    A = np.asarray(A, dtype=float)
+    B = np.asarray(B, dtype=float)
+    Q = np.asarray(Q, dtype=float)
+    R = np.asarray(R, dtype=float)
+    if A.ndim < 2 or A.shape[-1] != A.shape[-2]:
+        raise ValueError("A must have shape (..., n, n)")
+    batch = np.broadcast_shapes(A.shape[:-2], B.shape[:-2], Q.shape[:-2], R.shape[:-2])
+    n, m = A.shape[-1], B.shape[-1]
+    A = np.broadcast_to(A, batch + (n, n))
+    B = np.broadcast_to(B, batch + (n, m))
+    Q = np.broadcast_to(Q, batch + (n, n))
+    R = np.broadcast_to(R, batch + (m, m))
+    P = _doubling_dare(A, B, Q, R, tolerance=tolerance, max_iterations=max_iterations)
+    return _lqr_gain(A, B, R, P), P
 
 
 def compose_process_and_wave(phi: np.ndarray, wave_operator: np.ndarray) -> np.ndarray:
@@ -199,34 +341,238 @@ def compose_process_and_wave(phi: np.ndarray, wave_operator: np.ndarray) -> np.n
     ])
 
 
-def causal_convolution(phi: np.ndarray, gamma: np.ndarray, controls: np.ndarray) -> np.ndarray:
-    """Evaluate the causal Green's function convolution for Section C."""
+_FFT_BLOCK_STEPS = 256
+_FFT_MIN_STEPS = 2048
 
-    steps = controls.shape[0]
-    result = np.zeros((steps, phi.shape[0]))
-    for k in range(steps):
-        acc = np.zeros(phi.shape[0])
-        for j in range(k + 1):
-            acc += np.linalg.matrix_power(phi, k - j) @ (gamma @ controls[j])
-        result[k] = acc
+
+def _causal_scan(phi: np.ndarray, gamma: np.ndarray, controls: np.ndarray) -> np.ndarray:
+    """Run ``x_k = Phi x_{k-1} + Gamma u_k`` for a ``(B, T, m)`` control batch."""
+
+    driven = controls @ gamma.T
+    result = np.empty_like(driven)
+    state = np.zeros_like(driven[:, 0])
+    phi_t = phi.T
+    for k in range(driven.shape[1]):
+        state = state @ phi_t + driven[:, k]
+        result[:, k] = state
+    return result
+
+
+def _causal_fft_blocks(
+    phi: np.ndarray, gamma: np.ndarray, controls: np.ndarray, block: int
+) -> np.ndarray:
+    """Block FFT convolution with the state carried exactly between blocks.
+
+    Within a block of ``L`` steps the response to the block's own controls
+    is the convolution with the truncated impulse response
+    ``Phi^k Gamma, k < L``; the state left by earlier blocks contributes
+    ``Phi^(i+1) x_prev`` at offset ``i``.
+    """
+
+    batch, steps, _ = controls.shape
+    n, m = gamma.shape
+    block = min(block, steps)
+    impulse = np.empty((block, n, m), dtype=controls.dtype)
+    powers = np.empty((block, n, n), dtype=controls.dtype)
+    impulse[0] = gamma
+    powers[0] = phi
+    for k in range(1, block):
+        impulse[k] = phi @ impulse[k - 1]
+        powers[k] = phi @ powers[k - 1]
+    nfft = 1 << (2 * block - 1).bit_length()
+    spectrum = np.fft.rfft(impulse, n=nfft, axis=0)
+
+    result = np.empty((batch, steps, n), dtype=controls.dtype)
+    state = np.zeros((batch, n), dtype=controls.dtype)
+    for start in range(0, steps, block):
+        stop = min(start + block, steps)
+        length = stop - start
+        # Frequency-major layout turns the per-bin products into one matmul.
+        inputs = np.fft.rfft(controls[:, start:stop], n=nfft, axis=1).transpose(1, 2, 0)
+        response = np.fft.irfft(spectrum @ inputs, n=nfft, axis=0)[:length]
+        response += powers[:length] @ state.T
+        result[:, start:stop] = response.transpose(2, 0, 1)
+        state = result[:, stop - 1]
     return result
 
 
-def fourier_energy_ratios(signal: np.ndarray, *, num_bands: int = 4) -> np.ndarray:
+def causal_convolution(
+    phi: np.ndarray,
+    gamma: np.ndarray,
+    controls: np.ndarray,
+    *,
+    method: str = "auto",
+    block_steps: int = _FFT_BLOCK_STEPS,
+) -> np.ndarray:
+    """Evaluate the causal Green's function convolution for Section C.
+
+    Returns ``y_k = sum_{j <= k} Phi^(k-j) Gamma u_j`` for ``controls`` of
+    shape ``(T, m)`` or a batch of shape ``(B, T, m)``; the result has shape
+    ``(T, n)`` or ``(B, T, n)`` respectively.  ``method="scan"`` evaluates
+    the recursion ``y_k = Phi y_{k-1} + Gamma u_k`` in ``O(T n^2)``;
+    ``method="fft"`` uses block FFT convolution over ``block_steps``-long
+    blocks, which needs only ``T / block_steps`` Python-level iterations and
+    pays off for long horizons.  ``"auto"`` picks FFT once ``T`` reaches
+    ``_FFT_MIN_STEPS``.
+    """
+
+    if controls.ndim not in (2, 3):
+        raise ValueError("controls must have shape (T, m) or (B, T, m)")
+    if method not in {"auto", "scan", "fft"}:
+        raise ValueError("method must be 'auto', 'scan' or 'fft'")
+    if block_steps < 1:
+        raise ValueError("block_steps must be positive")
+    dtype = np.result_type(phi, gamma, controls, float)
+    batch = controls.astype(dtype, copy=False)
+    if controls.ndim == 2:
+        batch = batch[np.newaxis]
+    phi = np.asarray(phi, dtype=dtype)
+    gamma = np.asarray(gamma, dtype=dtype)
+    if batch.shape[1] == 0:
+        result = np.zeros((batch.shape[0], 0, phi.shape[0]), dtype=dtype)
+    elif method == "fft" or (method == "auto" and batch.shape[1] >= _FFT_MIN_STEPS):
+        result = _causal_fft_blocks(phi, gamma, batch, block_steps)
+    else:
+        result = _causal_scan(phi, gamma, batch)
+    return result[0] if controls.ndim == 2 else result
+
+
+def _band_bounds(length: int, num_bands: int) -> list[Tuple[int, int]]:
+    """Return the ``np.array_split`` boundaries of ``length`` bins."""
+
+    size, extra = divmod(length, num_bands)
+    bounds = []
+    start = 0
+    for band in range(num_bands):
+        stop = start + size + (1 if band < extra else 0)
+        bounds.append((start, stop))
+        start = stop
+    return bounds
+
+
+def _band_energies(
+    power: np.ndarray, bounds: Iterable[Tuple[int, int]], out: np.ndarray | None = None
+) -> np.ndarray:
+    """Sum ``power`` over each band along the last axis."""
+
+    bounds = list(bounds)
+    if out is None:
+        out = np.empty(power.shape[:-1] + (len(bounds),))
+    for band, (start, stop) in enumerate(bounds):
+        out[..., band] = power[..., start:stop].sum(axis=-1)
+    return out
+
+
+def _normalise_energies(energies: np.ndarray) -> np.ndarray:
+    total = energies.sum(axis=-1, keepdims=True)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        ratios = energies / total
+    ratios[np.broadcast_to(total == 0, ratios.shape)] = 0.0
+    return ratios
+
+
+def fourier_energy_ratios(signal: np.ndarray, *, num_bands: int = 4, axis: int = -1) -> np.ndarray:
     """Return normalised Fourier-band energy ratios.
 
     The vector is invariant to overall scaling and therefore dimensionless.
+    A 2-D ``signal`` is treated as a batch of signals laid out along
+    ``axis``; the band dimension then replaces ``axis`` in the result.
+    Bands are summed one slice at a time across the whole batch, so the
+    Python-level work depends only on ``num_bands``.
+    """
+
+    if signal.ndim not in (1, 2):
+        raise ValueError("signal must be one- or two-dimensional")
+    spectrum = np.abs(np.fft.rfft(signal, axis=axis)) ** 2
+    spectrum = np.moveaxis(spectrum, axis, -1)
+    total = spectrum.sum(axis=-1)
+    energies = _band_energies(spectrum, _band_bounds(spectrum.shape[-1], num_bands))
+    if signal.ndim == 1:
+        if total == 0:
+            return np.zeros(num_bands)
+        return energies / total
+    ratios = _normalise_energies(energies)
+    return np.moveaxis(ratios, -1, axis)
+
+
+class SlidingFourierEnergy:
+    """Streaming band-energy ratios over a sliding window, STFT style.
+
+    Samples are fed through :meth:`update` in arbitrary pieces.  Once
+    ``window`` samples have been seen, and after every further ``hop``
+    samples, the current window is transformed and its
+    :func:`fourier_energy_ratios` appended to the result, so frame ``i``
+    covers samples ``[i * hop, i * hop + window)`` of the stream.  Only
+    the last ``window`` samples are retained and the window, taper and
+    spectrum buffers are allocated once, so long telemetry streams cost
+    ``O(window log window)`` per hop regardless of their history.
     """
 
-    if signal.ndim != 1:
-        raise ValueError("signal must be one-dimensional")
-    spectrum = np.abs(np.fft.rfft(signal)) ** 2
-    total = spectrum.sum()
-    if total == 0:
-        return np.zeros(num_bands)
-    bins = np.array_split(spectrum, num_bands)
-    energies = np.array([band.sum() for band in bins])
-    return energies / total
+    def __init__(
+        self,
+        window: int,
+        hop: int | None = None,
+        *,
+        num_bands: int = 4,
+        taper: np.ndarray | None = None,
+    ) -> None:
+        hop = max(1, window // 2) if hop is None else hop
+        if window < 1:
+            raise ValueError("window must be positive")
+        if not 1 <= hop <= window:
+            raise ValueError("hop must be between 1 and window")
+        if taper is not None and np.shape(taper) != (window,):
+            raise ValueError("taper must have shape (window,)")
+        self.window = window
+        self.hop = hop
+        self.num_bands = num_bands
+        self._taper = None if taper is None else np.asarray(taper, dtype=float)
+        self._bounds = _band_bounds(window // 2 + 1, num_bands)
+        self._buffer = np.zeros(window)
+        self._frame = np.empty(window)
+        self._power = np.empty(window // 2 + 1)
+        self._filled = 0
+        self.frames = 0
+
+    def reset(self) -> None:
+        self._filled = 0
+        self.frames = 0
+
+    def _pending_frames(self, count: int) -> int:
+        available = self._filled + count
+        if available < self.window:
+            return 0
+        return (available - self.window) // self.hop + 1
+
+    def update(self, samples: np.ndarray) -> np.ndarray:
+        """Consume ``samples`` and return ratios for each completed frame.
+
+        The result has shape ``(frames, num_bands)`` and is empty when no
+        frame completed.
+        """
+
+        samples = np.asarray(samples, dtype=float)
+        if samples.ndim != 1:
+            raise ValueError("samples must be one-dimensional")
+        energies = np.empty((self._pending_frames(samples.shape[0]), self.num_bands))
+        buffer, window, hop = self._buffer, self.window, self.hop
+        position = 0
+        row = 0
+        while position < samples.shape[0]:
+            take = min(window - self._filled, samples.shape[0] - position)
+            buffer[self._filled : self._filled + take] = samples[position : position + take]
+            self._filled += take
+            position += take
+            if self._filled == window:
+                frame = buffer if self._taper is None else np.multiply(buffer, self._taper, out=self._frame)
+                np.abs(np.fft.rfft(frame), out=self._power)
+                np.square(self._power, out=self._power)
+                _band_energies(self._power, self._bounds, out=energies[row])
+                row += 1
+                buffer[: window - hop] = buffer[hop:]
+                self._filled = window - hop
+        self.frames += row
+        return _normalise_energies(energies)
 
 
 _ALPHA = string.ascii_lowercase
@@ -311,8 +657,7 @@ def huber_irls(
     for _ in range(max_iterations):
         residuals = y - X @ beta
         weights = _huber_weights(residuals, delta)
-        W = np.diag(weights)
-        XtW = X.T @ W
+        XtW = X.T * weights
         regulariser = 1e-8 * np.eye(X.shape[1])
         beta_next = np.linalg.solve(XtW @ X + regulariser, XtW @ y)
         if np.linalg.norm(beta_next - beta) < tolerance:
@@ -324,6 +669,132 @@ def huber_irls(
     return HuberResult(coefficients=beta, scale=scale)
 
 
+_MEDIAN_BINS = 2048
+_MEDIAN_REFINEMENTS = 3
+
+RowBlocks = Callable[[], Iterable[Tuple[np.ndarray, np.ndarray]]]
+
+
+def _row_blocks(
+    source: Union[np.ndarray, RowBlocks], y: np.ndarray | None, chunk_size: int
+) -> RowBlocks:
+    if callable(source):
+        if y is not None:
+            raise ValueError("y must be omitted when source yields row blocks")
+        return source
+    if y is None:
+        raise ValueError("y is required when X is an array")
+    if source.ndim != 2:
+        raise ValueError("X must be two-dimensional")
+    if y.ndim != 1:
+        raise ValueError("y must be one-dimensional")
+    if source.shape[0] != y.shape[0]:
+        raise ValueError("X and y dimensions are inconsistent")
+
+    def blocks() -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        for start in range(0, source.shape[0], chunk_size):
+            stop = start + chunk_size
+            yield np.asarray(source[start:stop], dtype=float), np.asarray(y[start:stop], dtype=float)
+
+    return blocks
+
+
+def _streaming_quantile(values: Callable[[], Iterable[np.ndarray]], rank: int, low: float, high: float) -> float:
+    for _ in range(_MEDIAN_REFINEMENTS):
+        if high <= low:
+            break
+        below = 0
+        histogram = np.zeros(_MEDIAN_BINS, dtype=np.int64)
+        for block in values():
+            below += int(np.count_nonzero(block < low))
+            inside = block[(block >= low) & (block <= high)]
+            histogram += np.histogram(inside, bins=_MEDIAN_BINS, range=(low, high))[0]
+        index = int(np.searchsorted(np.cumsum(histogram), rank - below + 1))
+        width = (high - low) / _MEDIAN_BINS
+        low, high = low + index * width, low + (index + 1) * width
+    return 0.5 * (low + high)
+
+
+def _streaming_median(values: Callable[[], Iterable[np.ndarray]]) -> float:
+    """Approximate the median of streamed blocks with bounded memory.
+
+    One pass finds the count and range; each refinement pass histograms the
+    current bracket into ``_MEDIAN_BINS`` bins and narrows it to the bin that
+    holds the middle element, so the error is at most
+    ``range / _MEDIAN_BINS ** _MEDIAN_REFINEMENTS``.  For an even count both
+    middle elements are located and averaged, as in :func:`numpy.median`.
+    """
+
+    count = 0
+    low, high = math.inf, -math.inf
+    for block in values():
+        if block.size:
+            count += block.size
+            low = min(low, float(block.min()))
+            high = max(high, float(block.max()))
+    if count == 0:
+        return 0.0
+    lower = _streaming_quantile(values, (count - 1) // 2, low, high)
+    if count % 2:
+        return lower
+    return 0.5 * (lower + _streaming_quantile(values, count // 2, low, high))
+
+
+def huber_irls_chunked(
+    X: Union[np.ndarray, RowBlocks],
+    y: np.ndarray | None = None,
+    *,
+    chunk_size: int = 65_536,
+    delta: float = 1.0,
+    max_iterations: int = 50,
+    tolerance: float = 1e-10,
+) -> HuberResult:
+    """Huber IRLS that streams row blocks instead of holding ``W`` or ``X``.
+
+    ``X`` and ``y`` may be arrays of any size, including ``np.memmap``, read
+    ``chunk_size`` rows at a time.  Alternatively ``X`` is a zero-argument
+    callable returning a fresh iterable of ``(X_block, y_block)`` pairs on
+    each call; every IRLS iteration makes one pass over it.  Each pass only
+    accumulates ``X^T W X`` and ``X^T W y``, so memory is bounded by the
+    block size.  The MAD scale uses :func:`_streaming_median` and therefore
+    matches :func:`huber_irls` up to a tiny relative error.
+    """
+
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    blocks = _row_blocks(X, y, chunk_size)
+
+    beta: np.ndarray | None = None
+    for _ in range(max_iterations):
+        xtwx: np.ndarray | None = None
+        xtwy: np.ndarray | None = None
+        for X_block, y_block in blocks():
+            if beta is None:
+                beta = np.zeros(X_block.shape[1])
+            weights = _huber_weights(y_block - X_block @ beta, delta)
+            XtW = X_block.T * weights
+            if xtwx is None:
+                xtwx, xtwy = XtW @ X_block, XtW @ y_block
+            else:
+                xtwx += XtW @ X_block
+                xtwy += XtW @ y_block
+        if xtwx is None:
+            raise ValueError("no rows to fit")
+        regulariser = 1e-8 * np.eye(xtwx.shape[0])
+        beta_next = np.linalg.solve(xtwx + regulariser, xtwy)
+        if np.linalg.norm(beta_next - beta) < tolerance:
+            beta = beta_next
+            break
+        beta = beta_next
+
+    if beta is None:
+        raise ValueError("max_iterations must be positive")
+    fitted = beta
+    mad = _streaming_median(lambda: (np.abs(y_block - X_block @ fitted) for X_block, y_block in blocks()))
+    scale = mad / 0.6745 if mad > 0 else 0.0
+    return HuberResult(coefficients=beta, scale=scale)
+
+
 _DEF_CONTEXT = b"tri-crown"
 
 
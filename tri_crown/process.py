@@ -5,6 +5,8 @@ from typing import Callable, List, Tuple
 
 import numpy as np
 
+from .cache import DISCRETISATION_CACHE
+
 try:  # Prefer SciPy when available for numerical robustness.
     from scipy.linalg import expm  # type: ignore
 except Exception:  # pragma: no cover - SciPy is optional.
@@ -97,10 +99,12 @@ def process_matrix(a: np.ndarray, dt: float) -> np.ndarray:
         Continuous-time state matrix ``A``.
     dt:
         Discretization interval ``Δt``.
+
+    Results are memoised in :data:`tri_crown.cache.DISCRETISATION_CACHE`.
     """
 
     a = np.asarray(a, dtype=float)
-    return _matrix_exponential(a * dt)
+    return DISCRETISATION_CACHE.lookup("process_matrix", (a,), (dt,), lambda: _matrix_exponential(a * dt))
 
 
 def van_loan_discretization(
@@ -112,13 +116,17 @@ def van_loan_discretization(
     """Discretise a linear SDE using the Van Loan block exponential.
 
     Returns the state transition matrix ``Phi`` together with the discrete
-    process noise covariance ``Qd``.
+    process noise covariance ``Qd``.  Results are memoised in
+    :data:`tri_crown.cache.DISCRETISATION_CACHE`.
     """
 
     a = np.asarray(a, dtype=float)
     g = np.asarray(g, dtype=float)
     qc = np.asarray(qc, dtype=float)
+    return DISCRETISATION_CACHE.lookup("van_loan", (a, g, qc), (dt,), lambda: _van_loan(a, g, qc, dt))
+
 
+def _van_loan(a: np.ndarray, g: np.ndarray, qc: np.ndarray, dt: float) -> Tuple[np.ndarray, np.ndarray]:
     block = np.block(
         [
             [-a, g @ qc @ g.T],
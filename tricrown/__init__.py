@@ -1,21 +1,29 @@
 """TRI-CROWN 2.0 hybrid encryption reference helpers."""
 
-from .session import TriCrownParty, TriCrownSession, HandshakeResult
+from .aead import AEADBackend, AEADSelection, select_aead_suite
+from .session import TriCrownParty, TriCrownSession, HandshakeResult, Record, RecordBatch
 from .crypto import (
     hkdf_extract,
     hkdf_expand,
     transcript_hash,
+    Transcript,
     commit_tag,
     derive_nonce,
 )
 
 __all__ = [
+    "AEADBackend",
+    "AEADSelection",
+    "select_aead_suite",
     "TriCrownParty",
     "TriCrownSession",
     "HandshakeResult",
+    "Record",
+    "RecordBatch",
     "hkdf_extract",
     "hkdf_expand",
     "transcript_hash",
+    "Transcript",
     "commit_tag",
     "derive_nonce",
 ]
@@ -0,0 +1,288 @@
+"""AEAD suite registry and host benchmark for the TRI-CROWN record layer.
+
+Every suite is an :class:`AEADSuite` entry mapping a name to a key-taking
+factory whose instances expose ``encrypt(nonce, data, aad)`` and
+``decrypt(nonce, data, aad)`` like the ``cryptography`` AEAD classes.  The
+record layer derives a fresh message key per record, so the factory cost is
+part of every seal and is included in the benchmark.
+
+Which suite is fastest depends on the CPU: with AES-NI/PMULL the AES modes
+usually win, without them ChaCha20-Poly1305 does.  :func:`select_aead_suite`
+runs a short micro-benchmark over the allowed suites once per process and
+caches the outcome.  Both peers must still agree on the suite, so the
+selection is an input to the handshake rather than something negotiated.
+"""
+
+from __future__ import annotations
+
+import os
+import struct
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from cryptography.exceptions import InvalidTag, UnsupportedAlgorithm
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM, AESGCMSIV, ChaCha20Poly1305
+
+try:  # pragma: no cover - optional dependency
+    from nacl import bindings as nacl_bindings
+except Exception:  # pragma: no cover - fallback when PyNaCl is unavailable
+    nacl_bindings = None
+
+_CHACHA_CONSTANTS = (0x61707865, 0x3320646E, 0x79622D32, 0x6B206574)
+_MASK32 = 0xFFFFFFFF
+
+
+def _hchacha20(key: bytes, nonce: bytes) -> bytes:
+    """HChaCha20 subkey derivation (draft-irtf-cfrg-xchacha, section 2.2)."""
+
+    x = list(_CHACHA_CONSTANTS) + list(struct.unpack("<8I", key)) + list(struct.unpack("<4I", nonce))
+
+    def quarter(a: int, b: int, c: int, d: int) -> None:
+        x[a] = (x[a] + x[b]) & _MASK32
+        x[d] ^= x[a]
+        x[d] = ((x[d] << 16) | (x[d] >> 16)) & _MASK32
+        x[c] = (x[c] + x[d]) & _MASK32
+        x[b] ^= x[c]
+        x[b] = ((x[b] << 12) | (x[b] >> 20)) & _MASK32
+        x[a] = (x[a] + x[b]) & _MASK32
+        x[d] ^= x[a]
+        x[d] = ((x[d] << 8) | (x[d] >> 24)) & _MASK32
+        x[c] = (x[c] + x[d]) & _MASK32
+        x[b] ^= x[c]
+        x[b] = ((x[b] << 7) | (x[b] >> 25)) & _MASK32
+
+    for _ in range(10):
+        quarter(0, 4, 8, 12)
+        quarter(1, 5, 9, 13)
+        quarter(2, 6, 10, 14)
+        quarter(3, 7, 11, 15)
+        quarter(0, 5, 10, 15)
+        quarter(1, 6, 11, 12)
+        quarter(2, 7, 8, 13)
+        quarter(3, 4, 9, 14)
+    return struct.pack("<8I", *x[0:4], *x[12:16])
+
+
+class XChaCha20Poly1305:
+    """XChaCha20-Poly1305 with a 24-byte nonce.
+
+    Uses libsodium through PyNaCl when it is installed and otherwise builds
+    the construction from HChaCha20 and ``cryptography``'s ChaCha20-Poly1305;
+    both produce identical output.
+    """
+
+    def __init__(self, key: bytes) -> None:
+        if len(key) != 32:
+            raise ValueError("XChaCha20-Poly1305 key must be 32 bytes")
+        self._key = bytes(key)
+
+    def _inner(self, nonce: bytes) -> Tuple[ChaCha20Poly1305, bytes]:
+        if len(nonce) != 24:
+            raise ValueError("XChaCha20-Poly1305 nonce must be 24 bytes")
+        subkey = _hchacha20(self._key, bytes(nonce[:16]))
+        return ChaCha20Poly1305(subkey), b"\x00" * 4 + bytes(nonce[16:])
+
+    def encrypt(self, nonce: bytes, data: bytes, aad: bytes) -> bytes:
+        if nacl_bindings is not None:
+            return nacl_bindings.crypto_aead_xchacha20poly1305_ietf_encrypt(
+                bytes(data), bytes(aad), bytes(nonce), self._key
+            )
+        cipher, inner_nonce = self._inner(nonce)
+        return cipher.encrypt(inner_nonce, data, aad)
+
+    def decrypt(self, nonce: bytes, data: bytes, aad: bytes) -> bytes:
+        if nacl_bindings is not None:
+            try:
+                return nacl_bindings.crypto_aead_xchacha20poly1305_ietf_decrypt(
+                    bytes(data), bytes(aad), bytes(nonce), self._key
+                )
+            except Exception:
+                raise InvalidTag() from None
+        cipher, inner_nonce = self._inner(nonce)
+        return cipher.decrypt(inner_nonce, data, aad)
+
+
+@dataclass(frozen=True)
+class AEADSuite:
+    """One registered AEAD implementation."""
+
+    name: str
+    nonce_length: int
+    factory: Callable[[bytes], Any]
+    key_length: int = 32
+
+    def available(self) -> bool:
+        """Return whether the linked crypto backend supports this suite."""
+
+        try:
+            self.factory(bytes(self.key_length))
+        except (UnsupportedAlgorithm, RuntimeError):
+            return False
+        return True
+
+
+AEAD_SUITES: Dict[str, AEADSuite] = {}
+
+_selection_lock = threading.Lock()
+_selection_cache: Dict[Tuple[Tuple[str, ...], int, float], "AEADSelection"] = {}
+
+
+def register_aead_suite(suite: AEADSuite, *, replace: bool = False) -> AEADSuite:
+    """Add ``suite`` to the registry under ``suite.name``."""
+
+    if suite.name in AEAD_SUITES and not replace:
+        raise ValueError(f"AEAD suite already registered: {suite.name}")
+    AEAD_SUITES[suite.name] = suite
+    with _selection_lock:
+        _selection_cache.clear()
+    return suite
+
+
+def get_aead_suite(name: str) -> AEADSuite:
+    """Return the suite registered under ``name``."""
+
+    try:
+        return AEAD_SUITES[name]
+    except KeyError:
+        raise ValueError(f"Unsupported AEAD suite: {name}") from None
+
+
+@dataclass
+class AEADBackend:
+    """Record-layer view of a registered AEAD suite, selected by name."""
+
+    name: str
+    _suite: AEADSuite = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self._suite = get_aead_suite(self.name)
+
+    def nonce_length(self) -> int:
+        return self._suite.nonce_length
+
+    def encrypt(self, key: bytes, nonce: bytes, data: bytes, aad: bytes) -> bytes:
+        return self._suite.factory(key).encrypt(nonce, data, aad)
+
+    def decrypt(self, key: bytes, nonce: bytes, data: bytes, aad: bytes) -> bytes:
+        return self._suite.factory(key).decrypt(nonce, data, aad)
+
+
+@dataclass(frozen=True)
+class AEADBenchmark:
+    """Measured seal throughput of one suite on this host."""
+
+    name: str
+    payload_size: int
+    throughput: float  # bytes per second
+
+    @property
+    def mb_per_second(self) -> float:
+        return self.throughput / 1e6
+
+
+@dataclass(frozen=True)
+class AEADSelection:
+    """Outcome of :func:`select_aead_suite`: the winner and every measurement."""
+
+    name: str
+    aes_ni: Optional[bool]
+    results: Tuple[AEADBenchmark, ...]
+
+    @property
+    def throughput(self) -> float:
+        return self.results[0].throughput
+
+
+def cpu_has_aes() -> Optional[bool]:
+    """Best-effort check for AES instructions; ``None`` when unknown."""
+
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        with open("/proc/cpuinfo", encoding="ascii", errors="replace") as handle:
+            for line in handle:
+                key, _, value = line.partition(":")
+                if key.strip() in ("flags", "Features"):
+                    return "aes" in value.split()
+    except OSError:
+        return None
+    return None
+
+
+def benchmark_aead_suites(
+    names: Optional[Iterable[str]] = None,
+    *,
+    payload_size: int = 16 * 1024,
+    duration: float = 0.02,
+) -> List[AEADBenchmark]:
+    """Measure seal throughput of each available suite, fastest first.
+
+    Each iteration constructs the cipher from a key and seals one
+    ``payload_size`` record, matching the per-record work of
+    :meth:`~tricrown.session.TriCrownSession.seal`.
+    """
+
+    payload = os.urandom(payload_size)
+    key = os.urandom(32)
+    results: List[AEADBenchmark] = []
+    for name in names if names is not None else list(AEAD_SUITES):
+        suite = get_aead_suite(name)
+        if not suite.available():
+            continue
+        nonce = os.urandom(suite.nonce_length)
+        factory = suite.factory
+        factory(key).encrypt(nonce, payload, b"")
+        iterations = 0
+        start = time.perf_counter()
+        deadline = start + duration
+        while True:
+            factory(key).encrypt(nonce, payload, b"")
+            iterations += 1
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+        results.append(AEADBenchmark(name=name, payload_size=payload_size, throughput=iterations * payload_size / (now - start)))
+    results.sort(key=lambda result: result.throughput, reverse=True)
+    return results
+
+
+def select_aead_suite(
+    allowed: Optional[Iterable[str]] = None,
+    *,
+    refresh: bool = False,
+    payload_size: int = 16 * 1024,
+    duration: float = 0.02,
+) -> AEADSelection:
+    """Pick the fastest available suite among ``allowed`` on this host.
+
+    The benchmark runs on the first call for a given ``allowed`` set,
+    ``payload_size`` and ``duration``, and the result is reused afterwards
+    unless ``refresh`` is true.
+    """
+
+    names = tuple(allowed) if allowed is not None else tuple(AEAD_SUITES)
+    for name in names:
+        get_aead_suite(name)
+    key = (names, payload_size, duration)
+    with _selection_lock:
+        if not refresh and key in _selection_cache:
+            return _selection_cache[key]
+        results = benchmark_aead_suites(names, payload_size=payload_size, duration=duration)
+        if not results:
+            raise RuntimeError("none of the allowed AEAD suites is available")
+        selection = AEADSelection(name=results[0].name, aes_ni=cpu_has_aes(), results=tuple(results))
+        _selection_cache[key] = selection
+        return selection
+
+
+for _suite in (
+    AEADSuite("AES-256-GCM-SIV", nonce_length=12, factory=AESGCMSIV),
+    AEADSuite("AES-256-GCM", nonce_length=12, factory=AESGCM),
+    AEADSuite("ChaCha20-Poly1305", nonce_length=12, factory=ChaCha20Poly1305),
+    AEADSuite("XChaCha20-Poly1305", nonce_length=24, factory=XChaCha20Poly1305),
+):
+    register_aead_suite(_suite)
+del _suite
@@ -0,0 +1,288 @@
+"""Asyncio transport for the TRI-CROWN 2.0 handshake and record layer.
+
+Every message on the stream is framed as ``length (4, big-endian) || frame``.
+The handshake frames come from the selected :mod:`tricrown.wire` codec and
+flow as::
+
+    client                          server
+    ClientHello        ------->
+                       <-------     ServerHello
+    ClientEncaps       ------->
+                       <-------     [ServerEncaps] ServerSig
+    ClientSig          ------->
+
+after which both sides exchange records in the fixed-header encoding of
+:meth:`~tricrown.session.Record.to_bytes`.  The KEM,
+signature and HKDF work of each step runs on a :class:`BoundedExecutor` so
+the event loop stays responsive while many handshakes are in flight.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import struct
+from concurrent.futures import Executor
+from typing import Awaitable, Callable, Optional, TypeVar
+
+from .session import (
+    ClientHandshake,
+    HandshakeResult,
+    Record,
+    ServerHandshake,
+    TriCrownParty,
+    TriCrownSession,
+)
+
+DEFAULT_MAX_FRAME_SIZE = 16 * 1024 * 1024
+
+_LENGTH = struct.Struct(">I")
+_T = TypeVar("_T")
+
+
+class BoundedExecutor:
+    """Run blocking callables off the event loop with a cap on queued work.
+
+    ``executor`` defaults to the loop's default executor.  At most
+    ``max_pending`` calls are submitted at once; further callers wait on a
+    semaphore instead of growing the executor's unbounded work queue.
+    """
+
+    def __init__(self, executor: Optional[Executor] = None, *, max_pending: int = 64) -> None:
+        if max_pending < 1:
+            raise ValueError("max_pending must be positive")
+        self.executor = executor
+        self.max_pending = max_pending
+        self._semaphore = asyncio.Semaphore(max_pending)
+
+    async def run(self, fn: Callable[..., _T], *args: object) -> _T:
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self.executor, fn, *args)
+
+
+async def read_frame(reader: asyncio.StreamReader, *, max_frame_size: int = DEFAULT_MAX_FRAME_SIZE) -> bytes:
+    """Read one length-prefixed frame."""
+
+    (length,) = _LENGTH.unpack(await reader.readexactly(_LENGTH.size))
+    if length > max_frame_size:
+        raise ValueError(f"frame of {length} bytes exceeds max_frame_size")
+    return await reader.readexactly(length)
+
+
+def write_frame(writer: asyncio.StreamWriter, frame: bytes) -> None:
+    """Queue one length-prefixed frame on ``writer``."""
+
+    writer.writelines((_LENGTH.pack(len(frame)), frame))
+
+
+class TriCrownStream:
+    """Record-layer stream over an established TRI-CROWN session.
+
+    Iterating the stream with ``async for`` yields plaintexts until the peer
+    closes the connection.
+    """
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        result: HandshakeResult,
+        *,
+        max_frame_size: int = DEFAULT_MAX_FRAME_SIZE,
+    ) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.result = result
+        self.max_frame_size = max_frame_size
+
+    @property
+    def session(self) -> TriCrownSession:
+        return self.result.session
+
+    async def send(self, plaintext: bytes, *, aad: bytes = b"") -> None:
+        write_frame(self.writer, self.session.seal(plaintext, aad=aad).to_bytes())
+        await self.writer.drain()
+
+    async def recv(self) -> bytes:
+        frame = await read_frame(self.reader, max_frame_size=self.max_frame_size)
+        return self.session.open(Record.from_buffer(frame))
+
+    def __aiter__(self) -> "TriCrownStream":
+        return self
+
+    async def __anext__(self) -> bytes:
+        try:
+            return await self.recv()
+        except asyncio.IncompleteReadError as exc:
+            if exc.partial:
+                raise
+            raise StopAsyncIteration from None
+
+    async def close(self) -> None:
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+
+
+async def client_handshake(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    *,
+    party: Optional[TriCrownParty] = None,
+    executor: Optional[BoundedExecutor] = None,
+    aead: str = "AES-256-GCM-SIV",
+    wire: str = "binary",
+    audit_salt_version: int = 1,
+    max_frame_size: int = DEFAULT_MAX_FRAME_SIZE,
+) -> HandshakeResult:
+    """Run the client side of the handshake over an open stream."""
+
+    run = (executor or BoundedExecutor()).run
+
+    def start() -> tuple[ClientHandshake, bytes]:
+        state = ClientHandshake(
+            party or TriCrownParty(role="client"),
+            aead=aead,
+            wire=wire,
+            audit_salt_version=audit_salt_version,
+        )
+        return state, state.hello()
+
+    state, hello = await run(start)
+    write_frame(writer, hello)
+    await writer.drain()
+
+    server_hello = await read_frame(reader, max_frame_size=max_frame_size)
+    write_frame(writer, await run(state.handle_server_hello, server_hello))
+    await writer.drain()
+
+    frame = await read_frame(reader, max_frame_size=max_frame_size)
+    if state.codec.message_kind(frame) == "server_encaps":
+        await run(state.handle_server_encaps, frame)
+        frame = await read_frame(reader, max_frame_size=max_frame_size)
+    write_frame(writer, await run(state.signature))
+    await writer.drain()
+    return await run(state.finish, frame)
+
+
+async def server_handshake(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    *,
+    party_factory: Optional[Callable[[], TriCrownParty]] = None,
+    executor: Optional[BoundedExecutor] = None,
+    aead: str = "AES-256-GCM-SIV",
+    wire: str = "binary",
+    audit_salt_version: int = 1,
+    max_frame_size: int = DEFAULT_MAX_FRAME_SIZE,
+) -> HandshakeResult:
+    """Run the server side of the handshake over an open stream."""
+
+    run = (executor or BoundedExecutor()).run
+    make_party = party_factory or (lambda: TriCrownParty(role="server"))
+    client_hello = await read_frame(reader, max_frame_size=max_frame_size)
+
+    def start() -> tuple[ServerHandshake, bytes]:
+        state = ServerHandshake(make_party(), aead=aead, wire=wire, audit_salt_version=audit_salt_version)
+        return state, state.handle_client_hello(client_hello)
+
+    state, server_hello = await run(start)
+    write_frame(writer, server_hello)
+    await writer.drain()
+
+    client_encaps = await read_frame(reader, max_frame_size=max_frame_size)
+
+    def respond() -> tuple[Optional[bytes], bytes]:
+        encaps = state.handle_client_encaps(client_encaps)
+        return encaps, state.signature()
+
+    server_encaps, server_sig = await run(respond)
+    if server_encaps is not None:
+        write_frame(writer, server_encaps)
+    write_frame(writer, server_sig)
+    await writer.drain()
+
+    client_sig = await read_frame(reader, max_frame_size=max_frame_size)
+    return await run(state.finish, client_sig)
+
+
+async def open_connection(
+    host: str,
+    port: int,
+    *,
+    party: Optional[TriCrownParty] = None,
+    executor: Optional[BoundedExecutor] = None,
+    aead: str = "AES-256-GCM-SIV",
+    wire: str = "binary",
+    audit_salt_version: int = 1,
+    max_frame_size: int = DEFAULT_MAX_FRAME_SIZE,
+) -> TriCrownStream:
+    """Connect to a TRI-CROWN server and return the established stream."""
+
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        result = await client_handshake(
+            reader,
+            writer,
+            party=party,
+            executor=executor,
+            aead=aead,
+            wire=wire,
+            audit_salt_version=audit_salt_version,
+            max_frame_size=max_frame_size,
+        )
+    except BaseException:
+        writer.close()
+        raise
+    return TriCrownStream(reader, writer, result, max_frame_size=max_frame_size)
+
+
+async def start_server(
+    handler: Callable[[TriCrownStream], Awaitable[None]],
+    host: str = "127.0.0.1",
+    port: int = 0,
+    *,
+    party_factory: Optional[Callable[[], TriCrownParty]] = None,
+    executor: Optional[BoundedExecutor] = None,
+    aead: str = "AES-256-GCM-SIV",
+    wire: str = "binary",
+    audit_salt_version: int = 1,
+    max_frame_size: int = DEFAULT_MAX_FRAME_SIZE,
+    **server_kwargs: object,
+) -> asyncio.AbstractServer:
+    """Start a TCP server that completes a handshake per connection.
+
+    ``handler`` is awaited with a :class:`TriCrownStream` once the handshake
+    succeeds; the connection is closed when it returns.  Connections whose
+    handshake fails are dropped.  All connections share one executor.
+    """
+
+    shared_executor = executor or BoundedExecutor()
+
+    async def serve(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        result = None
+        try:
+            result = await server_handshake(
+                reader,
+                writer,
+                party_factory=party_factory,
+                executor=shared_executor,
+                aead=aead,
+                wire=wire,
+                audit_salt_version=audit_salt_version,
+                max_frame_size=max_frame_size,
+            )
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            return
+        finally:
+            if result is None:
+                writer.close()
+        stream = TriCrownStream(reader, writer, result, max_frame_size=max_frame_size)
+        try:
+            await handler(stream)
+        finally:
+            await stream.close()
+
+    return await asyncio.start_server(serve, host, port, **server_kwargs)
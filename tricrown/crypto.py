@@ -14,13 +14,22 @@ by the integrator.
 
 from __future__ import annotations
 
+import hmac
 from dataclasses import dataclass
 from hashlib import sha3_256, sha3_512
-from typing import Iterable
+from collections import Counter
+from typing import Any, Iterable, List, Tuple
 
 from cryptography.hazmat.primitives import hashes
 from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 
+from .instrument import METRICS
+
+try:  # pragma: no cover - optional dependency
+    import numpy as np
+except Exception:  # pragma: no cover - histogram falls back to ``Counter``
+    np = None
+
 SUITE_ID = b"TRICROWN-2.0"
 
 
@@ -40,34 +49,82 @@ def hkdf_extract(salt: bytes, ikm: bytes) -> bytes:
     HKDF implementation that we reuse here.
     """
 
-    hkdf = HKDF(
-        algorithm=hashes.SHA3_512(),
-        length=64,
-        salt=salt,
-        info=b"TRICROWN extract",
-    )
-    return hkdf.derive(ikm)
+    with METRICS.phase("hkdf"):
+        hkdf = HKDF(
+            algorithm=hashes.SHA3_512(),
+            length=64,
+            salt=salt,
+            info=b"TRICROWN extract",
+        )
+        return hkdf.derive(ikm)
 
 
 def hkdf_expand(prk: bytes, *, params: HKDFParams) -> bytes:
     """Run ``HKDF-Expand`` with SHA3-512 and explicit domain separation."""
 
-    hkdf = HKDF(
-        algorithm=hashes.SHA3_512(),
-        length=params.length,
-        salt=None,
-        info=params.info,
-    )
-    return hkdf.derive(prk)
+    with METRICS.phase("hkdf"):
+        hkdf = HKDF(
+            algorithm=hashes.SHA3_512(),
+            length=params.length,
+            salt=None,
+            info=params.info,
+        )
+        return hkdf.derive(prk)
 
 
 def transcript_hash(messages: Iterable[bytes]) -> bytes:
     """Compute the running SHA3-512 transcript hash."""
 
-    h = sha3_512()
-    for msg in messages:
-        h.update(msg)
-    return h.digest()
+    with METRICS.phase("transcript_hash"):
+        h = sha3_512()
+        for msg in messages:
+            h.update(msg)
+        return h.digest()
+
+
+def byte_histogram(message: bytes) -> Tuple[int, ...]:
+    """Return the 256-bin byte histogram of ``message`` in a single pass."""
+
+    if np is not None:
+        counts = np.bincount(np.frombuffer(message, dtype=np.uint8), minlength=256)
+        return tuple(int(count) for count in counts)
+    histogram = [0] * 256
+    for byte, count in Counter(message).items():
+        histogram[byte] = count
+    return tuple(histogram)
+
+
+@dataclass(frozen=True)
+class MessageStats:
+    """Per-message statistics retained by :class:`Transcript`."""
+
+    length: int
+    histogram: Tuple[int, ...] | None = None
+
+
+class Transcript:
+    """Incremental SHA3-512 transcript hash.
+
+    Each handshake message is absorbed exactly once.  :meth:`digest` can be
+    called at any point (e.g. for the signature input) without disturbing the
+    running state, and the per-message :class:`MessageStats` feed the audit
+    salt so that no message has to be re-read after it is absorbed.
+    """
+
+    def __init__(self, *, track_histograms: bool = False) -> None:
+        self._hash = sha3_512()
+        self.track_histograms = track_histograms
+        self.stats: List[MessageStats] = []
+
+    def absorb(self, message: bytes) -> None:
+        with METRICS.phase("transcript"):
+            self._hash.update(message)
+            histogram = byte_histogram(message) if self.track_histograms else None
+            self.stats.append(MessageStats(length=len(message), histogram=histogram))
+
+    def digest(self) -> bytes:
+        with METRICS.phase("transcript"):
+            return self._hash.copy().digest()
 
 
 def commit_tag(
@@ -92,6 +149,41 @@ def commit_tag(
     return h.digest()
 
 
+def commit_prefix(key_commit: bytes, *, session_id: bytes) -> Any:
+    """Return a SHA3-256 state pre-loaded with ``k_commit || SUITE_ID || sid``.
+
+    The prefix is identical for every record of a session, so batch helpers
+    absorb it once and ``copy()`` the state per record instead of rehashing.
+    """
+
+    h = sha3_256()
+    h.update(key_commit)
+    h.update(SUITE_ID)
+    h.update(session_id)
+    return h
+
+
+def commit_tag_from_prefix(
+    prefix: Any,
+    *,
+    sequence: int,
+    nonce: bytes,
+    aad: bytes,
+    ciphertext: bytes,
+) -> bytes:
+    """Finish a commitment started by :func:`commit_prefix`.
+
+    The result is byte-identical to :func:`commit_tag` for the same inputs.
+    """
+
+    h = prefix.copy()
+    h.update(sequence.to_bytes(8, "big"))
+    h.update(nonce)
+    h.update(aad)
+    h.update(ciphertext)
+    return h.digest()
+
+
 def derive_nonce(chain_key: bytes, *, sequence: int, length: int) -> bytes:
     """Derive a deterministic nonce from the sender chain key."""
 
@@ -117,3 +209,51 @@ def mix_shared_secrets(
 
     combined = b"".join(shared_secrets)
     return hkdf_extract(transcript, combined)
+
+
+# ``HKDF`` objects from ``cryptography`` are single use, so per-record
+# derivations pay for object construction three times.  The batch ratchet
+# below evaluates the same HKDF-SHA3-512 outputs with keyed ``hmac`` states
+# that are built once at import time and copied per step.  Every output fits
+# in a single SHA3-512 block, so each expand is exactly one HMAC call.
+_HKDF_ZERO_SALT = hmac.new(b"\x00" * sha3_512().digest_size, digestmod=sha3_512)
+_HKDF_STEP_SALT = hmac.new(b"TRICROWN step", digestmod=sha3_512)
+
+
+def _hmac_from(keyed: "hmac.HMAC", data: bytes) -> bytes:
+    h = keyed.copy()
+    h.update(data)
+    return h.digest()
+
+
+def ratchet_batch(
+    chain_key: bytes,
+    *,
+    first_sequence: int,
+    count: int,
+    nonce_length: int,
+) -> Tuple[List[Tuple[bytes, bytes]], bytes]:
+    """Walk the chain ratchet ``count`` steps in one pass.
+
+    Returns the ``(nonce, message_key)`` pairs for sequences
+    ``first_sequence .. first_sequence + count - 1`` together with the chain
+    key that follows the last step.  The values match repeated calls to
+    :func:`derive_nonce` and :func:`derive_message_key`.
+    """
+
+    if count < 0:
+        raise ValueError("count must be non-negative")
+    if nonce_length > 64:
+        raise ValueError("nonce length exceeds one SHA3-512 block")
+    keys: List[Tuple[bytes, bytes]] = []
+    ck = chain_key
+    with METRICS.phase("hkdf"):
+        for sequence in range(first_sequence, first_sequence + count):
+            seq_bytes = sequence.to_bytes(8, "big")
+            prk = _hmac_from(_HKDF_ZERO_SALT, ck)
+            nonce = hmac.digest(prk, b"TRICROWN nonce" + seq_bytes + b"\x01", sha3_512)[:nonce_length]
+            message_key = hmac.digest(prk, b"TRICROWN mk" + seq_bytes + b"\x01", sha3_512)[:32]
+            step_prk = _hmac_from(_HKDF_STEP_SALT, ck)
+            ck = hmac.digest(step_prk, b"TRICROWN extract\x01", sha3_512)
+            keys.append((nonce, message_key))
+    return keys, ck
@@ -0,0 +1,256 @@
+"""Background pre-encapsulated rekeying for established sessions.
+
+:meth:`~tricrown.session.TriCrownSession.rekey` needs fresh PQ shared
+secrets, and producing them inline stalls the record path for a full KEM
+round at every refresh boundary.  An :class:`EpochManager` wraps a session
+and moves that work off the critical path:
+
+1. On the client side, once the send counter comes within ``lead`` records
+   of ``refresh_interval_messages`` (or the refresh interval in seconds has
+   elapsed), the ML-KEM and McEliece encapsulations to the peer's hello keys
+   run on a background executor.
+2. When they finish, :meth:`EpochManager.poll_offer` returns a
+   :class:`RekeyOffer` carrying the ciphertexts and the boundary, i.e. the
+   number of client records in the current epoch.  The caller sends it to
+   the peer ahead of further records; the peer passes it to
+   :meth:`EpochManager.accept_offer`, which decapsulates in the background.
+3. Each side swaps to the next epoch's chains right after the boundary
+   record is sealed (client) or opened (server).  The swap happens under
+   the manager's lock, so no record is ever sealed or opened against a
+   half-updated session.
+
+Offers carry an HMAC-SHA3-256 tag under a key expanded from the current
+epoch's root key, so the responder only accepts offers from the peer, and
+the full offer frame is mixed into the next epoch's key derivation, so both
+sides must agree on the boundary and ciphertexts to agree on the keys.
+
+The boundary is fixed when the offer is handed out and is never earlier
+than the next record, so an offer delivered in order always reaches the
+peer before the record that ends the epoch.  Records the server seals while
+an offer is outstanding must reach the client before the boundary, as with
+the lock-step :meth:`~tricrown.session.TriCrownSession.rekey`.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import hmac
+import threading
+import time
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from typing import List, Optional, Tuple
+
+from . import crypto
+from .crypto import HKDFParams
+from .session import Record, TriCrownParty, TriCrownSession
+from .wire import FieldTag, FrameType, HelloFields, decode_frame, encode_frame
+
+_OFFER_MAC_INFO = b"TRICROWN rekey offer"
+
+
+@dataclass(frozen=True)
+class RekeyOffer:
+    """Ciphertexts for the next epoch and the record count that ends this one.
+
+    ``tag`` authenticates every other field and travels in the
+    ``REKEY_MAC`` field of the frame.
+    """
+
+    epoch: int
+    boundary: int
+    ct_ml: bytes
+    ct_mce: bytes
+    tag: bytes = b""
+
+    def _fields(self) -> List[Tuple[FieldTag, bytes]]:
+        return [
+            (FieldTag.EPOCH, self.epoch.to_bytes(4, "big")),
+            (FieldTag.BOUNDARY, self.boundary.to_bytes(8, "big")),
+            (FieldTag.CT_ML, self.ct_ml),
+            (FieldTag.CT_MCE, self.ct_mce),
+        ]
+
+    def authenticated_bytes(self) -> bytes:
+        """The frame without its tag, i.e. the bytes the tag covers."""
+
+        return encode_frame(FrameType.REKEY_OFFER, self._fields())
+
+    def to_bytes(self) -> bytes:
+        return encode_frame(FrameType.REKEY_OFFER, self._fields() + [(FieldTag.REKEY_MAC, self.tag)])
+
+    @classmethod
+    def from_bytes(cls, frame: bytes) -> "RekeyOffer":
+        decoded = decode_frame(frame)
+        if decoded.frame_type is not FrameType.REKEY_OFFER:
+            raise ValueError(f"unexpected frame type: {decoded.frame_type.name}")
+        return cls(
+            epoch=int.from_bytes(decoded.field(FieldTag.EPOCH), "big"),
+            boundary=int.from_bytes(decoded.field(FieldTag.BOUNDARY), "big"),
+            ct_ml=bytes(decoded.field(FieldTag.CT_ML)),
+            ct_mce=bytes(decoded.field(FieldTag.CT_MCE)),
+            tag=bytes(decoded.fields.get(FieldTag.REKEY_MAC, b"")),
+        )
+
+
+def offer_tag(session: TriCrownSession, offer: RekeyOffer) -> bytes:
+    """HMAC-SHA3-256 of ``offer`` under the session's current root key."""
+
+    key = crypto.hkdf_expand(session.chains.rk, params=HKDFParams(info=_OFFER_MAC_INFO, length=32))
+    return hmac.new(key, offer.authenticated_bytes(), hashlib.sha3_256).digest()
+
+
+@dataclass(frozen=True)
+class EpochStats:
+    """Snapshot of :class:`EpochManager` counters.
+
+    ``stalls`` counts swaps that had to wait for background KEM work.
+    """
+
+    epoch: int
+    prepared: int
+    swaps: int
+    stalls: int
+
+
+class EpochManager:
+    """Drive one session through epochs with the next rekey precomputed.
+
+    ``party`` is this side's handshake party and ``peer_hello`` the peer's
+    hello values.  The session's role decides the direction: the client
+    encapsulates and announces offers, the server decapsulates them.
+    ``executor`` defaults to a private single-thread pool shut down by
+    :meth:`close`.
+    """
+
+    def __init__(
+        self,
+        session: TriCrownSession,
+        party: TriCrownParty,
+        peer_hello: HelloFields,
+        *,
+        lead: int = 8,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        if lead < 1:
+            raise ValueError("lead must be positive")
+        self.session = session
+        self.party = party
+        self.peer_hello = peer_hello
+        self.lead = lead
+        self.initiator = session.role == "client"
+        self._owns_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix="tricrown-rekey")
+        self._lock = threading.Lock()
+        self._epoch = 0
+        self._pending: Optional[Future] = None
+        self._offer: Optional[RekeyOffer] = None
+        self._prepared = 0
+        self._swaps = 0
+        self._stalls = 0
+
+    def __enter__(self) -> "EpochManager":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._owns_executor:
+            self.executor.shutdown(wait=True)
+
+    @property
+    def epoch(self) -> int:
+        return self._epoch
+
+    def _encapsulate(self) -> Tuple[Tuple[bytes, bytes], List[bytes]]:
+        ct_ml, ss_ml = self.party.kem_ml.encapsulate(bytes(self.peer_hello.kem_ml))
+        ct_mce, ss_mce = self.party.kem_mce.encapsulate(bytes(self.peer_hello.kem_mce))
+        return (ct_ml, ct_mce), [ss_ml, ss_mce]
+
+    def _decapsulate(self, offer: RekeyOffer) -> Tuple[Tuple[bytes, bytes], List[bytes]]:
+        secrets = [self.party.kem_ml.decapsulate(offer.ct_ml), self.party.kem_mce.decapsulate(offer.ct_mce)]
+        return (offer.ct_ml, offer.ct_mce), secrets
+
+    def _refresh_due_soon(self) -> bool:
+        session = self.session
+        if session.sent_messages + self.lead >= session.refresh_interval_messages:
+            return True
+        return time.time() - session.last_refresh_at >= session.refresh_interval_seconds
+
+    def _swap(self) -> None:
+        pending = self._pending
+        if not pending.done():
+            self._stalls += 1
+        _, secrets = pending.result()
+        session = self.session
+        session.rekey(new_secrets=secrets, transcript=session.transcript + self._offer.to_bytes())
+        self._epoch += 1
+        self._swaps += 1
+        self._pending = None
+        self._offer = None
+
+    def seal(self, plaintext: bytes, *, aad: bytes = b"") -> Record:
+        with self._lock:
+            if self.initiator and self._pending is None and self._refresh_due_soon():
+                self._pending = self.executor.submit(self._encapsulate)
+                self._prepared += 1
+            record = self.session.seal(plaintext, aad=aad)
+            if self.initiator and self._offer is not None and self.session.sent_messages >= self._offer.boundary:
+                self._swap()
+            return record
+
+    def open(self, record: Record) -> bytes:
+        with self._lock:
+            plaintext = self.session.open(record)
+            if not self.initiator and self._offer is not None and self.session.received_messages >= self._offer.boundary:
+                self._swap()
+            return plaintext
+
+    def poll_offer(self) -> Optional[RekeyOffer]:
+        """Return the next epoch's offer once its encapsulations are done.
+
+        Each offer is returned once and must be sent to the peer before any
+        further record.
+        """
+
+        with self._lock:
+            if not self.initiator or self._pending is None or self._offer is not None:
+                return None
+            if not self._pending.done():
+                return None
+            (ct_ml, ct_mce), _ = self._pending.result()
+            session = self.session
+            if time.time() - session.last_refresh_at >= session.refresh_interval_seconds:
+                boundary = session.sent_messages + 1
+            else:
+                boundary = max(session.refresh_interval_messages, session.sent_messages + 1)
+            offer = RekeyOffer(epoch=self._epoch + 1, boundary=boundary, ct_ml=ct_ml, ct_mce=ct_mce)
+            self._offer = replace(offer, tag=offer_tag(session, offer))
+            return self._offer
+
+    def accept_offer(self, offer: RekeyOffer | bytes) -> None:
+        """Start decapsulating the peer's offer for the next epoch.
+
+        Offers whose tag does not verify under the current root key are
+        rejected with :class:`ValueError` and leave the manager unchanged.
+        """
+
+        if isinstance(offer, (bytes, bytearray, memoryview)):
+            offer = RekeyOffer.from_bytes(offer)
+        with self._lock:
+            if self.initiator:
+                raise RuntimeError("only the responder accepts rekey offers")
+            if not hmac.compare_digest(offer_tag(self.session, offer), offer.tag):
+                raise ValueError("rekey offer authentication failed")
+            if offer.epoch != self._epoch + 1 or self._offer is not None:
+                raise ValueError(f"unexpected rekey offer for epoch {offer.epoch}")
+            if offer.boundary <= self.session.received_messages:
+                raise ValueError("rekey offer boundary has already passed")
+            self._offer = offer
+            self._pending = self.executor.submit(self._decapsulate, offer)
+            self._prepared += 1
+
+    def stats(self) -> EpochStats:
+        with self._lock:
+            return EpochStats(epoch=self._epoch, prepared=self._prepared, swaps=self._swaps, stalls=self._stalls)
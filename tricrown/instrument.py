@@ -0,0 +1,128 @@
+"""Opt-in per-phase timers and counters for the handshake and record layer.
+
+:data:`METRICS` is a process-wide :class:`Instrumentation` registry that is
+disabled by default.  :mod:`tricrown.crypto` and :mod:`tricrown.session`
+report into it:
+
+``handshake.kem_encapsulate`` / ``handshake.kem_decapsulate`` /
+``handshake.x25519`` / ``handshake.sign`` / ``handshake.verify`` /
+``handshake.derive``
+    Handshake phases, timed per call.
+``transcript`` / ``transcript_hash`` / ``audit_salt`` / ``hkdf``
+    Hashing and key derivation in :mod:`tricrown.crypto` and the audit salt.
+``record.seal`` / ``record.open`` / ``rekey``
+    Record-layer timers; the matching ``records.sealed``, ``bytes.sealed``,
+    ``records.opened``, ``bytes.opened``, ``rekeys`` and ``handshakes``
+    entries are plain counters.
+
+When disabled, :meth:`Instrumentation.phase` returns a shared no-op context
+manager and the record layer skips its bookkeeping after a single attribute
+check, so leaving the hooks in place costs next to nothing.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from time import perf_counter
+from typing import Any, Dict, List
+
+
+class _NullPhase:
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info: object) -> None:
+        return None
+
+
+_NULL_PHASE = _NullPhase()
+
+
+class _Phase:
+    __slots__ = ("_registry", "_name", "_start")
+
+    def __init__(self, registry: "Instrumentation", name: str) -> None:
+        self._registry = registry
+        self._name = name
+
+    def __enter__(self) -> None:
+        self._start = perf_counter()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._registry.record_time(self._name, perf_counter() - self._start)
+
+
+class Instrumentation:
+    """Thread-safe registry of named timers and counters."""
+
+    def __init__(self, *, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        # name -> [calls, total seconds, min seconds, max seconds]
+        self._timers: Dict[str, List[float]] = {}
+        self._counters: Dict[str, int] = {}
+
+    def enable(self) -> None:
+        self.enabled = True
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def reset(self) -> None:
+        with self._lock:
+            self._timers.clear()
+            self._counters.clear()
+
+    def phase(self, name: str) -> _Phase | _NullPhase:
+        """Context manager timing one occurrence of ``name``."""
+
+        if not self.enabled:
+            return _NULL_PHASE
+        return _Phase(self, name)
+
+    def record_time(self, name: str, seconds: float) -> None:
+        with self._lock:
+            timer = self._timers.get(name)
+            if timer is None:
+                self._timers[name] = [1, seconds, seconds, seconds]
+            else:
+                timer[0] += 1
+                timer[1] += seconds
+                if seconds < timer[2]:
+                    timer[2] = seconds
+                if seconds > timer[3]:
+                    timer[3] = seconds
+
+    def count(self, name: str, value: int = 1) -> None:
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return ``{"timers": {...}, "counters": {...}}`` as plain data.
+
+        Timer entries hold ``calls``, ``total``, ``mean``, ``min`` and ``max``
+        in seconds.
+        """
+
+        with self._lock:
+            timers = {
+                name: {
+                    "calls": int(calls),
+                    "total": total,
+                    "mean": total / calls,
+                    "min": low,
+                    "max": high,
+                }
+                for name, (calls, total, low, high) in sorted(self._timers.items())
+            }
+            counters = dict(sorted(self._counters.items()))
+        return {"enabled": self.enabled, "timers": timers, "counters": counters}
+
+    def to_json(self, **kwargs: Any) -> str:
+        return json.dumps(self.snapshot(), **kwargs)
+
+
+METRICS = Instrumentation()
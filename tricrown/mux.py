@@ -0,0 +1,174 @@
+"""Stream multiplexing over one TRI-CROWN session.
+
+A :class:`~tricrown.session.TriCrownSession` has a single send chain, so
+every record it seals is serialised through one ratchet.  A
+:class:`MultiplexedSession` instead derives an independent set of chains per
+stream from the session root key::
+
+    ck_a || ck_b || k_commit = HKDF-Expand(rk, "TRICROWN mux" || stream_id, 96)
+
+and keeps one sub-session per stream.  Records carry their ``stream_id`` and
+are routed to the matching sub-session on receipt.  Streams share nothing
+mutable, so different streams can be sealed on different threads; records
+within one stream stay strictly ordered.  ``cryptography`` releases the GIL
+inside the AEAD call, so on large records throughput scales with the number
+of workers.
+
+Stream ids are ``1 .. 2**32 - 1``; ``stream_id == 0`` marks an ordinary
+record of the parent session, and :meth:`MultiplexedSession.seal` and
+:meth:`MultiplexedSession.open` hand such records to the parent session
+itself.  The stream chains hang off ``Chains.rk``, so
+after the parent session rekeys a new :class:`MultiplexedSession` must be
+built on both sides.
+"""
+
+from __future__ import annotations
+
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from dataclasses import replace
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from . import crypto
+from .crypto import HKDFParams
+from .session import Chains, Record, TriCrownSession, _split_material
+
+MAX_STREAM_ID = 2**32 - 1
+
+
+def derive_stream_chains(chains: Chains, stream_id: int, role: str) -> Chains:
+    """Derive the chains of ``stream_id`` from the session root key."""
+
+    if not 0 < stream_id <= MAX_STREAM_ID:
+        raise ValueError(f"stream id must be in 1..{MAX_STREAM_ID}")
+    info = b"TRICROWN mux" + stream_id.to_bytes(4, "big")
+    material = crypto.hkdf_expand(chains.rk, params=HKDFParams(info=info, length=96))
+    return _split_material(chains.rk + material, role)
+
+
+class _Stream:
+    __slots__ = ("session", "lock")
+
+    def __init__(self, session: TriCrownSession) -> None:
+        self.session = session
+        self.lock = threading.Lock()
+
+
+class MultiplexedSession:
+    """Per-stream chains derived from one session, sealed on a thread pool.
+
+    ``executor`` defaults to a private :class:`ThreadPoolExecutor` with
+    ``max_workers`` threads that is shut down by :meth:`close`.
+    """
+
+    def __init__(
+        self,
+        session: TriCrownSession,
+        *,
+        executor: Optional[Executor] = None,
+        max_workers: Optional[int] = None,
+    ) -> None:
+        self.session = session
+        self._owns_executor = executor is None
+        self.executor = executor or ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="tricrown-mux")
+        self._streams: Dict[int, _Stream] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "MultiplexedSession":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._owns_executor:
+            self.executor.shutdown(wait=True)
+
+    def _stream(self, stream_id: int) -> _Stream:
+        stream = self._streams.get(stream_id)
+        if stream is None:
+            with self._lock:
+                stream = self._streams.get(stream_id)
+                if stream is None and stream_id == 0:
+                    stream = self._streams[0] = _Stream(self.session)
+                elif stream is None:
+                    parent = self.session
+                    stream = _Stream(
+                        TriCrownSession(
+                            role=parent.role,
+                            session_id=parent.session_id,
+                            transcript=parent.transcript,
+                            chains=derive_stream_chains(parent.chains, stream_id, parent.role),
+                            aead_backend=parent.aead_backend,
+                        )
+                    )
+                    self._streams[stream_id] = stream
+        return stream
+
+    def stream_session(self, stream_id: int) -> TriCrownSession:
+        """Return the sub-session backing ``stream_id``."""
+
+        return self._stream(stream_id).session
+
+    def seal(self, stream_id: int, plaintext: bytes, *, aad: bytes = b"") -> Record:
+        stream = self._stream(stream_id)
+        with stream.lock:
+            record = stream.session.seal(plaintext, aad=aad)
+        return replace(record, stream_id=stream_id)
+
+    def open(self, record: Record) -> bytes:
+        stream = self._stream(record.stream_id)
+        with stream.lock:
+            return stream.session.open(record)
+
+    def _seal_run(self, stream_id: int, items: Sequence[Tuple[int, bytes, bytes]]) -> List[Tuple[int, Record]]:
+        return [(index, self.seal(stream_id, plaintext, aad=aad)) for index, plaintext, aad in items]
+
+    def _open_run(self, items: Sequence[Tuple[int, Record]]) -> List[Tuple[int, bytes]]:
+        return [(index, self.open(record)) for index, record in items]
+
+    def seal_concurrent(
+        self,
+        messages: Iterable[Tuple[int, bytes]],
+        aads: Optional[Sequence[bytes]] = None,
+    ) -> List[Record]:
+        """Seal ``(stream_id, plaintext)`` pairs, one pool task per stream.
+
+        Records of the same stream are sealed in input order; the result is
+        returned in input order as well.
+        """
+
+        messages = list(messages)
+        count = len(messages)
+        if aads is None:
+            aads = [b""] * count
+        elif len(aads) != count:
+            raise ValueError("messages and aads must have the same length")
+        runs: Dict[int, List[Tuple[int, bytes, bytes]]] = {}
+        for index, ((stream_id, plaintext), aad) in enumerate(zip(messages, aads)):
+            runs.setdefault(stream_id, []).append((index, plaintext, aad))
+        futures = [self.executor.submit(self._seal_run, stream_id, run) for stream_id, run in runs.items()]
+        records: List[Optional[Record]] = [None] * count
+        for future in futures:
+            for index, record in future.result():
+                records[index] = record
+        return records  # type: ignore[return-value]
+
+    def open_concurrent(self, records: Iterable[Record]) -> List[bytes]:
+        """Open records from any mix of streams, one pool task per stream.
+
+        Unlike :meth:`TriCrownSession.open_many` this is not all-or-nothing:
+        if one stream fails, the other streams' records may have been opened.
+        """
+
+        runs: Dict[int, List[Tuple[int, Record]]] = {}
+        count = 0
+        for index, record in enumerate(records):
+            runs.setdefault(record.stream_id, []).append((index, record))
+            count = index + 1
+        futures = [self.executor.submit(self._open_run, run) for run in runs.values()]
+        plaintexts: List[Optional[bytes]] = [None] * count
+        for future in futures:
+            for index, plaintext in future.result():
+                plaintexts[index] = plaintext
+        return plaintexts  # type: ignore[return-value]
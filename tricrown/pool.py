@@ -0,0 +1,182 @@
+"""Background pool of pre-generated ephemeral key material.
+
+Constructing a :class:`~tricrown.session.TriCrownParty` generates an X25519
+key pair, two KEM key pairs and a signature key pair.  During connection
+bursts that work sits on the handshake's critical path.  A
+:class:`KeyMaterialPool` moves it to a background thread: the thread keeps a
+bounded queue topped up to ``high_watermark`` key sets and wakes up whenever
+the queue drains to ``low_watermark``.  Each key set is handed out once.
+"""
+
+from __future__ import annotations
+
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from cryptography.hazmat.primitives.asymmetric import x25519
+
+from .pq import StubKEM, StubSignatureKeypair, random_stub_kem, random_stub_signature
+from .session import TriCrownParty
+
+
+@dataclass(frozen=True)
+class KeyMaterial:
+    """One single-use set of ephemeral keys for a handshake party."""
+
+    kem_ml: StubKEM
+    kem_mce: StubKEM
+    signature: StubSignatureKeypair
+    x25519_private: x25519.X25519PrivateKey
+
+
+def generate_key_material() -> KeyMaterial:
+    """Generate a fresh :class:`KeyMaterial` set."""
+
+    return KeyMaterial(
+        kem_ml=random_stub_kem("ML-KEM-stub"),
+        kem_mce=random_stub_kem("McEliece-stub"),
+        signature=random_stub_signature(),
+        x25519_private=x25519.X25519PrivateKey.generate(),
+    )
+
+
+@dataclass(frozen=True)
+class PoolStats:
+    """Snapshot of :class:`KeyMaterialPool` counters."""
+
+    size: int
+    low_watermark: int
+    high_watermark: int
+    generated: int
+    hits: int
+    misses: int
+    refills: int
+
+
+class KeyMaterialPool:
+    """Bounded queue of key sets refilled by a background thread.
+
+    :meth:`acquire` never blocks by default: when the pool is empty it counts
+    a miss and generates a key set inline, so callers degrade to the
+    unpooled cost rather than stalling.
+    """
+
+    def __init__(
+        self,
+        *,
+        low_watermark: int = 16,
+        high_watermark: int = 64,
+        generator: Callable[[], KeyMaterial] = generate_key_material,
+    ) -> None:
+        if not 0 <= low_watermark < high_watermark:
+            raise ValueError("watermarks must satisfy 0 <= low < high")
+        self.low_watermark = low_watermark
+        self.high_watermark = high_watermark
+        self._generator = generator
+        self._queue: "queue.Queue[KeyMaterial]" = queue.Queue(maxsize=high_watermark)
+        self._refill = threading.Event()
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._generated = 0
+        self._hits = 0
+        self._misses = 0
+        self._refills = 0
+
+    def start(self) -> "KeyMaterialPool":
+        if self._thread is None:
+            self._stopped.clear()
+            self._refill.set()
+            self._thread = threading.Thread(target=self._run, name="tricrown-key-pool", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stopped.set()
+        self._refill.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def __enter__(self) -> "KeyMaterialPool":
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._refill.wait()
+            self._refill.clear()
+            if self._stopped.is_set():
+                break
+            with self._lock:
+                self._refills += 1
+            while not self._stopped.is_set() and not self._queue.full():
+                material = self._generator()
+                try:
+                    self._queue.put_nowait(material)
+                except queue.Full:
+                    break
+                with self._lock:
+                    self._generated += 1
+
+    def fill(self) -> None:
+        """Synchronously top the pool up to ``high_watermark``."""
+
+        while not self._queue.full():
+            try:
+                self._queue.put_nowait(self._generator())
+            except queue.Full:
+                break
+            with self._lock:
+                self._generated += 1
+
+    def acquire(self, *, block: bool = False, timeout: Optional[float] = None) -> KeyMaterial:
+        """Take one key set from the pool.
+
+        With ``block=True`` the call waits (up to ``timeout``) for the
+        background thread instead of generating inline.
+        """
+
+        try:
+            material = self._queue.get(block=block, timeout=timeout)
+        except queue.Empty:
+            if block:
+                raise TimeoutError("no key material available") from None
+            with self._lock:
+                self._misses += 1
+            material = self._generator()
+        else:
+            with self._lock:
+                self._hits += 1
+        if self._queue.qsize() <= self.low_watermark:
+            self._refill.set()
+        return material
+
+    def party(self, role: str, *, encapsulate_back: bool = True) -> TriCrownParty:
+        """Return a :class:`TriCrownParty` built from pooled key material."""
+
+        material = self.acquire()
+        return TriCrownParty(
+            role=role,
+            kem_ml=material.kem_ml,
+            kem_mce=material.kem_mce,
+            signature=material.signature,
+            encapsulate_back=encapsulate_back,
+            x25519_private=material.x25519_private,
+        )
+
+    def stats(self) -> PoolStats:
+        with self._lock:
+            return PoolStats(
+                size=self._queue.qsize(),
+                low_watermark=self.low_watermark,
+                high_watermark=self.high_watermark,
+                generated=self._generated,
+                hits=self._hits,
+                misses=self._misses,
+                refills=self._refills,
+            )
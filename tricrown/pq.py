@@ -10,8 +10,12 @@ swap out during integration tests.
 from __future__ import annotations
 
 import os
+import threading
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
-from typing import Dict, Protocol, runtime_checkable
+from typing import Callable, Deque, List, Optional, Protocol, Sequence, Tuple, runtime_checkable
+
+DEFAULT_DECAP_CACHE_SIZE = 1024
 
 
 @runtime_checkable
@@ -31,6 +35,111 @@ class Encapsulation(Protocol):
         ...
 
 
+@runtime_checkable
+class BatchEncapsulation(Encapsulation, Protocol):
+    """Optional extension for providers with native batch KEM calls.
+
+    Callers should go through :func:`encapsulate_batch` and
+    :func:`decapsulate_batch`, which fall back to single calls for plain
+    :class:`Encapsulation` providers.
+    """
+
+    def encapsulate_batch(self, peer_public_keys: Sequence[bytes]) -> List[Tuple[bytes, bytes]]:  # pragma: no cover
+        ...
+
+    def decapsulate_batch(self, ciphertexts: Sequence[bytes]) -> List[bytes]:  # pragma: no cover
+        ...
+
+
+def encapsulate_batch(kem: object, peer_public_keys: Sequence[bytes]) -> List[Tuple[bytes, bytes]]:
+    """Encapsulate to several keys, using the provider's batch call if it has one."""
+
+    batch = getattr(kem, "encapsulate_batch", None)
+    if batch is not None:
+        return batch(peer_public_keys)
+    return [kem.encapsulate(public_key) for public_key in peer_public_keys]
+
+
+def decapsulate_batch(kem: object, ciphertexts: Sequence[bytes]) -> List[bytes]:
+    """Decapsulate several ciphertexts, using the provider's batch call if it has one."""
+
+    batch = getattr(kem, "decapsulate_batch", None)
+    if batch is not None:
+        return batch(ciphertexts)
+    return [kem.decapsulate(ciphertext) for ciphertext in ciphertexts]
+
+
+@dataclass(frozen=True)
+class DecapCacheStats:
+    """Snapshot of :class:`DecapCache` counters."""
+
+    size: int
+    max_entries: int
+    hits: int
+    misses: int
+    evictions: int
+
+
+class DecapCache:
+    """LRU-bounded map from ciphertext to shared secret.
+
+    Providers use it to answer repeated decapsulations of the same ciphertext
+    without redoing the KEM work.  The cache never holds more than
+    ``max_entries`` secrets, so a long-running server does not grow without
+    bound.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_DECAP_CACHE_SIZE) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[bytes, bytes]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def get(self, ciphertext: bytes) -> Optional[bytes]:
+        with self._lock:
+            secret = self._entries.get(ciphertext)
+            if secret is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(ciphertext)
+            self._hits += 1
+            return secret
+
+    def put(self, ciphertext: bytes, secret: bytes) -> None:
+        with self._lock:
+            self._entries[ciphertext] = secret
+            self._entries.move_to_end(ciphertext)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def stats(self) -> DecapCacheStats:
+        with self._lock:
+            return DecapCacheStats(
+                size=len(self._entries),
+                max_entries=self.max_entries,
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+            )
+
+
 @dataclass
 class StubKEM:
     """Very small deterministic KEM used for documentation-style tests.
@@ -44,7 +153,7 @@ class StubKEM:
     public_key: bytes
     secret_key: bytes
     name: str
-    _decap_cache: Dict[bytes, bytes] = field(default_factory=dict, init=False, repr=False)
+    decap_cache: DecapCache = field(default_factory=DecapCache, repr=False, compare=False)
 
     def public_key_bytes(self) -> bytes:
         return self.public_key
@@ -56,11 +165,18 @@ class StubKEM:
         from hashlib import sha3_256
 
         ct = sha3_256(self.public_key + peer_public_key).digest()
-        self._decap_cache[ct] = ct
+        self.decap_cache.put(ct, ct)
         return ct, ct
 
     def decapsulate(self, ciphertext: bytes) -> bytes:
-        return self._decap_cache.get(ciphertext, ciphertext)
+        secret = self.decap_cache.get(ciphertext)
+        return ciphertext if secret is None else secret
+
+    def encapsulate_batch(self, peer_public_keys: Sequence[bytes]) -> List[Tuple[bytes, bytes]]:
+        return [self.encapsulate(public_key) for public_key in peer_public_keys]
+
+    def decapsulate_batch(self, ciphertexts: Sequence[bytes]) -> List[bytes]:
+        return [self.decapsulate(ciphertext) for ciphertext in ciphertexts]
 
 
 @dataclass
@@ -97,6 +213,51 @@ def random_stub_kem(name: str) -> StubKEM:
     return StubKEM(public_key=pk, secret_key=sk, name=name)
 
 
+def random_stub_kem_batch(name: str, count: int) -> List[StubKEM]:
+    """Generate ``count`` stub KEM key pairs from a single entropy read."""
+
+    pool = os.urandom(128 * count)
+    return [
+        StubKEM(public_key=pool[offset : offset + 64], secret_key=pool[offset + 64 : offset + 128], name=name)
+        for offset in range(0, 128 * count, 128)
+    ]
+
+
+class KeypairPrefetcher:
+    """Hand out KEM key pairs one at a time, generating them in batches.
+
+    ``generate_batch(count)`` is called with ``batch_size`` whenever the
+    buffer runs dry, so per-call provider overhead is paid once per batch.
+    """
+
+    def __init__(self, generate_batch: Callable[[int], List[object]], *, batch_size: int = 32) -> None:
+        if batch_size < 1:
+            raise ValueError("batch_size must be positive")
+        self.batch_size = batch_size
+        self._generate_batch = generate_batch
+        self._lock = threading.Lock()
+        self._buffer: Deque[object] = deque()
+        self.batches = 0
+
+    def __len__(self) -> int:
+        return len(self._buffer)
+
+    def prefetch(self) -> None:
+        """Generate one batch ahead of demand."""
+
+        keypairs = self._generate_batch(self.batch_size)
+        with self._lock:
+            self._buffer.extend(keypairs)
+            self.batches += 1
+
+    def take(self) -> object:
+        while True:
+            with self._lock:
+                if self._buffer:
+                    return self._buffer.popleft()
+            self.prefetch()
+
+
 def random_stub_signature(name: str = "ML-DSA-stub") -> StubSignatureKeypair:
     """Return a deterministic-style signature key pair stub."""
 
@@ -0,0 +1,258 @@
+"""Ticket-based session resumption for TRI-CROWN 2.0.
+
+After a full handshake both peers can compute the same resumption secret
+from ``Chains.rk`` and the final transcript hash.  The server seals that
+secret into an opaque ticket under its ticket key and hands the ticket to
+the client.  A reconnecting client presents the ticket with a fresh X25519
+share; the server opens the ticket, and both sides derive new chains from
+``mix_shared_secrets(resumption secret, ss_X)``.  No KEM or signature work
+is needed on the resumed path.
+
+Tickets are single use.  The server records every issued ticket id in a
+:class:`TicketStore` bounded by size (LRU) and age (TTL); a ticket whose id
+is missing from the store (replayed, expired or evicted) is rejected and
+the client falls back to a full handshake.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Optional, Tuple
+
+from cryptography.hazmat.primitives.asymmetric import x25519
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
+
+from . import crypto
+from .crypto import SUITE_ID, HKDFParams, Transcript, mix_shared_secrets
+from .session import AEADBackend, HandshakeResult, TriCrownSession, _split_material
+from .wire import FieldTag, FrameType, decode_frame, encode_frame
+
+_TICKET_ID_LEN = 16
+_SECRET_LEN = 32
+_NONCE_LEN = 12
+_TICKET_AAD = SUITE_ID + b" ticket"
+
+
+def resumption_secret(session: TriCrownSession) -> bytes:
+    """Derive the resumption secret for a freshly established session.
+
+    Both peers must call this before the first :meth:`~TriCrownSession.rekey`,
+    since the secret is bound to the handshake root key.
+    """
+
+    prk = crypto.hkdf_extract(session.transcript, session.chains.rk)
+    return crypto.hkdf_expand(prk, params=HKDFParams(info=b"TRICROWN resumption", length=_SECRET_LEN))
+
+
+@dataclass(frozen=True)
+class TicketStoreStats:
+    """Snapshot of :class:`TicketStore` counters."""
+
+    size: int
+    max_entries: int
+    issued: int
+    redeemed: int
+    rejected: int
+    expired: int
+    evicted: int
+
+
+class TicketStore:
+    """Size- and TTL-bounded record of outstanding ticket ids.
+
+    Entries are kept in issue order, so both the LRU bound and TTL expiry
+    evict from the front of an ordered dict.  The store is safe to share
+    between executor threads.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = 100_000,
+        ttl: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_entries < 1:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[bytes, float]" = OrderedDict()
+        self._issued = 0
+        self._redeemed = 0
+        self._rejected = 0
+        self._expired = 0
+        self._evicted = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _expire(self, now: float) -> None:
+        while self._entries:
+            ticket_id, issued_at = next(iter(self._entries.items()))
+            if now - issued_at < self.ttl:
+                break
+            del self._entries[ticket_id]
+            self._expired += 1
+
+    def add(self, ticket_id: bytes) -> None:
+        with self._lock:
+            now = self._clock()
+            self._expire(now)
+            self._entries[ticket_id] = now
+            self._issued += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evicted += 1
+
+    def redeem(self, ticket_id: bytes) -> bool:
+        """Remove ``ticket_id`` and report whether it was still valid."""
+
+        with self._lock:
+            self._expire(self._clock())
+            if self._entries.pop(ticket_id, None) is None:
+                self._rejected += 1
+                return False
+            self._redeemed += 1
+            return True
+
+    def stats(self) -> TicketStoreStats:
+        with self._lock:
+            return TicketStoreStats(
+                size=len(self._entries),
+                max_entries=self.max_entries,
+                issued=self._issued,
+                redeemed=self._redeemed,
+                rejected=self._rejected,
+                expired=self._expired,
+                evicted=self._evicted,
+            )
+
+
+class TicketIssuer:
+    """Server-side ticket sealing and redemption."""
+
+    def __init__(self, store: Optional[TicketStore] = None, *, ticket_key: Optional[bytes] = None) -> None:
+        self.store = store or TicketStore()
+        self._aead = AESGCM(ticket_key or AESGCM.generate_key(bit_length=256))
+
+    def issue(self, session: TriCrownSession) -> bytes:
+        """Return an opaque ticket for the client of ``session``."""
+
+        ticket_id = os.urandom(_TICKET_ID_LEN)
+        nonce = os.urandom(_NONCE_LEN)
+        sealed = self._aead.encrypt(nonce, ticket_id + resumption_secret(session), _TICKET_AAD)
+        self.store.add(ticket_id)
+        return nonce + sealed
+
+    def redeem(self, ticket: bytes) -> bytes:
+        """Open ``ticket`` and return its resumption secret (single use)."""
+
+        try:
+            plain = self._aead.decrypt(bytes(ticket[:_NONCE_LEN]), bytes(ticket[_NONCE_LEN:]), _TICKET_AAD)
+        except Exception:
+            raise ValueError("invalid resumption ticket") from None
+        ticket_id, secret = plain[:_TICKET_ID_LEN], plain[_TICKET_ID_LEN:]
+        if not self.store.redeem(ticket_id):
+            raise ValueError("resumption ticket expired or already used")
+        return secret
+
+
+@dataclass(frozen=True)
+class ClientTicket:
+    """What a client keeps in order to resume: the ticket and its secret."""
+
+    ticket: bytes
+    secret: bytes
+
+    @classmethod
+    def from_session(cls, session: TriCrownSession, ticket: bytes) -> "ClientTicket":
+        return cls(ticket=ticket, secret=resumption_secret(session))
+
+
+def _x25519_keypair() -> Tuple[x25519.X25519PrivateKey, bytes]:
+    private = x25519.X25519PrivateKey.generate()
+    return private, private.public_key().public_bytes(Encoding.Raw, PublicFormat.Raw)
+
+
+def _resumed_result(role: str, transcript: Transcript, secret: bytes, ss_x: bytes, aead: str) -> HandshakeResult:
+    th = transcript.digest()
+    shared_secrets = (secret, ss_x)
+    mix = mix_shared_secrets(transcript=th, shared_secrets=shared_secrets)
+    material = crypto.hkdf_expand(mix, params=HKDFParams(info=b"TRICROWN resume", length=128))
+    session_id = crypto.hkdf_expand(mix, params=HKDFParams(info=b"TRICROWN sid", length=16))
+    session = TriCrownSession(
+        role=role,
+        session_id=session_id,
+        transcript=th,
+        chains=_split_material(material, role),
+        aead_backend=AEADBackend(aead),
+    )
+    return HandshakeResult(session=session, transcript=th, shared_secrets=shared_secrets)
+
+
+class ResumeClientHandshake:
+    """Client side of a resumed handshake: ``hello`` then ``finish``."""
+
+    def __init__(self, ticket: ClientTicket, *, aead: str = "AES-256-GCM-SIV") -> None:
+        self.ticket = ticket
+        self.aead = aead
+        self.transcript = Transcript()
+        self._private, self._public = _x25519_keypair()
+
+    def hello(self) -> bytes:
+        frame = encode_frame(FrameType.RESUME_HELLO, [
+            (FieldTag.TICKET, self.ticket.ticket),
+            (FieldTag.X25519, self._public),
+        ])
+        self.transcript.absorb(frame)
+        return frame
+
+    def finish(self, accept_frame: bytes) -> HandshakeResult:
+        frame = decode_frame(accept_frame)
+        if frame.frame_type is not FrameType.RESUME_ACCEPT:
+            raise ValueError(f"unexpected frame type: {frame.frame_type.name}")
+        self.transcript.absorb(accept_frame)
+        peer = x25519.X25519PublicKey.from_public_bytes(bytes(frame.field(FieldTag.X25519)))
+        ss_x = self._private.exchange(peer)
+        return _resumed_result("client", self.transcript, self.ticket.secret, ss_x, self.aead)
+
+
+def resume_server(
+    issuer: TicketIssuer,
+    hello_frame: bytes,
+    *,
+    aead: str = "AES-256-GCM-SIV",
+) -> Tuple[bytes, HandshakeResult]:
+    """Redeem the ticket in ``hello_frame`` and return the accept frame and session."""
+
+    frame = decode_frame(hello_frame)
+    if frame.frame_type is not FrameType.RESUME_HELLO:
+        raise ValueError(f"unexpected frame type: {frame.frame_type.name}")
+    secret = issuer.redeem(frame.field(FieldTag.TICKET))
+    peer = x25519.X25519PublicKey.from_public_bytes(bytes(frame.field(FieldTag.X25519)))
+    private, public = _x25519_keypair()
+    accept = encode_frame(FrameType.RESUME_ACCEPT, [(FieldTag.X25519, public)])
+    transcript = Transcript()
+    transcript.absorb(hello_frame)
+    transcript.absorb(accept)
+    return accept, _resumed_result("server", transcript, secret, private.exchange(peer), aead)
+
+
+def perform_resumption(
+    ticket: ClientTicket,
+    issuer: TicketIssuer,
+    *,
+    aead: str = "AES-256-GCM-SIV",
+) -> tuple[HandshakeResult, HandshakeResult]:
+    """Run a resumed handshake in-process and return both sessions."""
+
+    client = ResumeClientHandshake(ticket, aead=aead)
+    accept, server_result = resume_server(issuer, client.hello(), aead=aead)
+    return client.finish(accept), server_result
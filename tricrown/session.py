@@ -9,39 +9,55 @@ libraries.
 
 from __future__ import annotations
 
-import json
-import os
+import struct
 import time
+from array import array
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from hmac import compare_digest
-from typing import Iterable, List, Sequence
+from typing import BinaryIO, Iterable, Iterator, List, Sequence
 
 from cryptography.hazmat.primitives.asymmetric import x25519
 from cryptography.hazmat.primitives.serialization import Encoding, PublicFormat
-from cryptography.hazmat.primitives.ciphers.aead import AESGCM
 
 from . import crypto
+from .aead import AEADBackend
+from .instrument import METRICS
 from .crypto import (
     HKDFParams,
+    MessageStats,
+    Transcript,
+    byte_histogram,
+    commit_prefix,
     commit_tag,
+    commit_tag_from_prefix,
     derive_message_key,
     derive_nonce,
     mix_shared_secrets,
-    transcript_hash,
+    ratchet_batch,
 )
+from .wire import HelloFields, get_codec
 from .pq import StubKEM, StubSignatureKeypair, random_stub_kem, random_stub_signature
 
-try:  # pragma: no cover - optional dependency
-    from nacl import bindings as nacl_bindings
-except Exception:  # pragma: no cover - fallback when PyNaCl is unavailable
-    nacl_bindings = None
 
+AUDIT_SALT_VERSIONS = (1, 2)
 
-def _json_dumps(data: dict) -> bytes:
-    return json.dumps(data, sort_keys=True, separators=(",", ":")).encode("utf-8")
+STREAM_FINAL = 0x01
+DEFAULT_STREAM_CHUNK_SIZE = 64 * 1024
+DEFAULT_MAX_STREAM_CHUNK_SIZE = 16 * 1024 * 1024
 
+_STREAM_AAD = b"TRICROWN stream"
+_AEAD_TAG_LENGTH = 16
 
-def compute_audit_salt(messages: Iterable[bytes]) -> bytes:
+RECORD_SUITE_ID = 0x0200
+COMMITMENT_LENGTH = 32
+
+# suite_id (2) || nonce length (1) || reserved (1) || sid (4) || seq (8) ||
+# aad_len (4) || ct_len (4), then nonce, commitment, aad and ciphertext.
+_RECORD_HEADER = struct.Struct(">HBBIQII")
+
+
+def compute_audit_salt(messages: Iterable[bytes], *, version: int = 1) -> bytes:
     """Derive the ``s_math`` auditing salt described in the annex.
 
     The real system would fold in spectral features and state space analysis of
@@ -51,23 +67,52 @@ def compute_audit_salt(messages: Iterable[bytes]) -> bytes:
     remain reproducible during testing.
     """
 
+    with METRICS.phase("audit_salt"):
+        stats = [
+            MessageStats(length=len(message), histogram=byte_histogram(message) if version >= 2 else None)
+            for message in messages
+        ]
+        return audit_salt_from_stats(stats, version=version)
+
+
+def audit_salt_from_stats(stats: Sequence[MessageStats], *, version: int = 1) -> bytes:
+    """Compute the audit salt from statistics gathered by :class:`Transcript`.
+
+    Version 1 folds in the message length and its position.  Its original
+    "entropy estimate" summed all 256 byte counts, which always equals the
+    length, so it reduces to ``1.0`` for non-empty messages and needs no
+    pass over the payload.  Version 2 replaces it with the Shannon entropy of
+    the byte histogram and is domain separated from version 1.
+    """
+
     import math
+    from hashlib import sha3_256
 
-    stats: List[float] = []
-    for idx, message in enumerate(messages):
-        length = len(message)
-        entropy_est = sum(message.count(byte) for byte in range(256)) / (length or 1)
-        stats.append(float(length))
-        stats.append(entropy_est + idx)
-        stats.append(math.sin(length / (idx + 1 or 1)))
+    if version not in AUDIT_SALT_VERSIONS:
+        raise ValueError(f"Unsupported audit salt version: {version}")
 
-    accumulator = bytearray()
-    for value in stats:
+    values: List[float] = []
+    for idx, stat in enumerate(stats):
+        length = stat.length
+        if version == 1:
+            entropy_est = 1.0 if length else 0.0
+        else:
+            if stat.histogram is None:
+                raise ValueError("audit salt v2 requires byte histograms")
+            entropy_est = 0.0
+            for count in stat.histogram:
+                if count:
+                    p = count / length
+                    entropy_est -= p * math.log2(p)
+        values.append(float(length))
+        values.append(entropy_est + idx)
+        values.append(math.sin(length / (idx + 1 or 1)))
+
+    accumulator = bytearray(b"" if version == 1 else b"TRICROWN audit v2")
+    for value in values:
         scaled = int(value * (1 << 20)) & 0xFFFFFFFFFFFFFFFF
         accumulator.extend(scaled.to_bytes(8, "big"))
 
-    from hashlib import sha3_256
-
     return sha3_256(bytes(accumulator)).digest()
 
 
@@ -81,73 +126,196 @@ class Chains:
 
 @dataclass
 class TriCrownParty:
-    """Represents one side of the TRI-CROWN handshake."""
+    """Represents one side of the TRI-CROWN handshake.
+
+    Any key material that is not supplied is generated at construction time;
+    :class:`tricrown.pool.KeyMaterialPool` supplies all of it pre-generated.
+    """
 
     role: str
     kem_ml: StubKEM = field(default_factory=lambda: random_stub_kem("ML-KEM-stub"))
     kem_mce: StubKEM = field(default_factory=lambda: random_stub_kem("McEliece-stub"))
     signature: StubSignatureKeypair = field(default_factory=random_stub_signature)
     encapsulate_back: bool = True
+    x25519_private: x25519.X25519PrivateKey | None = field(default=None, repr=False)
 
     def __post_init__(self) -> None:
-        self.x25519_private = x25519.X25519PrivateKey.generate()
+        if self.x25519_private is None:
+            self.x25519_private = x25519.X25519PrivateKey.generate()
         self.x25519_public = self.x25519_private.public_key().public_bytes(
             Encoding.Raw, PublicFormat.Raw
         )
 
-    def _hello_payload(self) -> dict:
-        return {
-            "role": self.role,
-            "kem_ml": self.kem_ml.public_key_bytes().hex(),
-            "kem_mce": self.kem_mce.public_key_bytes().hex(),
-            "x25519": self.x25519_public.hex(),
-            "sig_alg": self.signature.name,
-            "sig_pk": self.signature.public_key.hex(),
-        }
+    def hello_fields(self) -> HelloFields:
+        return HelloFields(
+            role=self.role,
+            kem_ml=self.kem_ml.public_key_bytes(),
+            kem_mce=self.kem_mce.public_key_bytes(),
+            x25519=self.x25519_public,
+            sig_alg=self.signature.name,
+            sig_pk=self.signature.public_key,
+        )
 
 
-@dataclass
-class AEADBackend:
-    """Abstracts the two AEAD options required by the suite."""
-
-    name: str
-
-    def nonce_length(self) -> int:
-        return 24 if "XChaCha20" in self.name else 12
-
-    def encrypt(self, key: bytes, nonce: bytes, data: bytes, aad: bytes) -> bytes:
-        if self.name == "AES-256-GCM-SIV":
-            aead = AESGCM(key)
-            return aead.encrypt(nonce, data, aad)
-        if self.name == "XChaCha20-Poly1305":
-            if nacl_bindings is None:
-                raise RuntimeError("PyNaCl is required for XChaCha20-Poly1305 support")
-            return nacl_bindings.crypto_aead_xchacha20poly1305_ietf_encrypt(data, aad, nonce, key)
-        raise ValueError(f"Unsupported AEAD suite: {self.name}")
-
-    def decrypt(self, key: bytes, nonce: bytes, data: bytes, aad: bytes) -> bytes:
-        if self.name == "AES-256-GCM-SIV":
-            aead = AESGCM(key)
-            return aead.decrypt(nonce, data, aad)
-        if self.name == "XChaCha20-Poly1305":
-            if nacl_bindings is None:
-                raise RuntimeError("PyNaCl is required for XChaCha20-Poly1305 support")
-            return nacl_bindings.crypto_aead_xchacha20poly1305_ietf_decrypt(None, data, aad, nonce, key)
-        raise ValueError(f"Unsupported AEAD suite: {self.name}")
+@dataclass(slots=True)
+class Record:
+    """One sealed record.
 
+    On the wire a record is a fixed 24-byte header followed by the
+    variable-length parts::
+
+        suite_id (2) || nonce_len (1) || reserved (1) || sid (4) || seq (8) ||
+        aad_len (4) || ct_len (4) || nonce || commitment (32) || aad || ct
+
+    All integers are big-endian, ``suite_id`` is :data:`RECORD_SUITE_ID` and
+    ``sid`` is the stream id (``0`` outside :mod:`tricrown.mux`).  Records
+    decoded with :meth:`from_buffer` hold :class:`memoryview` slices of the
+    source buffer.
+    """
 
-@dataclass
-class Record:
     sequence: int
     nonce: bytes
     ciphertext: bytes
     commitment: bytes
     aad: bytes
+    stream_id: int = 0
+
+    def wire_size(self) -> int:
+        return _RECORD_HEADER.size + len(self.nonce) + COMMITMENT_LENGTH + len(self.aad) + len(self.ciphertext)
+
+    def to_bytes(self) -> bytes:
+        if len(self.commitment) != COMMITMENT_LENGTH:
+            raise ValueError("record commitment must be 32 bytes")
+        header = _RECORD_HEADER.pack(
+            RECORD_SUITE_ID,
+            len(self.nonce),
+            0,
+            self.stream_id,
+            self.sequence,
+            len(self.aad),
+            len(self.ciphertext),
+        )
+        return b"".join((header, self.nonce, self.commitment, self.aad, self.ciphertext))
+
+    @classmethod
+    def from_buffer(cls, buffer: bytes | bytearray | memoryview) -> "Record":
+        """Parse exactly one encoded record without copying its fields."""
+
+        view = memoryview(buffer)
+        record, end = _parse_record(view, 0)
+        if end != len(view):
+            raise ValueError("record length does not match its header")
+        return record
+
+
+def _parse_record(view: memoryview, offset: int) -> tuple[Record, int]:
+    if len(view) - offset < _RECORD_HEADER.size:
+        raise ValueError("truncated record header")
+    suite_id, nonce_len, reserved, stream_id, sequence, aad_len, ct_len = _RECORD_HEADER.unpack_from(view, offset)
+    if suite_id != RECORD_SUITE_ID:
+        raise ValueError(f"unsupported record suite: {suite_id:#06x}")
+    if reserved:
+        raise ValueError("reserved header bits set")
+    nonce_at = offset + _RECORD_HEADER.size
+    commit_at = nonce_at + nonce_len
+    aad_at = commit_at + COMMITMENT_LENGTH
+    ct_at = aad_at + aad_len
+    end = ct_at + ct_len
+    if end > len(view):
+        raise ValueError("record overruns buffer")
+    # Positional arguments: this is the per-record hot path of the decoder.
+    record = Record(
+        sequence, view[nonce_at:commit_at], view[ct_at:end], view[commit_at:aad_at], view[aad_at:ct_at], stream_id
+    )
+    return record, end
+
+
+def iter_records(buffer: bytes | bytearray | memoryview) -> Iterator[Record]:
+    """Yield the records of a buffer holding back-to-back encoded records."""
+
+    view = memoryview(buffer)
+    offset = 0
+    while offset < len(view):
+        record, offset = _parse_record(view, offset)
+        yield record
+
+
+@dataclass
+class RecordBatch:
+    """Packed container for a run of consecutive records.
+
+    Nonces and commitments are fixed width and stored back to back.
+    Ciphertexts and associated data are variable width, so each lives in a
+    single buffer indexed by an ``offsets`` array with ``len(batch) + 1``
+    entries.  Indexing the batch yields ordinary :class:`Record` objects.
+    """
+
+    first_sequence: int
+    nonce_length: int
+    nonces: bytes
+    commitments: bytes
+    ciphertexts: bytes
+    ciphertext_offsets: array
+    aads: bytes
+    aad_offsets: array
+
+    COMMITMENT_LENGTH = COMMITMENT_LENGTH
+
+    @classmethod
+    def pack(cls, records: Sequence[Record], *, nonce_length: int) -> "RecordBatch":
+        ct_offsets = array("Q", [0])
+        aad_offsets = array("Q", [0])
+        for record in records:
+            ct_offsets.append(ct_offsets[-1] + len(record.ciphertext))
+            aad_offsets.append(aad_offsets[-1] + len(record.aad))
+        return cls(
+            first_sequence=records[0].sequence if records else 0,
+            nonce_length=nonce_length,
+            nonces=b"".join(record.nonce for record in records),
+            commitments=b"".join(record.commitment for record in records),
+            ciphertexts=b"".join(record.ciphertext for record in records),
+            ciphertext_offsets=ct_offsets,
+            aads=b"".join(record.aad for record in records),
+            aad_offsets=aad_offsets,
+        )
+
+    def __len__(self) -> int:
+        return len(self.ciphertext_offsets) - 1
+
+    def __getitem__(self, index: int) -> Record:
+        count = len(self)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("record index out of range")
+        n_len = self.nonce_length
+        c_len = self.COMMITMENT_LENGTH
+        return Record(
+            sequence=self.first_sequence + index,
+            nonce=self.nonces[index * n_len : (index + 1) * n_len],
+            ciphertext=self.ciphertexts[self.ciphertext_offsets[index] : self.ciphertext_offsets[index + 1]],
+            commitment=self.commitments[index * c_len : (index + 1) * c_len],
+            aad=self.aads[self.aad_offsets[index] : self.aad_offsets[index + 1]],
+        )
+
+    def __iter__(self) -> Iterator[Record]:
+        for index in range(len(self)):
+            yield self[index]
 
 
 @dataclass
 class TriCrownSession:
-    """Holds the derived secrets and provides record layer helpers."""
+    """Holds the derived secrets and provides record layer helpers.
+
+    By default :meth:`open` only accepts the next record in sequence.  Setting
+    ``receive_window`` to a positive value enables out-of-order delivery: the
+    receive chain may ratchet up to ``receive_window`` records ahead, message
+    keys for skipped sequence numbers are kept in a cache bounded by
+    ``max_skipped_keys`` (oldest evicted first), and a sliding bitmap of the
+    last ``receive_window`` sequence numbers rejects replays.  In that mode
+    ``received_messages`` is the position of the receive chain, i.e. one past
+    the highest sequence number opened so far.
+    """
 
     role: str
     session_id: bytes
@@ -159,8 +327,15 @@ class TriCrownSession:
     last_refresh_at: float = field(default_factory=lambda: time.time())
     sent_messages: int = 0
     received_messages: int = 0
+    receive_window: int = 0
+    max_skipped_keys: int = 1024
+    skipped_key_evictions: int = field(default=0, init=False)
+    _skipped_keys: "OrderedDict[int, bytes]" = field(default_factory=OrderedDict, init=False, repr=False)
+    _replay_top: int = field(default=0, init=False, repr=False)
+    _replay_bits: int = field(default=0, init=False, repr=False)
 
     def seal(self, plaintext: bytes, *, aad: bytes = b"") -> Record:
+        started = time.perf_counter() if METRICS.enabled else None
         sequence = self.sent_messages
         nonce_len = self.aead_backend.nonce_length()
         current_ck = self.chains.ck_s
@@ -177,9 +352,18 @@ class TriCrownSession:
             ciphertext=ciphertext,
         )
         self.sent_messages += 1
+        if started is not None:
+            _observe_records("sealed", started, 1, len(plaintext))
         return Record(sequence=sequence, nonce=nonce, ciphertext=ciphertext, commitment=commitment, aad=aad)
 
     def open(self, record: Record) -> bytes:
+        started = time.perf_counter() if METRICS.enabled else None
+        plaintext = self._open_windowed(record) if self.receive_window else self._open_next(record)
+        if started is not None:
+            _observe_records("opened", started, 1, len(plaintext))
+        return plaintext
+
+    def _open_next(self, record: Record) -> bytes:
         if record.sequence != self.received_messages:
             raise ValueError("out-of-order record")
         current_ck = self.chains.ck_r
@@ -200,6 +384,258 @@ class TriCrownSession:
         self.received_messages += 1
         return plaintext
 
+    def seal_many(self, plaintexts: Sequence[bytes], aads: Sequence[bytes] | None = None) -> RecordBatch:
+        """Seal a batch of plaintexts in one pass over the send chain.
+
+        The records are byte-identical to calling :meth:`seal` for each
+        plaintext in order.  The chain ratchet is walked once for the whole
+        batch and the commitment prefix is hashed once and copied per record.
+        """
+
+        count = len(plaintexts)
+        if aads is None:
+            aads = [b""] * count
+        elif len(aads) != count:
+            raise ValueError("plaintexts and aads must have the same length")
+        started = time.perf_counter() if METRICS.enabled else None
+        first_sequence = self.sent_messages
+        nonce_len = self.aead_backend.nonce_length()
+        keys, next_ck = ratchet_batch(
+            self.chains.ck_s, first_sequence=first_sequence, count=count, nonce_length=nonce_len
+        )
+        prefix = commit_prefix(self.chains.k_commit, session_id=self.session_id)
+        records: List[Record] = []
+        for offset, ((nonce, message_key), plaintext, aad) in enumerate(zip(keys, plaintexts, aads)):
+            sequence = first_sequence + offset
+            ciphertext = self.aead_backend.encrypt(message_key, nonce, plaintext, aad)
+            commitment = commit_tag_from_prefix(
+                prefix, sequence=sequence, nonce=nonce, aad=aad, ciphertext=ciphertext
+            )
+            records.append(Record(sequence=sequence, nonce=nonce, ciphertext=ciphertext, commitment=commitment, aad=aad))
+        self.chains.ck_s = next_ck
+        self.sent_messages += count
+        if started is not None:
+            _observe_records("sealed", started, count, sum(len(plaintext) for plaintext in plaintexts))
+        return RecordBatch.pack(records, nonce_length=nonce_len)
+
+    def open_many(self, records: RecordBatch | Iterable[Record]) -> List[bytes]:
+        """Open a run of consecutive records and return their plaintexts.
+
+        The batch is all-or-nothing: if any record fails its commitment or
+        AEAD check the receive chain is left untouched.  With a
+        ``receive_window`` each record goes through the same replay, window
+        and skipped-key checks as :meth:`open`, so the records need not be
+        consecutive.
+        """
+
+        started = time.perf_counter() if METRICS.enabled else None
+        batch = list(records)
+        if self.receive_window:
+            plaintexts = self._open_many_windowed(batch)
+            if started is not None:
+                _observe_records("opened", started, len(batch), sum(len(plaintext) for plaintext in plaintexts))
+            return plaintexts
+        first_sequence = self.received_messages
+        for offset, record in enumerate(batch):
+            if record.sequence != first_sequence + offset:
+                raise ValueError("out-of-order record")
+        nonce_len = self.aead_backend.nonce_length()
+        keys, next_ck = ratchet_batch(
+            self.chains.ck_r, first_sequence=first_sequence, count=len(batch), nonce_length=nonce_len
+        )
+        prefix = commit_prefix(self.chains.k_commit, session_id=self.session_id)
+        plaintexts: List[bytes] = []
+        for record, (_, message_key) in zip(batch, keys):
+            expected_commit = commit_tag_from_prefix(
+                prefix,
+                sequence=record.sequence,
+                nonce=record.nonce,
+                aad=record.aad,
+                ciphertext=record.ciphertext,
+            )
+            if not compare_digest(expected_commit, record.commitment):
+                raise ValueError("commitment mismatch")
+            plaintexts.append(self.aead_backend.decrypt(message_key, record.nonce, record.ciphertext, record.aad))
+        self.chains.ck_r = next_ck
+        self.received_messages += len(batch)
+        if started is not None:
+            _observe_records("opened", started, len(batch), sum(len(plaintext) for plaintext in plaintexts))
+        return plaintexts
+
+    def seal_stream(
+        self,
+        reader: BinaryIO,
+        writer: BinaryIO,
+        *,
+        chunk_size: int = DEFAULT_STREAM_CHUNK_SIZE,
+        aad: bytes = b"",
+    ) -> int:
+        """Seal everything readable from ``reader`` as a run of framed records.
+
+        The input is cut into ``chunk_size`` pieces, each sealed as one record
+        consuming one send sequence number, and written to ``writer`` with
+        :meth:`Record.to_bytes`, so the output can also be walked with
+        :func:`iter_records`.  Each record's associated data is
+        ``"TRICROWN stream" || flags || aad`` and the last record carries
+        :data:`STREAM_FINAL` in ``flags``, so truncating the stream or moving
+        the marker is detected by :meth:`open_stream`.  Two
+        ``chunk_size`` buffers are reused for the whole stream, so memory use
+        does not grow with the input size.  Returns the number of records.
+        """
+
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        buffers = (bytearray(chunk_size), bytearray(chunk_size))
+        views = (memoryview(buffers[0]), memoryview(buffers[1]))
+        current = 0
+        length = _read_into(reader, views[current])
+        records = 0
+        while True:
+            # Read one chunk ahead so the final record can be flagged even
+            # when the input length is an exact multiple of ``chunk_size``.
+            following = 1 - current
+            next_length = _read_into(reader, views[following]) if length == chunk_size else 0
+            flags = STREAM_FINAL if next_length == 0 else 0
+            record = self.seal(views[current][:length], aad=_stream_aad(flags, aad))
+            writer.write(record.to_bytes())
+            records += 1
+            if flags & STREAM_FINAL:
+                return records
+            current, length = following, next_length
+
+    def open_stream(
+        self,
+        reader: BinaryIO,
+        writer: BinaryIO,
+        *,
+        aad: bytes = b"",
+        max_chunk_size: int = DEFAULT_MAX_STREAM_CHUNK_SIZE,
+    ) -> int:
+        """Open a stream produced by :meth:`seal_stream` and write the plaintext.
+
+        Records are read and verified one at a time into a reused buffer.
+        Raises :class:`ValueError` if the input ends before the final record,
+        if a record announces more than ``max_chunk_size`` bytes or carries
+        different associated data, or on any commitment or AEAD failure.
+        Returns the number of plaintext bytes.
+        """
+
+        nonce_len = self.aead_backend.nonce_length()
+        aad_len = len(_STREAM_AAD) + 1 + len(aad)
+        flags_at = len(_STREAM_AAD)
+        header = memoryview(bytearray(_RECORD_HEADER.size))
+        frame = bytearray()
+        total = 0
+        while True:
+            if _read_into(reader, header) != len(header):
+                raise ValueError("truncated record stream")
+            _, record_nonce_len, _, _, _, record_aad_len, ct_len = _RECORD_HEADER.unpack_from(header)
+            if record_nonce_len != nonce_len or record_aad_len != aad_len:
+                raise ValueError("stream record does not match this session")
+            if ct_len > max_chunk_size + _AEAD_TAG_LENGTH:
+                raise ValueError(f"stream record of {ct_len} bytes exceeds max_chunk_size")
+            end = len(header) + nonce_len + COMMITMENT_LENGTH + aad_len + ct_len
+            if len(frame) < end:
+                frame = bytearray(end)
+            view = memoryview(frame)[:end]
+            view[: len(header)] = header
+            if _read_into(reader, view[len(header) :]) != end - len(header):
+                raise ValueError("truncated record stream")
+            record = Record.from_buffer(view)
+            flags = record.aad[flags_at]
+            if record.aad[:flags_at] != _STREAM_AAD or record.aad[flags_at + 1 :] != aad:
+                raise ValueError("stream record does not match this session")
+            plaintext = self.open(record)
+            writer.write(plaintext)
+            total += len(plaintext)
+            if flags & STREAM_FINAL:
+                return total
+
+    def _open_windowed(self, record: Record) -> bytes:
+        sequence = record.sequence
+        self._check_replay(sequence)
+        if sequence - self.received_messages >= self.receive_window:
+            raise ValueError("record too far ahead of the receive chain")
+        expected_commit = commit_tag(
+            self.chains.k_commit,
+            session_id=self.session_id,
+            sequence=sequence,
+            nonce=record.nonce,
+            aad=record.aad,
+            ciphertext=record.ciphertext,
+        )
+        if not compare_digest(expected_commit, record.commitment):
+            raise ValueError("commitment mismatch")
+
+        if sequence < self.received_messages:
+            message_key = self._skipped_keys.get(sequence)
+            if message_key is None:
+                raise ValueError("skipped message key expired")
+            plaintext = self.aead_backend.decrypt(message_key, record.nonce, record.ciphertext, record.aad)
+            del self._skipped_keys[sequence]
+        else:
+            first_sequence = self.received_messages
+            keys, next_ck = ratchet_batch(
+                self.chains.ck_r,
+                first_sequence=first_sequence,
+                count=sequence - first_sequence + 1,
+                nonce_length=self.aead_backend.nonce_length(),
+            )
+            message_key = keys[-1][1]
+            plaintext = self.aead_backend.decrypt(message_key, record.nonce, record.ciphertext, record.aad)
+            for offset, (_, skipped_key) in enumerate(keys[:-1]):
+                self._store_skipped_key(first_sequence + offset, skipped_key)
+            self.chains.ck_r = next_ck
+            self.received_messages = sequence + 1
+        self._mark_received(sequence)
+        return plaintext
+
+    def _open_many_windowed(self, batch: List[Record]) -> List[bytes]:
+        saved = (
+            self.chains.ck_r,
+            self.received_messages,
+            OrderedDict(self._skipped_keys),
+            self.skipped_key_evictions,
+            self._replay_top,
+            self._replay_bits,
+        )
+        try:
+            return [self._open_windowed(record) for record in batch]
+        except BaseException:
+            (
+                self.chains.ck_r,
+                self.received_messages,
+                self._skipped_keys,
+                self.skipped_key_evictions,
+                self._replay_top,
+                self._replay_bits,
+            ) = saved
+            raise
+
+    def _store_skipped_key(self, sequence: int, message_key: bytes) -> None:
+        self._skipped_keys[sequence] = message_key
+        while len(self._skipped_keys) > self.max_skipped_keys:
+            self._skipped_keys.popitem(last=False)
+            self.skipped_key_evictions += 1
+
+    def _check_replay(self, sequence: int) -> None:
+        if sequence >= self._replay_top:
+            return
+        age = self._replay_top - 1 - sequence
+        if age >= self.receive_window:
+            raise ValueError("record outside the replay window")
+        if (self._replay_bits >> age) & 1:
+            raise ValueError("replayed record")
+
+    def _mark_received(self, sequence: int) -> None:
+        if sequence >= self._replay_top:
+            shift = sequence + 1 - self._replay_top
+            mask = (1 << self.receive_window) - 1
+            self._replay_bits = ((self._replay_bits << shift) | 1) & mask
+            self._replay_top = sequence + 1
+        else:
+            self._replay_bits |= 1 << (self._replay_top - 1 - sequence)
+
     def needs_refresh(self) -> bool:
         if self.sent_messages >= self.refresh_interval_messages:
             return True
@@ -211,22 +647,49 @@ class TriCrownSession:
         self.sent_messages = 0
         self.received_messages = 0
         self.last_refresh_at = time.time()
+        self._skipped_keys.clear()
+        self._replay_top = 0
+        self._replay_bits = 0
 
     def rekey(self, *, new_secrets: Sequence[bytes], transcript: bytes | None = None) -> None:
-        th = transcript or self.transcript
-        mix_input = [self.chains.rk] + list(new_secrets)
-        mix = mix_shared_secrets(transcript=th, shared_secrets=mix_input)
-        material = crypto.hkdf_expand(mix, params=HKDFParams(info=b"TRICROWN refresh" + self.role.encode(), length=128))
-        rk = material[:32]
-        ck_a = material[32:64]
-        ck_b = material[64:96]
-        k_commit = material[96:128]
-        if self.role == "client":
-            ck_s, ck_r = ck_a, ck_b
+        with METRICS.phase("rekey"):
+            th = transcript or self.transcript
+            mix_input = [self.chains.rk] + list(new_secrets)
+            mix = mix_shared_secrets(transcript=th, shared_secrets=mix_input)
+            material = crypto.hkdf_expand(mix, params=HKDFParams(info=b"TRICROWN refresh", length=128))
+            self.chains = _split_material(material, self.role)
+            self.update_after_refresh()
+        if METRICS.enabled:
+            METRICS.count("rekeys")
+
+
+def _read_into(reader: BinaryIO, view: memoryview) -> int:
+    """Fill ``view`` from ``reader``; a short count means end of input."""
+
+    filled = 0
+    size = len(view)
+    readinto = getattr(reader, "readinto", None)
+    while filled < size:
+        if readinto is not None:
+            count = readinto(view[filled:])
         else:
-            ck_s, ck_r = ck_b, ck_a
-        self.chains = Chains(rk=rk, ck_s=ck_s, ck_r=ck_r, k_commit=k_commit)
-        self.update_after_refresh()
+            chunk = reader.read(size - filled)
+            count = len(chunk)
+            view[filled : filled + count] = chunk
+        if not count:
+            break
+        filled += count
+    return filled
+
+
+def _stream_aad(flags: int, aad: bytes) -> bytes:
+    return _STREAM_AAD + bytes((flags,)) + aad
+
+
+def _observe_records(direction: str, started: float, records: int, size: int) -> None:
+    METRICS.record_time("record.seal" if direction == "sealed" else "record.open", time.perf_counter() - started)
+    METRICS.count(f"records.{direction}", records)
+    METRICS.count(f"bytes.{direction}", size)
 
 
 @dataclass
@@ -238,110 +701,214 @@ class HandshakeResult:
     shared_secrets: Sequence[bytes]
 
 
-def perform_handshake(client: TriCrownParty, server: TriCrownParty, *, aead: str = "AES-256-GCM-SIV") -> tuple[HandshakeResult, HandshakeResult]:
-    """Execute the reference handshake and return fully initialised sessions."""
-
-    session_id = os.urandom(16)
-    messages: List[bytes] = []
-
-    client_hello = client._hello_payload()
-    server_hello = server._hello_payload()
-    messages.append(_json_dumps({"client_hello": client_hello}))
-    messages.append(_json_dumps({"server_hello": server_hello}))
-
-    # shared secrets from the client's encapsulation step
-    ct_ml_c, ss_ml_c = client.kem_ml.encapsulate(bytes.fromhex(server_hello["kem_ml"]))
-    ct_mce_c, ss_mce_c = client.kem_mce.encapsulate(bytes.fromhex(server_hello["kem_mce"]))
-    ss_x = client.x25519_private.exchange(x25519.X25519PublicKey.from_public_bytes(bytes.fromhex(server_hello["x25519"])))
-
-    client_enc = {
-        "ct_ml_c": ct_ml_c.hex(),
-        "ct_mce_c": ct_mce_c.hex(),
-    }
-    messages.append(_json_dumps({"client_encaps": client_enc}))
-
-    # server decapsulates and optionally reciprocates with its own encapsulations
-    ss_ml_c_server = server.kem_ml.decapsulate(ct_ml_c)
-    ss_mce_c_server = server.kem_mce.decapsulate(ct_mce_c)
-    ss_x_server = server.x25519_private.exchange(x25519.X25519PublicKey.from_public_bytes(bytes.fromhex(client_hello["x25519"])))
-
-    if server.encapsulate_back:
-        ct_ml_s, ss_ml_s = server.kem_ml.encapsulate(bytes.fromhex(client_hello["kem_ml"]))
-        ct_mce_s, ss_mce_s = server.kem_mce.encapsulate(bytes.fromhex(client_hello["kem_mce"]))
-        server_enc = {
-            "ct_ml_s": ct_ml_s.hex(),
-            "ct_mce_s": ct_mce_s.hex(),
-        }
-        messages.append(_json_dumps({"server_encaps": server_enc}))
+def _split_material(material: bytes, role: str) -> Chains:
+    rk = material[:32]
+    ck_a = material[32:64]
+    ck_b = material[64:96]
+    k_commit = material[96:128]
+    if role == "client":
+        ck_s, ck_r = ck_a, ck_b
     else:
-        ss_ml_s = ss_mce_s = b""
-        server_enc = None
-
-    # Authentication step: sign the current transcript hash
-    th2 = transcript_hash(messages)
-    client_sig = client.signature.sign(th2)
-    server_sig = server.signature.sign(th2)
-    if not StubSignatureKeypair.verify(bytes.fromhex(client_hello["sig_pk"]), th2, client_sig):
-        raise ValueError("client signature self-check failed")
-    if not StubSignatureKeypair.verify(bytes.fromhex(server_hello["sig_pk"]), th2, server_sig):
-        raise ValueError("server signature self-check failed")
-    messages.append(_json_dumps({"client_sig": client_sig.hex()}))
-    messages.append(_json_dumps({"server_sig": server_sig.hex()}))
-
-    th_final = transcript_hash(messages)
-    s_math = compute_audit_salt(messages)
-
-    # Each side collects secrets in the same order
-    ss_order_client: List[bytes] = [ss_ml_c, ss_mce_c, ss_x]
-    ss_order_server: List[bytes] = [ss_ml_c_server, ss_mce_c_server, ss_x_server]
-    if server_enc is not None:
-        ss_order_client.extend([ss_ml_s, ss_mce_s])
-        ss_order_server.extend([ss_ml_s, ss_mce_s])
-    ss_order_client.append(s_math)
-    ss_order_server.append(s_math)
-
-    mix_client = mix_shared_secrets(transcript=th_final, shared_secrets=ss_order_client)
-    mix_server = mix_shared_secrets(transcript=th_final, shared_secrets=ss_order_server)
-
-    hs_info = b"TRICROWN hs"
-    material_client = crypto.hkdf_expand(mix_client, params=HKDFParams(info=hs_info + b"client", length=128))
-    material_server = crypto.hkdf_expand(mix_server, params=HKDFParams(info=hs_info + b"server", length=128))
-
-    def split_material(material: bytes, role: str) -> Chains:
-        rk = material[:32]
-        ck_a = material[32:64]
-        ck_b = material[64:96]
-        k_commit = material[96:128]
-        if role == "client":
-            ck_s, ck_r = ck_a, ck_b
+        ck_s, ck_r = ck_b, ck_a
+    return Chains(rk=rk, ck_s=ck_s, ck_r=ck_r, k_commit=k_commit)
+
+
+class _HandshakeState:
+    """State shared by both ends of a TRI-CROWN handshake.
+
+    Each message passed in or out is an encoded frame from the selected
+    :mod:`tricrown.wire` codec and is absorbed into the running transcript
+    exactly once.  Shared secrets are collected in the canonical order
+    ``ss_ML_c, ss_McE_c, ss_X [, ss_ML_s, ss_McE_s]``.
+    """
+
+    role = ""
+    peer_role = ""
+
+    def __init__(
+        self,
+        party: TriCrownParty,
+        *,
+        aead: str = "AES-256-GCM-SIV",
+        wire: str = "json",
+        audit_salt_version: int = 1,
+    ) -> None:
+        if audit_salt_version not in AUDIT_SALT_VERSIONS:
+            raise ValueError(f"Unsupported audit salt version: {audit_salt_version}")
+        self.party = party
+        self.aead = aead
+        self.codec = get_codec(wire)
+        self.audit_salt_version = audit_salt_version
+        self.transcript = Transcript(track_histograms=audit_salt_version >= 2)
+        self.shared_secrets: List[bytes] = []
+        self.peer_hello: HelloFields | None = None
+        self._th2: bytes | None = None
+        self._own_sig_frame: bytes | None = None
+
+    def _peer_x25519(self) -> x25519.X25519PublicKey:
+        return x25519.X25519PublicKey.from_public_bytes(bytes(self.peer_hello.x25519))
+
+    def signature(self) -> bytes:
+        """Sign the transcript up to the encapsulations and return our frame."""
+
+        self._th2 = self.transcript.digest()
+        with METRICS.phase("handshake.sign"):
+            signature = self.party.signature.sign(self._th2)
+        self._own_sig_frame = self.codec.encode_signature(self.role, signature)
+        return self._own_sig_frame
+
+    def finish(self, peer_sig_frame: bytes) -> HandshakeResult:
+        """Verify the peer signature and derive the session."""
+
+        if self._own_sig_frame is None or self.peer_hello is None:
+            raise RuntimeError("handshake is not ready to finish")
+        peer_sig = bytes(self.codec.decode_signature(peer_sig_frame))
+        with METRICS.phase("handshake.verify"):
+            verified = StubSignatureKeypair.verify(bytes(self.peer_hello.sig_pk), self._th2, peer_sig)
+        if not verified:
+            raise ValueError(f"{self.peer_role} signature verification failed")
+        if self.role == "client":
+            self.transcript.absorb(self._own_sig_frame)
+            self.transcript.absorb(peer_sig_frame)
         else:
-            ck_s, ck_r = ck_b, ck_a
-        return Chains(rk=rk, ck_s=ck_s, ck_r=ck_r, k_commit=k_commit)
+            self.transcript.absorb(peer_sig_frame)
+            self.transcript.absorb(self._own_sig_frame)
+
+        th_final = self.transcript.digest()
+        with METRICS.phase("audit_salt"):
+            s_math = audit_salt_from_stats(self.transcript.stats, version=self.audit_salt_version)
+        shared_secrets = tuple(self.shared_secrets) + (s_math,)
+        with METRICS.phase("handshake.derive"):
+            mix = mix_shared_secrets(transcript=th_final, shared_secrets=shared_secrets)
+            # Both sides expand with the same info so that the client's send
+            # chain is the server's receive chain; ``_split_material`` swaps.
+            material = crypto.hkdf_expand(mix, params=HKDFParams(info=b"TRICROWN hs", length=128))
+            session_id = crypto.hkdf_expand(mix, params=HKDFParams(info=b"TRICROWN sid", length=16))
+        if METRICS.enabled:
+            METRICS.count("handshakes")
+        session = TriCrownSession(
+            role=self.role,
+            session_id=session_id,
+            transcript=th_final,
+            chains=_split_material(material, self.role),
+            aead_backend=AEADBackend(self.aead),
+        )
+        return HandshakeResult(session=session, transcript=th_final, shared_secrets=shared_secrets)
 
-    chains_client = split_material(material_client, "client")
-    chains_server = split_material(material_server, "server")
 
-    aead_backend = AEADBackend(aead)
+class ClientHandshake(_HandshakeState):
+    """Client side of the handshake, driven one frame at a time.
 
-    client_session = TriCrownSession(
-        role="client",
-        session_id=session_id,
-        transcript=th_final,
-        chains=chains_client,
-        aead_backend=aead_backend,
-    )
-    server_session = TriCrownSession(
-        role="server",
-        session_id=session_id,
-        transcript=th_final,
-        chains=chains_server,
-        aead_backend=aead_backend,
-    )
+    The flow is ``hello`` → ``handle_server_hello`` → (optionally)
+    ``handle_server_encaps`` → ``signature`` → ``finish``.
+    """
 
-    client_shared = tuple(ss_order_client)
-    server_shared = tuple(ss_order_server)
+    role = "client"
+    peer_role = "server"
 
-    return (
-        HandshakeResult(session=client_session, transcript=th_final, shared_secrets=client_shared),
-        HandshakeResult(session=server_session, transcript=th_final, shared_secrets=server_shared),
-    )
+    def hello(self) -> bytes:
+        frame = self.codec.encode_hello(self.party.hello_fields())
+        self.transcript.absorb(frame)
+        return frame
+
+    def handle_server_hello(self, frame: bytes) -> bytes:
+        """Consume the ServerHello and return the client encapsulation frame."""
+
+        self.transcript.absorb(frame)
+        self.peer_hello = self.codec.decode_hello(frame)
+        with METRICS.phase("handshake.kem_encapsulate"):
+            ct_ml, ss_ml = self.party.kem_ml.encapsulate(self.peer_hello.kem_ml)
+            ct_mce, ss_mce = self.party.kem_mce.encapsulate(self.peer_hello.kem_mce)
+        with METRICS.phase("handshake.x25519"):
+            ss_x = self.party.x25519_private.exchange(self._peer_x25519())
+        self.shared_secrets = [ss_ml, ss_mce, ss_x]
+        encaps = self.codec.encode_encaps("client", ct_ml, ct_mce)
+        self.transcript.absorb(encaps)
+        return encaps
+
+    def handle_server_encaps(self, frame: bytes) -> None:
+        """Decapsulate the server's reciprocal encapsulations."""
+
+        self.transcript.absorb(frame)
+        ct_ml, ct_mce = self.codec.decode_encaps(frame)
+        with METRICS.phase("handshake.kem_decapsulate"):
+            self.shared_secrets.append(self.party.kem_ml.decapsulate(bytes(ct_ml)))
+            self.shared_secrets.append(self.party.kem_mce.decapsulate(bytes(ct_mce)))
+
+
+class ServerHandshake(_HandshakeState):
+    """Server side of the handshake, driven one frame at a time.
+
+    The flow is ``handle_client_hello`` → ``handle_client_encaps`` →
+    ``signature`` → ``finish``.
+    """
+
+    role = "server"
+    peer_role = "client"
+
+    def handle_client_hello(self, frame: bytes) -> bytes:
+        """Consume the ClientHello and return the ServerHello frame."""
+
+        self.transcript.absorb(frame)
+        self.peer_hello = self.codec.decode_hello(frame)
+        hello = self.codec.encode_hello(self.party.hello_fields())
+        self.transcript.absorb(hello)
+        return hello
+
+    def handle_client_encaps(self, frame: bytes) -> bytes | None:
+        """Decapsulate the client's ciphertexts.
+
+        Returns the server encapsulation frame when the party reciprocates
+        (``encapsulate_back``), otherwise ``None``.
+        """
+
+        self.transcript.absorb(frame)
+        ct_ml, ct_mce = self.codec.decode_encaps(frame)
+        with METRICS.phase("handshake.kem_decapsulate"):
+            self.shared_secrets = [
+                self.party.kem_ml.decapsulate(bytes(ct_ml)),
+                self.party.kem_mce.decapsulate(bytes(ct_mce)),
+            ]
+        with METRICS.phase("handshake.x25519"):
+            self.shared_secrets.append(self.party.x25519_private.exchange(self._peer_x25519()))
+        if not self.party.encapsulate_back:
+            return None
+        with METRICS.phase("handshake.kem_encapsulate"):
+            ct_ml_s, ss_ml_s = self.party.kem_ml.encapsulate(self.peer_hello.kem_ml)
+            ct_mce_s, ss_mce_s = self.party.kem_mce.encapsulate(self.peer_hello.kem_mce)
+        self.shared_secrets.extend([ss_ml_s, ss_mce_s])
+        encaps = self.codec.encode_encaps("server", ct_ml_s, ct_mce_s)
+        self.transcript.absorb(encaps)
+        return encaps
+
+
+def perform_handshake(
+    client: TriCrownParty,
+    server: TriCrownParty,
+    *,
+    aead: str = "AES-256-GCM-SIV",
+    wire: str = "json",
+    audit_salt_version: int = 1,
+) -> tuple[HandshakeResult, HandshakeResult]:
+    """Execute the reference handshake and return fully initialised sessions.
+
+    The two parties are driven through :class:`ClientHandshake` and
+    :class:`ServerHandshake` in-process.  ``wire`` selects the handshake
+    message codec from :mod:`tricrown.wire`; each side only reads its peer's
+    values back out of the encoded frames, so the codec is exercised exactly
+    as it would be over a real transport.  ``audit_salt_version`` selects the
+    ``s_math`` derivation.
+    """
+
+    options = dict(aead=aead, wire=wire, audit_salt_version=audit_salt_version)
+    client_hs = ClientHandshake(client, **options)
+    server_hs = ServerHandshake(server, **options)
+
+    server_hello = server_hs.handle_client_hello(client_hs.hello())
+    server_encaps = server_hs.handle_client_encaps(client_hs.handle_server_hello(server_hello))
+    if server_encaps is not None:
+        client_hs.handle_server_encaps(server_encaps)
+
+    client_sig = client_hs.signature()
+    server_sig = server_hs.signature()
+    return client_hs.finish(server_sig), server_hs.finish(client_sig)
@@ -0,0 +1,305 @@
+"""Sharded server-side table of established sessions.
+
+A server terminating many clients would otherwise keep a dict of
+:class:`~tricrown.session.TriCrownSession` objects, each with its own
+``__dict__``, :class:`~tricrown.session.Chains` object and boxed floats, and
+nothing that ages idle sessions out.  :class:`SessionTable` instead packs the
+state of every session into a single ``bytearray``::
+
+    sent (8) || received (8) || last_refresh_at (8) || created (8) ||
+    last_used (8) || refresh_interval_messages (4) ||
+    refresh_interval_seconds (4) || role (1) || aead (1) ||
+    rk, ck_s, ck_r, k_commit, transcript lengths (5 x 1) ||
+    rk || ck_s || ck_r || k_commit || transcript
+
+keyed by ``session_id`` in one of ``shards`` lock-striped ordered dicts.
+Lookups are O(1); each shard keeps its entries in least-recently-used
+order, so idle eviction only ever inspects the front of a shard.
+
+Sessions are used through :meth:`SessionTable.checkout`, which hands out
+exclusive access to one entry and writes the advanced chain state back when
+the ``with`` block exits.  A second checkout of the same ``session_id``
+waits until the first is returned, so two callers can never seal from the
+same counter and reuse a nonce under one chain key.
+
+Sessions are evicted once they are older than ``ttl`` seconds or unused for
+``idle_timeout`` seconds.  Expiry is checked on every checkout; call
+:meth:`SessionTable.evict_expired` periodically to reclaim idle entries
+that are never looked up again.
+
+Only strict-order sessions are stored: out-of-order receive state
+(``receive_window``) does not fit the packed layout.  Measured with
+``examples/bench_session_table.py`` on CPython 3.11, one million
+sessions occupy about 440 bytes each (419 MiB in total) including keys and
+shard overhead, against about 890 bytes each (847 MiB) for a plain dict of
+``TriCrownSession`` objects.
+"""
+
+from __future__ import annotations
+
+import struct
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterator, List, Optional
+
+from .aead import AEADBackend
+from .session import Chains, TriCrownSession
+
+_HEADER = struct.Struct("<QQdddIIBB5B")
+# ``created`` and ``last_used`` sit back to back at this offset.
+_TIMES_OFFSET = 24
+_TIMES = struct.Struct("<dd")
+_LAST_USED = struct.Struct("<d")
+_ROLES = ("client", "server")
+
+
+@dataclass(frozen=True)
+class SessionTableStats:
+    """Snapshot of :class:`SessionTable` counters."""
+
+    size: int
+    shards: int
+    expired: int
+    idle_evicted: int
+
+
+class _Shard:
+    __slots__ = ("lock", "returned", "entries", "checked_out")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.returned = threading.Condition(self.lock)
+        self.entries: "OrderedDict[bytes, bytearray]" = OrderedDict()
+        # Entries currently checked out, moved out of ``entries`` so that
+        # eviction never sees them.
+        self.checked_out: Dict[bytes, bytearray] = {}
+
+
+class SessionTable:
+    """Compact, lock-striped ``session_id -> session`` map with TTL eviction."""
+
+    def __init__(
+        self,
+        *,
+        shards: int = 64,
+        ttl: float = 24 * 3600.0,
+        idle_timeout: float = 900.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if shards < 1:
+            raise ValueError("shards must be positive")
+        self.ttl = ttl
+        self.idle_timeout = idle_timeout
+        self._clock = clock
+        self._shards = [_Shard() for _ in range(shards)]
+        self._aead_codes: Dict[str, int] = {}
+        self._backends: List[AEADBackend] = []
+        self._codes_lock = threading.Lock()
+        self._stats_lock = threading.Lock()
+        self._expired = 0
+        self._idle_evicted = 0
+
+    def _shard(self, session_id: bytes) -> _Shard:
+        return self._shards[hash(session_id) % len(self._shards)]
+
+    def __len__(self) -> int:
+        return sum(len(shard.entries) + len(shard.checked_out) for shard in self._shards)
+
+    def __contains__(self, session_id: bytes) -> bool:
+        shard = self._shard(session_id)
+        with shard.lock:
+            if session_id in shard.checked_out:
+                return True
+            return self._live_entry(shard, session_id, self._clock()) is not None
+
+    def _aead_code(self, backend: AEADBackend) -> int:
+        code = self._aead_codes.get(backend.name)
+        if code is None:
+            with self._codes_lock:
+                code = self._aead_codes.get(backend.name)
+                if code is None:
+                    if len(self._backends) > 255:
+                        raise ValueError("too many distinct AEAD suites")
+                    code = len(self._backends)
+                    self._backends.append(AEADBackend(backend.name))
+                    self._aead_codes[backend.name] = code
+        return code
+
+    def _pack(self, session: TriCrownSession, created: float, now: float) -> bytearray:
+        if session.receive_window:
+            raise ValueError("SessionTable only stores strict-order sessions")
+        chains = session.chains
+        parts = (chains.rk, chains.ck_s, chains.ck_r, chains.k_commit, session.transcript)
+        header = _HEADER.pack(
+            session.sent_messages,
+            session.received_messages,
+            session.last_refresh_at,
+            created,
+            now,
+            session.refresh_interval_messages,
+            session.refresh_interval_seconds,
+            _ROLES.index(session.role),
+            self._aead_code(session.aead_backend),
+            *(len(part) for part in parts),
+        )
+        return bytearray(header + b"".join(parts))
+
+    def _unpack(self, session_id: bytes, packed: bytearray) -> TriCrownSession:
+        (
+            sent,
+            received,
+            last_refresh_at,
+            _created,
+            _last_used,
+            refresh_messages,
+            refresh_seconds,
+            role,
+            aead,
+            *lengths,
+        ) = _HEADER.unpack_from(packed)
+        values = []
+        offset = _HEADER.size
+        for length in lengths:
+            values.append(bytes(packed[offset : offset + length]))
+            offset += length
+        rk, ck_s, ck_r, k_commit, transcript = values
+        return TriCrownSession(
+            role=_ROLES[role],
+            session_id=session_id,
+            transcript=transcript,
+            chains=Chains(rk=rk, ck_s=ck_s, ck_r=ck_r, k_commit=k_commit),
+            aead_backend=self._backends[aead],
+            refresh_interval_messages=refresh_messages,
+            refresh_interval_seconds=refresh_seconds,
+            last_refresh_at=last_refresh_at,
+            sent_messages=sent,
+            received_messages=received,
+        )
+
+    def _expiry_reason(self, packed: bytearray, now: float) -> Optional[str]:
+        created, last_used = _TIMES.unpack_from(packed, _TIMES_OFFSET)
+        if now - created >= self.ttl:
+            return "ttl"
+        if now - last_used >= self.idle_timeout:
+            return "idle"
+        return None
+
+    def _count(self, reason: str) -> None:
+        with self._stats_lock:
+            if reason == "ttl":
+                self._expired += 1
+            else:
+                self._idle_evicted += 1
+
+    def _live_entry(self, shard: _Shard, session_id: bytes, now: float) -> Optional[bytearray]:
+        """Return the stored entry, evicting it if expired.  Hold ``shard.lock``."""
+
+        packed = shard.entries.get(session_id)
+        if packed is None:
+            return None
+        reason = self._expiry_reason(packed, now)
+        if reason is not None:
+            del shard.entries[session_id]
+            self._count(reason)
+            return None
+        return packed
+
+    def put(self, session: TriCrownSession) -> None:
+        """Store (or replace) ``session`` under its ``session_id``.
+
+        Raises :class:`RuntimeError` while the entry is checked out; update
+        stored sessions through :meth:`checkout` instead.
+        """
+
+        now = self._clock()
+        shard = self._shard(session.session_id)
+        with shard.lock:
+            if session.session_id in shard.checked_out:
+                raise RuntimeError("session is checked out")
+            existing = shard.entries.get(session.session_id)
+            created = _TIMES.unpack_from(existing, _TIMES_OFFSET)[0] if existing is not None else now
+            shard.entries[session.session_id] = self._pack(session, created, now)
+            shard.entries.move_to_end(session.session_id)
+
+    @contextmanager
+    def checkout(self, session_id: bytes, *, timeout: Optional[float] = None) -> Iterator[TriCrownSession]:
+        """Borrow the stored session exclusively for the ``with`` block.
+
+        Waits up to ``timeout`` seconds (forever by default) while another
+        caller holds the same session and raises :class:`TimeoutError` when
+        that runs out.  Raises :class:`KeyError` if the session is absent or
+        expired.  The session's state is written back when the block exits,
+        also on error, so counters advanced by a seal are never rolled back.
+        A session that no longer packs (e.g. one given a ``receive_window``)
+        is left out of the table; the packing error is raised unless the
+        block itself raised.
+        """
+
+        shard = self._shard(session_id)
+        with shard.lock:
+            if not shard.returned.wait_for(lambda: session_id not in shard.checked_out, timeout):
+                raise TimeoutError("session is checked out")
+            now = self._clock()
+            packed = self._live_entry(shard, session_id, now)
+            if packed is None:
+                raise KeyError(session_id)
+            del shard.entries[session_id]
+            shard.checked_out[session_id] = packed
+            created = _TIMES.unpack_from(packed, _TIMES_OFFSET)[0]
+            session = self._unpack(session_id, packed)
+        completed = False
+        try:
+            yield session
+            completed = True
+        finally:
+            with shard.lock:
+                del shard.checked_out[session_id]
+                shard.returned.notify_all()
+                try:
+                    shard.entries[session_id] = self._pack(session, created, self._clock())
+                except Exception:
+                    # Restoring the pre-checkout state would roll back its
+                    # counters, so the entry is dropped instead.
+                    if completed:
+                        raise
+
+    def pop(self, session_id: bytes, *, timeout: Optional[float] = None) -> Optional[TriCrownSession]:
+        """Remove and return the session, waiting for any checkout to end."""
+
+        shard = self._shard(session_id)
+        with shard.lock:
+            if not shard.returned.wait_for(lambda: session_id not in shard.checked_out, timeout):
+                raise TimeoutError("session is checked out")
+            packed = shard.entries.pop(session_id, None)
+        return None if packed is None else self._unpack(session_id, packed)
+
+    def evict_expired(self) -> int:
+        """Drop idle and expired entries from the front of every shard."""
+
+        now = self._clock()
+        evicted = 0
+        for shard in self._shards:
+            with shard.lock:
+                entries = shard.entries
+                while entries:
+                    session_id, packed = next(iter(entries.items()))
+                    reason = self._expiry_reason(packed, now)
+                    if reason is None:
+                        break
+                    del entries[session_id]
+                    self._count(reason)
+                    evicted += 1
+        return evicted
+
+    def stats(self) -> SessionTableStats:
+        with self._stats_lock:
+            return SessionTableStats(
+                size=len(self),
+                shards=len(self._shards),
+                expired=self._expired,
+                idle_evicted=self._idle_evicted,
+            )
+
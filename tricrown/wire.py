@@ -0,0 +1,304 @@
+"""Handshake message codecs for the TRI-CROWN 2.0 reference handshake.
+
+Two encodings are provided behind one small interface:
+
+``json``
+    The original sorted-key JSON encoding with hex-encoded byte strings.  It
+    is easy to eyeball in logs but doubles the size of every key and
+    ciphertext.
+
+``binary``
+    A versioned type-length-value framing.  Each frame starts with a fixed
+    header ``version (1) || frame type (1) || body length (4)`` followed by
+    fields encoded as ``tag (1) || length (4) || value``.  All integers are
+    big-endian.  Decoding returns :class:`memoryview` slices into the
+    received buffer so multi-megabyte McEliece keys are never copied.
+
+The frames themselves are what gets absorbed into the transcript hash, so
+both peers must agree on the codec before the handshake starts.
+"""
+
+from __future__ import annotations
+
+import json
+import struct
+from contextlib import contextmanager
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Dict, Iterator, Sequence, Tuple
+
+WIRE_VERSION = 1
+
+_FRAME_HEADER = struct.Struct(">BBI")
+_FIELD_HEADER = struct.Struct(">BI")
+
+
+class FrameType(IntEnum):
+    """Frame identifiers used by the binary codec.
+
+    The ``RESUME_*`` frames implement ticket-based resumption and
+    ``REKEY_OFFER`` announces a precomputed epoch rekey.  Type 7 carried
+    the TLV framing of sealed records before
+    :meth:`tricrown.session.Record.to_bytes` replaced it and is reserved.
+    """
+
+    CLIENT_HELLO = 1
+    SERVER_HELLO = 2
+    CLIENT_ENCAPS = 3
+    SERVER_ENCAPS = 4
+    CLIENT_SIG = 5
+    SERVER_SIG = 6
+    RESUME_HELLO = 8
+    RESUME_ACCEPT = 9
+    REKEY_OFFER = 10
+
+    @property
+    def kind(self) -> str:
+        return self.name.lower()
+
+
+class FieldTag(IntEnum):
+    """Field tags shared by all binary frames.
+
+    Published numbers are never reused: tags of the retired TLV record
+    frame, which early rekey offers also borrowed, are listed in
+    :data:`RESERVED_FIELD_TAGS`.
+    """
+
+    ROLE = 1
+    KEM_ML = 2
+    KEM_MCE = 3
+    X25519 = 4
+    SIG_ALG = 5
+    SIG_PK = 6
+    CT_ML = 7
+    CT_MCE = 8
+    SIGNATURE = 9
+    TICKET = 15
+    EPOCH = 17
+    BOUNDARY = 18
+    REKEY_MAC = 19
+
+
+#: Frame types and field tags of wire version 1 that are no longer sent.
+#: :func:`decode_frame` rejects them rather than misreading an old peer.
+RESERVED_FRAME_TYPES = frozenset({7})
+RESERVED_FIELD_TAGS = frozenset({10, 11, 12, 13, 14, 16})
+
+
+@dataclass(frozen=True)
+class Frame:
+    """A decoded binary frame whose field values view the source buffer."""
+
+    frame_type: FrameType
+    fields: Dict[int, memoryview]
+
+    def field(self, tag: FieldTag) -> memoryview:
+        try:
+            return self.fields[tag]
+        except KeyError:
+            raise ValueError(f"frame {self.frame_type.name} is missing field {tag.name}") from None
+
+
+@dataclass(frozen=True)
+class HelloFields:
+    """Public values announced by a peer's hello message."""
+
+    role: str
+    kem_ml: bytes | memoryview
+    kem_mce: bytes | memoryview
+    x25519: bytes | memoryview
+    sig_alg: str
+    sig_pk: bytes | memoryview
+
+
+def encode_frame(frame_type: FrameType, fields: Sequence[Tuple[FieldTag, bytes]]) -> bytes:
+    """Serialise ``fields`` into a single binary frame."""
+
+    body_length = sum(_FIELD_HEADER.size + len(value) for _, value in fields)
+    out = bytearray(_FRAME_HEADER.size + body_length)
+    _FRAME_HEADER.pack_into(out, 0, WIRE_VERSION, frame_type, body_length)
+    offset = _FRAME_HEADER.size
+    for tag, value in fields:
+        _FIELD_HEADER.pack_into(out, offset, tag, len(value))
+        offset += _FIELD_HEADER.size
+        out[offset : offset + len(value)] = value
+        offset += len(value)
+    return bytes(out)
+
+
+def decode_frame(buffer: bytes | bytearray | memoryview) -> Frame:
+    """Parse one binary frame without copying field values."""
+
+    view = memoryview(buffer)
+    if len(view) < _FRAME_HEADER.size:
+        raise ValueError("truncated frame header")
+    version, frame_type, body_length = _FRAME_HEADER.unpack_from(view, 0)
+    if version != WIRE_VERSION:
+        raise ValueError(f"unsupported wire version: {version}")
+    if frame_type in RESERVED_FRAME_TYPES:
+        raise ValueError(f"reserved frame type: {frame_type}")
+    end = _FRAME_HEADER.size + body_length
+    if len(view) != end:
+        raise ValueError("frame length does not match its header")
+    fields: Dict[int, memoryview] = {}
+    offset = _FRAME_HEADER.size
+    while offset < end:
+        if end - offset < _FIELD_HEADER.size:
+            raise ValueError("truncated field header")
+        tag, length = _FIELD_HEADER.unpack_from(view, offset)
+        if tag in RESERVED_FIELD_TAGS:
+            raise ValueError(f"reserved field tag: {tag}")
+        offset += _FIELD_HEADER.size
+        if offset + length > end:
+            raise ValueError("field overruns frame")
+        fields[tag] = view[offset : offset + length]
+        offset += length
+    return Frame(frame_type=FrameType(frame_type), fields=fields)
+
+
+@contextmanager
+def _json_message(kind: str) -> Iterator[None]:
+    """Report any structural problem in a JSON message as ``ValueError``."""
+
+    try:
+        yield
+    except (AttributeError, KeyError, TypeError, ValueError) as exc:
+        raise ValueError(f"malformed JSON {kind} message") from exc
+
+
+class JSONHandshakeCodec:
+    """Sorted-key JSON encoding with hex-encoded byte strings.
+
+    Decoders raise :class:`ValueError` for any malformed message, like the
+    binary codec does.
+    """
+
+    name = "json"
+
+    @staticmethod
+    def _dumps(data: dict) -> bytes:
+        return json.dumps(data, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+    def encode_hello(self, hello: HelloFields) -> bytes:
+        key = "client_hello" if hello.role == "client" else "server_hello"
+        return self._dumps({
+            key: {
+                "role": hello.role,
+                "kem_ml": bytes(hello.kem_ml).hex(),
+                "kem_mce": bytes(hello.kem_mce).hex(),
+                "x25519": bytes(hello.x25519).hex(),
+                "sig_alg": hello.sig_alg,
+                "sig_pk": bytes(hello.sig_pk).hex(),
+            }
+        })
+
+    def message_kind(self, message: bytes) -> str:
+        """Return e.g. ``"server_encaps"`` for an encoded handshake message."""
+
+        with _json_message("handshake"):
+            (kind,) = json.loads(message).keys()
+        return kind
+
+    def decode_hello(self, message: bytes) -> HelloFields:
+        with _json_message("hello"):
+            (payload,) = json.loads(message).values()
+            return HelloFields(
+                role=payload["role"],
+                kem_ml=bytes.fromhex(payload["kem_ml"]),
+                kem_mce=bytes.fromhex(payload["kem_mce"]),
+                x25519=bytes.fromhex(payload["x25519"]),
+                sig_alg=payload["sig_alg"],
+                sig_pk=bytes.fromhex(payload["sig_pk"]),
+            )
+
+    def encode_encaps(self, role: str, ct_ml: bytes, ct_mce: bytes) -> bytes:
+        suffix = "c" if role == "client" else "s"
+        return self._dumps({
+            f"{role}_encaps": {f"ct_ml_{suffix}": ct_ml.hex(), f"ct_mce_{suffix}": ct_mce.hex()}
+        })
+
+    def decode_encaps(self, message: bytes) -> Tuple[bytes, bytes]:
+        with _json_message("encaps"):
+            (payload,) = json.loads(message).values()
+            values = {key.rpartition("_")[0]: value for key, value in payload.items()}
+            return bytes.fromhex(values["ct_ml"]), bytes.fromhex(values["ct_mce"])
+
+    def encode_signature(self, role: str, signature: bytes) -> bytes:
+        return self._dumps({f"{role}_sig": signature.hex()})
+
+    def decode_signature(self, message: bytes) -> bytes:
+        with _json_message("signature"):
+            (value,) = json.loads(message).values()
+            return bytes.fromhex(value)
+
+
+class BinaryHandshakeCodec:
+    """Versioned TLV encoding that decodes into zero-copy memoryviews."""
+
+    name = "binary"
+
+    def encode_hello(self, hello: HelloFields) -> bytes:
+        frame_type = FrameType.CLIENT_HELLO if hello.role == "client" else FrameType.SERVER_HELLO
+        return encode_frame(frame_type, [
+            (FieldTag.ROLE, hello.role.encode("ascii")),
+            (FieldTag.KEM_ML, hello.kem_ml),
+            (FieldTag.KEM_MCE, hello.kem_mce),
+            (FieldTag.X25519, hello.x25519),
+            (FieldTag.SIG_ALG, hello.sig_alg.encode("utf-8")),
+            (FieldTag.SIG_PK, hello.sig_pk),
+        ])
+
+    def message_kind(self, message: bytes) -> str:
+        """Return e.g. ``"server_encaps"`` for an encoded handshake message."""
+
+        return decode_frame(message).frame_type.kind
+
+    def decode_hello(self, message: bytes) -> HelloFields:
+        frame = _expect(message, FrameType.CLIENT_HELLO, FrameType.SERVER_HELLO)
+        return HelloFields(
+            role=bytes(frame.field(FieldTag.ROLE)).decode("ascii"),
+            kem_ml=frame.field(FieldTag.KEM_ML),
+            kem_mce=frame.field(FieldTag.KEM_MCE),
+            x25519=frame.field(FieldTag.X25519),
+            sig_alg=bytes(frame.field(FieldTag.SIG_ALG)).decode("utf-8"),
+            sig_pk=frame.field(FieldTag.SIG_PK),
+        )
+
+    def encode_encaps(self, role: str, ct_ml: bytes, ct_mce: bytes) -> bytes:
+        frame_type = FrameType.CLIENT_ENCAPS if role == "client" else FrameType.SERVER_ENCAPS
+        return encode_frame(frame_type, [(FieldTag.CT_ML, ct_ml), (FieldTag.CT_MCE, ct_mce)])
+
+    def decode_encaps(self, message: bytes) -> Tuple[memoryview, memoryview]:
+        frame = _expect(message, FrameType.CLIENT_ENCAPS, FrameType.SERVER_ENCAPS)
+        return frame.field(FieldTag.CT_ML), frame.field(FieldTag.CT_MCE)
+
+    def encode_signature(self, role: str, signature: bytes) -> bytes:
+        frame_type = FrameType.CLIENT_SIG if role == "client" else FrameType.SERVER_SIG
+        return encode_frame(frame_type, [(FieldTag.SIGNATURE, signature)])
+
+    def decode_signature(self, message: bytes) -> memoryview:
+        frame = _expect(message, FrameType.CLIENT_SIG, FrameType.SERVER_SIG)
+        return frame.field(FieldTag.SIGNATURE)
+
+
+def _expect(message: bytes, *frame_types: FrameType) -> Frame:
+    frame = decode_frame(message)
+    if frame.frame_type not in frame_types:
+        raise ValueError(f"unexpected frame type: {frame.frame_type.name}")
+    return frame
+
+
+HANDSHAKE_CODECS = {
+    JSONHandshakeCodec.name: JSONHandshakeCodec(),
+    BinaryHandshakeCodec.name: BinaryHandshakeCodec(),
+}
+
+
+def get_codec(name: str) -> JSONHandshakeCodec | BinaryHandshakeCodec:
+    """Return the handshake codec registered under ``name``."""
+
+    try:
+        return HANDSHAKE_CODECS[name]
+    except KeyError:
+        raise ValueError(f"Unsupported wire format: {name}") from None
@@ -7,9 +7,11 @@ import hashlib
 import hmac as stdlib_hmac
 import os
 import secrets
+import time
+from array import array
 from contextlib import suppress
-from dataclasses import dataclass
-from typing import Dict, Optional
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 
 try:  # pragma: no cover - optional dependency
     from cryptography.hazmat.primitives.asymmetric import x25519
@@ -49,53 +51,90 @@ except Exception:  # pragma: no cover - degraded mode
 _HAS_OQS = oqs is not None
 _DEFAULT_PQ_ALG = "Kyber768"
 _TAG_LEN = hashlib.sha256().digest_size
+_COOKIE_BUCKET_SECONDS = 30.0
+
+
+_FALLBACK_CHUNK = 64 * 1024
+_FALLBACK_INFO = b"tricrown-hybrid-aead"
+
+
+def _xor_bytes(data: bytes, keystream: bytes) -> bytes:
+    """XOR two equal-length buffers as big integers instead of per byte."""
+
+    size = len(data)
+    value = int.from_bytes(data, "little") ^ int.from_bytes(keystream, "little")
+    return value.to_bytes(size, "little")
+
+
+def _fallback_keystream(key: bytes, nonce: bytes, index: int, length: int) -> bytes:
+    """Keystream for chunk ``index``: SHAKE256(info || key || nonce || index)."""
+
+    xof = hashlib.shake_256(_FALLBACK_INFO)
+    xof.update(key)
+    xof.update(nonce)
+    xof.update(index.to_bytes(8, "big"))
+    return xof.digest(length)
 
 
 class _ChaCha20Poly1305:
-    """Wrapper that falls back to a simple stream cipher when unavailable."""
+    """Wrapper that falls back to a simple stream cipher when unavailable.
+
+    The fallback XORs the data with a SHAKE256 keystream in
+    ``_FALLBACK_CHUNK``-sized pieces, so its cost is linear in the record
+    size, and authenticates ``nonce || aad || ciphertext`` with HMAC-SHA256.
+    """
 
     def __init__(self, key: bytes) -> None:
         if _RealChaCha20Poly1305 is not None:
             self._impl = _RealChaCha20Poly1305(key)
             self._key = b""
-        else:  # pragma: no cover - exercised when cryptography is missing
+        else:
             # Normalise key size for the fallback stream cipher
             self._impl = None
             self._key = hashlib.sha256(key).digest()
 
+    def _apply_keystream(self, nonce: bytes, data: bytes) -> bytes:
+        view = memoryview(data)
+        pieces = []
+        for index, start in enumerate(range(0, len(view), _FALLBACK_CHUNK)):
+            chunk = view[start : start + _FALLBACK_CHUNK]
+            pieces.append(_xor_bytes(chunk, _fallback_keystream(self._key, nonce, index, len(chunk))))
+        return b"".join(pieces)
+
+    def _tag(self, nonce: bytes, aad: bytes, ciphertext: bytes) -> bytes:
+        mac = stdlib_hmac.new(self._key, nonce, hashlib.sha256)
+        mac.update(aad)
+        mac.update(ciphertext)
+        return mac.digest()
+
     def encrypt(self, nonce: bytes, data: bytes, aad: bytes) -> bytes:
         if self._impl is not None:
             return self._impl.encrypt(nonce, data, aad)
-        keystream = _hkdf(self._key + nonce, length=len(data), info=b"tricrown-hybrid-aead")
-        ciphertext = bytes(a ^ b for a, b in zip(data, keystream))
-        tag = stdlib_hmac.new(self._key, nonce + aad + ciphertext, hashlib.sha256).digest()
-        return ciphertext + tag
+        ciphertext = self._apply_keystream(nonce, data)
+        return ciphertext + self._tag(nonce, aad, ciphertext)
 
     def decrypt(self, nonce: bytes, data: bytes, aad: bytes) -> bytes:
         if self._impl is not None:
             return self._impl.decrypt(nonce, data, aad)
         if len(data) < _TAG_LEN:
             raise ValueError("ciphertext too short")
-        ciphertext, tag = data[:-_TAG_LEN], data[-_TAG_LEN:]
-        expected = stdlib_hmac.new(self._key, nonce + aad + ciphertext, hashlib.sha256).digest()
-        if not secrets.compare_digest(expected, tag):
+        view = memoryview(data)
+        ciphertext, tag = view[:-_TAG_LEN], view[-_TAG_LEN:]
+        if not secrets.compare_digest(self._tag(nonce, aad, ciphertext), tag):
             raise ValueError("authentication failed")
-        keystream = _hkdf(self._key + nonce, length=len(ciphertext), info=b"tricrown-hybrid-aead")
-        return bytes(a ^ b for a, b in zip(ciphertext, keystream))
+        return self._apply_keystream(nonce, ciphertext)
 
 
 def _hkdf(ikm: bytes, *, length: int, info: bytes, salt: bytes | None = None) -> bytes:
     if salt is None:
         salt = b"\x00" * hashlib.sha256().digest_size
     prk = stdlib_hmac.new(salt, ikm, hashlib.sha256).digest()
-    okm = b""
+    blocks = []
     previous = b""
-    counter = 1
-    while len(okm) < length:
+    for counter in range(1, -(-length // len(prk)) + 1):
         previous = stdlib_hmac.new(prk, previous + info + bytes([counter]), hashlib.sha256).digest()
-        okm += previous
-        counter += 1
-    return okm[:length]
+        blocks.append(previous)
+    return b"".join(blocks)[:length]
 
 
 def _derive_key_material(ikm: bytes, *, length: int, info: bytes) -> bytes:
@@ -157,12 +196,35 @@ def _b64d(data: str) -> bytes:
 class _CipherState:
     key: bytes
     nonce: int = 0
+    _cipher: Optional[_ChaCha20Poly1305] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def cipher(self) -> _ChaCha20Poly1305:
+        """AEAD instance for ``key``, built on first use and reused after."""
+
+        if self._cipher is None:
+            self._cipher = _ChaCha20Poly1305(self.key)
+        return self._cipher
+
+    def reset(self, key: bytes) -> None:
+        """Switch to ``key``, restart the nonce counter and drop the cached cipher."""
+
+        self.key = key
+        self.nonce = 0
+        self._cipher = None
 
     def next_nonce(self) -> bytes:
         value = self.nonce
         self.nonce += 1
         return value.to_bytes(12, "big")
 
+    def reserve(self, count: int) -> int:
+        """Allocate ``count`` consecutive nonces and return the first one."""
+
+        first = self.nonce
+        self.nonce += count
+        return first
+
 
 @dataclass
 class _SessionState:
@@ -183,6 +245,7 @@ class _HandshakeCache:
     pq_shared_secret: Optional[bytes] = None
     dh_private: Optional[x25519.X25519PrivateKey] = None
     dh_shared_secret: Optional[bytes] = None
+    hello: Optional[Dict[str, str]] = None
 
     def transcript(self) -> bytes:
         parts = [b"tricrown-transcript-v1"]
@@ -234,9 +297,90 @@ def client_hello(ctx: TriCrownContext) -> Dict[str, str]:
         public_key = kem.generate_keypair()
         ctx.handshake.pq_client = kem
         message.update({"pq_alg": ctx.pq_alg, "pq_pub": _b64e(public_key)})
+    ctx.handshake.hello = dict(message)
     return message
 
 
+def client_retry(ctx: TriCrownContext, message: Dict[str, str]) -> Dict[str, str]:
+    """Answer a server's hello-retry by resending the hello with its cookie."""
+
+    if message.get("type") != "hello-retry":
+        raise ValueError("unexpected message type")
+    if ctx.handshake.hello is None:
+        raise RuntimeError("client hello not sent")
+    return dict(ctx.handshake.hello, cookie=message["cookie"])
+
+
+class CookieAuthority:
+    """Issues and checks stateless retry cookies for :func:`server_respond`.
+
+    A cookie is ``HMAC-SHA256(secret, bucket || peer || client hello)``,
+    with ``peer`` and every key and value of the hello length-prefixed,
+    where ``bucket`` is the current ``bucket_seconds`` time slot.  Cookies
+    from the current and the previous slot are accepted, so a cookie stays
+    valid for between one and two slots.  The server keeps no per-client
+    state until a client echoes a valid cookie; see :func:`server_respond`.
+    ``peer`` must identify the client's network address: a cookie that is
+    not bound to it proves nothing about reachability, so an empty
+    ``peer`` is rejected.
+    """
+
+    def __init__(
+        self,
+        secret: Optional[bytes] = None,
+        *,
+        bucket_seconds: float = _COOKIE_BUCKET_SECONDS,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if bucket_seconds <= 0:
+            raise ValueError("bucket_seconds must be positive")
+        self._secret = secret if secret is not None else os.urandom(32)
+        self.bucket_seconds = bucket_seconds
+        self._clock = clock
+
+    def _bucket(self) -> int:
+        return int(self._clock() // self.bucket_seconds)
+
+    def _cookie(self, bucket: int, message: Dict[str, str], peer: bytes) -> bytes:
+        if not peer:
+            raise ValueError("retry cookies require the peer address")
+        mac = stdlib_hmac.new(self._secret, bucket.to_bytes(8, "big"), hashlib.sha256)
+        mac.update(len(peer).to_bytes(2, "big"))
+        mac.update(peer)
+        for key in sorted(message):
+            if key != "cookie":
+                name = key.encode("utf-8")
+                value = message[key].encode("utf-8")
+                mac.update(len(name).to_bytes(2, "big"))
+                mac.update(name)
+                mac.update(len(value).to_bytes(4, "big"))
+                mac.update(value)
+        return mac.digest()
+
+    def issue(self, message: Dict[str, str], *, peer: bytes) -> Dict[str, str]:
+        """Return the hello-retry message carrying a cookie for ``message``."""
+
+        return {"type": "hello-retry", "cookie": _b64e(self._cookie(self._bucket(), message, peer))}
+
+    def verify(self, message: Dict[str, str], *, peer: bytes) -> bool:
+        """Return whether ``message`` echoes a cookie issued for it recently."""
+
+        if not peer:
+            raise ValueError("retry cookies require the peer address")
+        encoded = message.get("cookie")
+        if not encoded:
+            return False
+        try:
+            provided = base64.b64decode(encoded.encode("ascii"), validate=True)
+        except ValueError:
+            return False
+        bucket = self._bucket()
+        return any(
+            secrets.compare_digest(self._cookie(candidate, message, peer), provided)
+            for candidate in (bucket, bucket - 1)
+        )
+
+
 def server_hello(ctx: TriCrownContext, message: Dict[str, str]) -> Dict[str, str]:
     if message.get("type") != "client-hello":
         raise ValueError("unexpected message type")
@@ -271,6 +415,29 @@ def server_hello(ctx: TriCrownContext, message: Dict[str, str]) -> Dict[str, str
     return response
 
 
+def server_respond(
+    message: Dict[str, str],
+    cookies: CookieAuthority,
+    *,
+    peer: bytes,
+    enable_pq: bool = True,
+    pq_alg: str = _DEFAULT_PQ_ALG,
+) -> Tuple[Optional[TriCrownContext], Dict[str, str]]:
+    """Answer a client hello, deferring all work until it carries a cookie.
+
+    Without a valid cookie this returns ``(None, hello_retry)`` after one
+    HMAC and allocates nothing.  Otherwise it creates the server context and
+    returns it with the server hello.
+    """
+
+    if message.get("type") != "client-hello":
+        raise ValueError("unexpected message type")
+    if not cookies.verify(message, peer=peer):
+        return None, cookies.issue(message, peer=peer)
+    ctx = ctx_init("server", enable_pq=enable_pq, pq_alg=pq_alg)
+    return ctx, server_hello(ctx, message)
+
+
 def client_finish(ctx: TriCrownContext, message: Dict[str, str]) -> Dict[str, str]:
     if message.get("type") != "server-hello":
         raise ValueError("unexpected message type")
@@ -341,21 +508,89 @@ def _hmac(key: bytes, data: bytes) -> bytes:
     return stdlib_hmac.new(key, data, hashlib.sha256).digest()
 
 
+@dataclass
+class SealedBatch:
+    """Records sealed by :func:`seal_batch`, packed into one buffer.
+
+    The records share ``aad`` and use consecutive nonces starting at
+    ``first_nonce``.  Ciphertext ``i`` is
+    ``ciphertexts[offsets[i]:offsets[i + 1]]``; indexing the batch yields the
+    same ``{"aad", "nonce", "ct"}`` dict that :func:`seal` returns.
+    """
+
+    aad: bytes
+    first_nonce: int
+    ciphertexts: bytes
+    offsets: array
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def nonce(self, index: int) -> bytes:
+        return (self.first_nonce + index).to_bytes(12, "big")
+
+    def __getitem__(self, index: int) -> Dict[str, bytes]:
+        count = len(self)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError("record index out of range")
+        return {
+            "aad": self.aad,
+            "nonce": self.nonce(index),
+            "ct": self.ciphertexts[self.offsets[index] : self.offsets[index + 1]],
+        }
+
+    def __iter__(self) -> Iterator[Dict[str, bytes]]:
+        for index in range(len(self)):
+            yield self[index]
+
+
 def seal(ctx: TriCrownContext, aad: bytes, plaintext: bytes) -> Dict[str, bytes]:
     session = ctx.require_session()
-    cipher = _ChaCha20Poly1305(session.send.key)
     nonce = session.send.next_nonce()
-    ciphertext = cipher.encrypt(nonce, plaintext, aad)
+    ciphertext = session.send.cipher.encrypt(nonce, plaintext, aad)
     return {"aad": aad, "nonce": nonce, "ct": ciphertext}
 
 
 def open_(ctx: TriCrownContext, record: Dict[str, bytes]) -> bytes:
     session = ctx.require_session()
-    cipher = _ChaCha20Poly1305(session.recv.key)
     nonce = record["nonce"]
     aad = record.get("aad", b"")
     ciphertext = record["ct"]
-    return cipher.decrypt(nonce, ciphertext, aad)
+    return session.recv.cipher.decrypt(nonce, ciphertext, aad)
+
+
+def seal_batch(ctx: TriCrownContext, aad: bytes, plaintexts: Sequence[bytes]) -> SealedBatch:
+    """Seal ``plaintexts`` under one ``aad`` with consecutive nonces.
+
+    The ciphertexts are identical to calling :func:`seal` for each plaintext
+    in order.
+    """
+
+    session = ctx.require_session()
+    first = session.send.reserve(len(plaintexts))
+    encrypt = session.send.cipher.encrypt
+    offsets = array("Q", [0])
+    ciphertexts: List[bytes] = []
+    for index, plaintext in enumerate(plaintexts):
+        ciphertext = encrypt((first + index).to_bytes(12, "big"), plaintext, aad)
+        ciphertexts.append(ciphertext)
+        offsets.append(offsets[-1] + len(ciphertext))
+    return SealedBatch(aad=aad, first_nonce=first, ciphertexts=b"".join(ciphertexts), offsets=offsets)
+
+
+def open_batch(ctx: TriCrownContext, batch: SealedBatch) -> List[bytes]:
+    """Open every record of ``batch`` and return the plaintexts in order."""
+
+    session = ctx.require_session()
+    decrypt = session.recv.cipher.decrypt
+    view = memoryview(batch.ciphertexts)
+    offsets = batch.offsets
+    return [
+        decrypt(batch.nonce(index), view[offsets[index] : offsets[index + 1]], batch.aad)
+        for index in range(len(batch))
+    ]
 
 
 def rekey(ctx: TriCrownContext) -> None:
@@ -370,22 +605,26 @@ def rekey(ctx: TriCrownContext) -> None:
         send = server_send
         recv = client_send
 
-    ctx.chains = _SessionState(
-        rk=new_root,
-        send=_CipherState(key=send),
-        recv=_CipherState(key=recv),
-    )
+    session.rk = new_root
+    session.send.reset(send)
+    session.recv.reset(recv)
 
 
 __all__ = [
     "TriCrownContext",
     "ctx_init",
     "client_hello",
+    "client_retry",
+    "CookieAuthority",
     "server_hello",
+    "server_respond",
     "client_finish",
     "server_finish",
+    "SealedBatch",
     "seal",
     "open_",
+    "seal_batch",
+    "open_batch",
     "rekey",
     "_HAS_OQS",
 ]
@@ -0,0 +1,329 @@
+"""Asyncio framed transport for :mod:`tricrown_hybrid` contexts.
+
+Every message on the stream is framed as::
+
+    length (4, big-endian) || kind (1) || body
+
+``length`` covers ``kind`` and ``body``.  Handshake messages keep their dict
+form at the API level but travel as binary fields: each entry is
+``key length (1) || key || value length (4) || value``, with base64 values
+(keys, ciphertexts, the verifier and retry cookies) carried as raw bytes.
+The handshake flows as::
+
+    client                          server
+    client-hello       ------->
+                       <-------     [hello-retry]
+    [client-hello + cookie] ---->
+                       <-------     server-hello
+    client-finish      ------->
+
+after which records travel as ``nonce (12) || aad length (4) || aad || ct``.
+
+:class:`HybridStream` coalesces small records: :meth:`HybridStream.send`
+appends frames to a pending buffer and only writes once ``batch_size``
+bytes have accumulated (or on :meth:`HybridStream.flush`).  Each write
+awaits ``drain()``, so a slow peer pushes back on the sender through the
+transport's write-buffer watermarks.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import struct
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence
+
+from . import (
+    CookieAuthority,
+    TriCrownContext,
+    client_finish,
+    client_hello,
+    client_retry,
+    ctx_init,
+    open_,
+    seal,
+    seal_batch,
+    server_finish,
+    server_hello,
+    server_respond,
+)
+
+DEFAULT_MAX_FRAME_SIZE = 16 * 1024 * 1024
+DEFAULT_BATCH_SIZE = 64 * 1024
+
+_LENGTH = struct.Struct(">I")
+_RECORD_HEADER = struct.Struct(">12sI")
+_KINDS = {
+    "client-hello": 1,
+    "hello-retry": 2,
+    "server-hello": 3,
+    "client-finish": 4,
+}
+_KIND_NAMES = {code: name for name, code in _KINDS.items()}
+RECORD_KIND = 16
+_BINARY_FIELDS = frozenset({"x25519", "pq_pub", "pq_ct", "verify", "cookie"})
+
+
+def encode_message(message: Dict[str, str]) -> bytes:
+    """Encode a handshake dict as ``kind || fields``."""
+
+    try:
+        kind = _KINDS[message["type"]]
+    except KeyError:
+        raise ValueError(f"unsupported handshake message: {message.get('type')!r}") from None
+    parts = [bytes([kind])]
+    for key, value in message.items():
+        if key == "type":
+            continue
+        raw = base64.b64decode(value) if key in _BINARY_FIELDS else value.encode("utf-8")
+        name = key.encode("ascii")
+        parts.extend((bytes([len(name)]), name, _LENGTH.pack(len(raw)), raw))
+    return b"".join(parts)
+
+
+def decode_message(frame: bytes) -> Dict[str, str]:
+    """Decode a frame produced by :func:`encode_message`."""
+
+    if not frame or frame[0] not in _KIND_NAMES:
+        raise ValueError("not a handshake frame")
+    message = {"type": _KIND_NAMES[frame[0]]}
+    view = memoryview(frame)
+    offset = 1
+    while offset < len(view):
+        name_length = view[offset]
+        name_end = offset + 1 + name_length
+        value_start = name_end + _LENGTH.size
+        if value_start > len(view):
+            raise ValueError("truncated handshake field")
+        key = bytes(view[offset + 1 : name_end]).decode("ascii")
+        (value_length,) = _LENGTH.unpack_from(view, name_end)
+        offset = value_start + value_length
+        if offset > len(view):
+            raise ValueError("truncated handshake field")
+        raw = bytes(view[value_start:offset])
+        message[key] = base64.b64encode(raw).decode("ascii") if key in _BINARY_FIELDS else raw.decode("utf-8")
+    return message
+
+
+def encode_record(record: Dict[str, bytes]) -> bytes:
+    aad = record.get("aad", b"")
+    return b"".join((bytes([RECORD_KIND]), _RECORD_HEADER.pack(record["nonce"], len(aad)), aad, record["ct"]))
+
+
+def decode_record(frame: bytes) -> Dict[str, bytes]:
+    if len(frame) < 1 + _RECORD_HEADER.size or frame[0] != RECORD_KIND:
+        raise ValueError("not a record frame")
+    nonce, aad_length = _RECORD_HEADER.unpack_from(frame, 1)
+    aad_end = 1 + _RECORD_HEADER.size + aad_length
+    if aad_end > len(frame):
+        raise ValueError("record aad overruns frame")
+    return {"aad": frame[1 + _RECORD_HEADER.size : aad_end], "nonce": nonce, "ct": frame[aad_end:]}
+
+
+async def read_frame(reader: asyncio.StreamReader, *, max_frame_size: int = DEFAULT_MAX_FRAME_SIZE) -> bytes:
+    """Read one length-prefixed frame."""
+
+    (length,) = _LENGTH.unpack(await reader.readexactly(_LENGTH.size))
+    if length > max_frame_size:
+        raise ValueError(f"frame of {length} bytes exceeds max_frame_size")
+    return await reader.readexactly(length)
+
+
+async def write_message(writer: asyncio.StreamWriter, message: Dict[str, str]) -> None:
+    frame = encode_message(message)
+    writer.writelines((_LENGTH.pack(len(frame)), frame))
+    await writer.drain()
+
+
+async def read_message(reader: asyncio.StreamReader, *, max_frame_size: int = DEFAULT_MAX_FRAME_SIZE) -> Dict[str, str]:
+    return decode_message(await read_frame(reader, max_frame_size=max_frame_size))
+
+
+class HybridStream:
+    """Record stream over an established :class:`TriCrownContext`.
+
+    Iterating the stream with ``async for`` yields plaintexts until the peer
+    closes the connection.
+    """
+
+    def __init__(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+        ctx: TriCrownContext,
+        *,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        max_frame_size: int = DEFAULT_MAX_FRAME_SIZE,
+    ) -> None:
+        self.reader = reader
+        self.writer = writer
+        self.ctx = ctx
+        self.batch_size = batch_size
+        self.max_frame_size = max_frame_size
+        self._pending: List[bytes] = []
+        self._pending_bytes = 0
+
+    def _queue(self, record: Dict[str, bytes]) -> None:
+        frame = encode_record(record)
+        self._pending.append(_LENGTH.pack(len(frame)))
+        self._pending.append(frame)
+        self._pending_bytes += _LENGTH.size + len(frame)
+
+    async def send(self, plaintext: bytes, *, aad: bytes = b"") -> None:
+        """Seal ``plaintext`` and write it once the pending batch is full."""
+
+        self._queue(seal(self.ctx, aad, plaintext))
+        if self._pending_bytes >= self.batch_size:
+            await self.flush()
+
+    async def send_many(self, plaintexts: Sequence[bytes], *, aad: bytes = b"") -> None:
+        """Seal ``plaintexts`` with :func:`seal_batch` and write them in one go."""
+
+        for record in seal_batch(self.ctx, aad, plaintexts):
+            self._queue(record)
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Write every pending record and wait for the transport to drain."""
+
+        if self._pending:
+            self.writer.write(b"".join(self._pending))
+            self._pending.clear()
+            self._pending_bytes = 0
+        await self.writer.drain()
+
+    async def recv(self) -> bytes:
+        if self._pending:
+            await self.flush()
+        frame = await read_frame(self.reader, max_frame_size=self.max_frame_size)
+        return open_(self.ctx, decode_record(frame))
+
+    def __aiter__(self) -> "HybridStream":
+        return self
+
+    async def __anext__(self) -> bytes:
+        try:
+            return await self.recv()
+        except asyncio.IncompleteReadError as exc:
+            if exc.partial:
+                raise
+            raise StopAsyncIteration from None
+
+    async def close(self) -> None:
+        try:
+            await self.flush()
+        except (ConnectionError, OSError):
+            pass
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except (ConnectionError, OSError):
+            pass
+
+
+async def client_handshake(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    *,
+    enable_pq: bool = True,
+    max_frame_size: int = DEFAULT_MAX_FRAME_SIZE,
+) -> TriCrownContext:
+    """Run the client side of the handshake, answering one retry if asked."""
+
+    ctx = ctx_init("client", enable_pq=enable_pq)
+    await write_message(writer, client_hello(ctx))
+    response = await read_message(reader, max_frame_size=max_frame_size)
+    if response["type"] == "hello-retry":
+        await write_message(writer, client_retry(ctx, response))
+        response = await read_message(reader, max_frame_size=max_frame_size)
+    await write_message(writer, client_finish(ctx, response))
+    return ctx
+
+
+async def server_handshake(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    *,
+    cookies: Optional[CookieAuthority] = None,
+    enable_pq: bool = True,
+    max_frame_size: int = DEFAULT_MAX_FRAME_SIZE,
+) -> TriCrownContext:
+    """Run the server side of the handshake.
+
+    With ``cookies`` the server answers the first hello with a retry and
+    only creates its context once the client echoes the cookie.
+    """
+
+    hello = await read_message(reader, max_frame_size=max_frame_size)
+    if cookies is None:
+        ctx = ctx_init("server", enable_pq=enable_pq)
+        await write_message(writer, server_hello(ctx, hello))
+    else:
+        peername = writer.get_extra_info("peername")
+        if not peername:
+            raise ValueError("retry cookies require the peer address")
+        peer = str(peername).encode("utf-8")
+        ctx, response = server_respond(hello, cookies, peer=peer, enable_pq=enable_pq)
+        if ctx is None:
+            await write_message(writer, response)
+            hello = await read_message(reader, max_frame_size=max_frame_size)
+            ctx, response = server_respond(hello, cookies, peer=peer, enable_pq=enable_pq)
+            if ctx is None:
+                raise ValueError("client did not echo a valid retry cookie")
+        await write_message(writer, response)
+    server_finish(ctx, await read_message(reader, max_frame_size=max_frame_size))
+    return ctx
+
+
+async def open_connection(
+    host: str,
+    port: int,
+    *,
+    enable_pq: bool = True,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_frame_size: int = DEFAULT_MAX_FRAME_SIZE,
+) -> HybridStream:
+    """Connect to a hybrid server and return the established stream."""
+
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        ctx = await client_handshake(reader, writer, enable_pq=enable_pq, max_frame_size=max_frame_size)
+    except BaseException:
+        writer.close()
+        raise
+    return HybridStream(reader, writer, ctx, batch_size=batch_size, max_frame_size=max_frame_size)
+
+
+async def start_server(
+    handler: Callable[[HybridStream], Awaitable[None]],
+    host: str = "127.0.0.1",
+    port: int = 0,
+    *,
+    cookies: Optional[CookieAuthority] = None,
+    enable_pq: bool = True,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_frame_size: int = DEFAULT_MAX_FRAME_SIZE,
+    **server_kwargs: object,
+) -> asyncio.AbstractServer:
+    """Start a TCP server that completes a handshake per connection.
+
+    ``handler`` is awaited with a :class:`HybridStream` once the handshake
+    succeeds; pending records are flushed and the connection closed when it
+    returns.  Connections whose handshake fails are dropped.
+    """
+
+    async def serve(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            ctx = await server_handshake(
+                reader, writer, cookies=cookies, enable_pq=enable_pq, max_frame_size=max_frame_size
+            )
+        except (asyncio.IncompleteReadError, ConnectionError, KeyError, ValueError):
+            writer.close()
+            return
+        stream = HybridStream(reader, writer, ctx, batch_size=batch_size, max_frame_size=max_frame_size)
+        try:
+            await handler(stream)
+        finally:
+            await stream.close()
+
+    return await asyncio.start_server(serve, host, port, **server_kwargs)